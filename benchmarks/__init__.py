@@ -0,0 +1,11 @@
+"""Benchmark suite for MxKit
+
+The benchmarks follow the conventions of airspeed velocity (asv), i.e. ``time_*``
+methods with optional ``setup``/``teardown`` and ``params``. Run them with ``asv run``
+to track results across commits, or with ``python -m benchmarks`` for a quick
+report against the working tree.
+
+External programs are replaced by stub executables and structures by synthetic
+coordinates, so no third-party binaries or data are needed.
+
+"""
@@ -0,0 +1,66 @@
+"""Minimal runner for the asv-style benchmarks without asv
+
+Usage: python -m benchmarks [pattern]
+
+"""
+
+from __future__ import print_function
+
+import importlib
+import inspect
+import itertools
+import os
+import subprocess
+import sys
+import timeit
+
+PREFIXES = ("time_", "timeraw_", "track_")
+
+
+def suites():
+    here = os.path.dirname(os.path.abspath(__file__))
+    for fname in sorted(os.listdir(here)):
+        if fname.startswith("bench_") and fname.endswith(".py"):
+            module = importlib.import_module("benchmarks." + fname[:-3])
+            for name, obj in sorted(inspect.getmembers(module, inspect.isclass)):
+                if obj.__module__ == module.__name__ and any(m.startswith(PREFIXES) for m in dir(obj)):
+                    yield module.__name__, obj
+
+
+def measure(instance, method, combination):
+    func = getattr(instance, method)
+    if method.startswith("track_"):
+        return func(*combination), getattr(func, "unit", "")
+    elif method.startswith("timeraw_"):
+        command = [sys.executable, "-c", func(*combination)]
+        timer = timeit.Timer(lambda: subprocess.check_call(command))
+        return min(timer.repeat(repeat=5, number=1)) * 1e6, "us"
+    timer = timeit.Timer(lambda: func(*combination))
+    number, _ = timer.autorange() if hasattr(timer, "autorange") else (10, None)
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e6, "us"
+
+
+def run(pattern=""):
+    for modname, cls in suites():
+        params = getattr(cls, 'params', [])
+        if params and not isinstance(params[0], list):
+            params = [params]
+        for combination in itertools.product(*params) if params else [()]:
+            for method in sorted(m for m in dir(cls) if m.startswith(PREFIXES)):
+                label = "{0}.{1}.{2}{3}".format(modname.split(".")[-1], cls.__name__, method,
+                                               "({0})".format(", ".join(map(str, combination))) if combination else "")
+                if pattern not in label:
+                    continue
+                instance = cls()
+                if hasattr(instance, "setup"):
+                    instance.setup(*combination)
+                try:
+                    value, unit = measure(instance, method, combination)
+                finally:
+                    if hasattr(instance, "teardown"):
+                        instance.teardown(*combination)
+                print("{0:<70} {1:>12.3f} {2}".format(label, value, unit))
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "")
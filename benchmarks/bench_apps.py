@@ -0,0 +1,87 @@
+"""Benchmarks for the command line wrappers in :mod:`mxkit.apps`"""
+
+from mxkit.apps import AbstractCommandline
+from mxkit.apps import dssp
+from mxkit.apps import maxcluster
+from mxkit.apps import molrep
+from mxkit.apps import phaser
+from mxkit.apps import refmac
+from mxkit.apps import spicker
+from mxkit.apps import theseus
+from mxkit.apps import tmalign
+from mxkit.apps import tmscore
+
+from .common import StubEnvironment
+
+WRAPPERS = {
+    'dssp': (dssp.DsspCommandline, {'input': 'model.pdb', 'output': 'model.dssp'}),
+    'maxcluster': (maxcluster.MaxclusterCommandline, {'pdb_list': 'models.list', 'pdb_experiment': 'native.pdb'}),
+    'molrep': (molrep.MolrepCommandline, {'hklin': 'data.mtz', 'xyzin': 'model.pdb', 'seqin': 'seq.fasta'}),
+    'phaser': (phaser.PhaserCommandline, {}),
+    'refmac': (refmac.RefmacCommandline, {'hklin': 'data.mtz', 'hklout': 'out.mtz', 'xyzin': 'model.pdb',
+                                          'xyzout': 'out.pdb'}),
+    'spicker': (spicker.SpickerCommandline, {'rmsinp': 'rmsinp', 'seqdat': 'seq.dat', 'train': 'tra.in',
+                                             'reptra': ['rep1.tra1', 'rep2.tra1']}),
+    'theseus': (theseus.TheseusCommandline, {'pdb_files': ['model1.pdb', 'model2.pdb', 'model3.pdb']}),
+    'tmalign': (tmalign.TMalignCommandline, {'chain1': 'model1.pdb', 'chain2': 'model2.pdb'}),
+    'tmscore': (tmscore.TMscoreCommandline, {'model': 'model.pdb', 'native': 'native.pdb'}),
+}
+
+
+class WrapperSuite(object):
+    params = sorted(WRAPPERS)
+    param_names = ['wrapper']
+
+    def setup(self, wrapper):
+        self.env = StubEnvironment()
+        self.cls, self.kwargs = WRAPPERS[wrapper]
+        self.cmd = self.cls(**self.kwargs)
+
+    def teardown(self, wrapper):
+        self.env.close()
+
+    def time_construct(self, wrapper):
+        self.cls(**self.kwargs)
+
+    def time_as_list(self, wrapper):
+        self.cmd._as_list()
+
+    def time_str(self, wrapper):
+        str(self.cmd)
+
+
+class FindExecSuite(object):
+    params = [10, 100, 1000]
+    param_names = ['path_entries']
+
+    def setup(self, path_entries):
+        extra = ["/nonexistent/mxkit/bench/{0}".format(i) for i in range(path_entries)]
+        self.env = StubEnvironment(extra_paths=extra)
+
+    def teardown(self, path_entries):
+        self.env.close()
+
+    def time_find_exec_path(self, path_entries):
+        AbstractCommandline.find_exec('TMscore')
+
+    def time_find_exec_absolute(self, path_entries):
+        AbstractCommandline.find_exec('/bin/sh')
+
+
+class TemplateSuite(object):
+
+    def setup(self):
+        self.env = StubEnvironment()
+        self.pairs = [("model_{0}.pdb".format(i), "native.pdb") for i in range(1000)]
+        self.template = tmscore.TMscoreCommandline(norm_scale=5).template('model', 'native')
+
+    def teardown(self):
+        self.env.close()
+
+    def time_construct_1000(self):
+        for model, native in self.pairs:
+            tmscore.TMscoreCommandline(norm_scale=5, model=model, native=native)._as_list()
+
+    def time_template_1000(self):
+        for _ in self.template.generate(self.pairs):
+            pass
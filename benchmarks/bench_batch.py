@@ -0,0 +1,81 @@
+"""End-to-end batch throughput with stub executables and synthetic structures"""
+
+import os
+
+from mxkit.apps import tmscore
+from mxkit.batch import jury
+from mxkit.batch import metrics
+from mxkit.dispatch.backends import LocalBackend
+from mxkit.dispatch.scheduler import Job
+from mxkit.dispatch.scheduler import Scheduler
+from mxkit.dispatch.worker import ShellPool
+
+from .common import StubEnvironment
+from .common import helix
+from .common import write_pdb
+
+NMODELS = 100
+
+
+class BatchSuite(object):
+    params = [1, 4]
+    param_names = ['nproc']
+    timeout = 120
+
+    def setup(self, nproc):
+        # The stub reads the model like the real binary would
+        self.env = StubEnvironment(body='cat "$1" > /dev/null\necho "TM-score    = 0.5000"')
+        native = write_pdb(os.path.join(self.env.directory, "native.pdb"), helix(100))
+        self.cmds = [
+            tmscore.TMscoreCommandline(
+                model=write_pdb(os.path.join(self.env.directory, "model_{0}.pdb".format(i)), helix(100, offset=0.1 * i)),
+                native=native)
+            for i in range(NMODELS)
+        ]
+
+    def teardown(self, nproc):
+        self.env.close()
+
+    def time_call(self, nproc):
+        for cmd in self.cmds:
+            cmd()
+
+    def time_local_backend(self, nproc):
+        LocalBackend(nproc=nproc, pack=10).run(self.cmds)
+
+    def time_shell_pool(self, nproc):
+        with ShellPool(nproc=nproc) as pool:
+            pool.map(self.cmds)
+
+    def time_scheduler(self, nproc):
+        scheduler = Scheduler(nproc=nproc)
+        for i, cmd in enumerate(self.cmds):
+            scheduler.add(Job("tmscore_{0}".format(i), cmd))
+        scheduler.run()
+
+
+class JurySuite(object):
+    params = [100, 400]
+    param_names = ['nmodels']
+
+    def setup(self, nmodels):
+        import numpy as np
+        self.coords = np.array([helix(80, offset=0.01 * i) for i in range(nmodels)])
+        self.similarity = np.random.RandomState(0).random_sample((nmodels, nmodels))
+
+    def time_score_matrix(self, nmodels):
+        jury.score(self.similarity, top=20)
+
+    def time_score_models(self, nmodels):
+        jury.score_models(self.coords, top=20)
+
+
+class MetricsSuite(object):
+
+    def setup(self):
+        import numpy as np
+        self.native = np.array(helix(120))
+        self.models = np.array([helix(120, offset=0.05 * i) for i in range(32)])
+
+    def time_scores(self):
+        metrics.scores(self.models, self.native)
@@ -0,0 +1,22 @@
+"""Benchmarks for the lookup tables in :mod:`mxkit.chemistry`"""
+
+from mxkit import chemistry
+
+
+class ChemistrySuite(object):
+
+    def setup(self):
+        self.residues = ['ALA', 'g', 'Trp', 'MSE', 'XYZ'] * 20
+        self.elements = ['C', 'n', 'Iron', 'SE', 'XX'] * 20
+
+    def time_atomic_composition(self):
+        for k in self.residues:
+            chemistry.atomic_composition[k]
+
+    def time_periodic_table(self):
+        for k in self.elements:
+            chemistry.periodic_table[k]
+
+    def time_build_tables(self):
+        chemistry.AtomicComposition()
+        chemistry.PeriodicTable()
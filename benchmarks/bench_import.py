@@ -0,0 +1,36 @@
+"""Import time benchmarks for short-lived processes, e.g. workers and CLI helpers"""
+
+import subprocess
+import sys
+
+MODULES = ['mxkit', 'mxkit.apps', 'mxkit.chemistry', 'mxkit.dispatch.scheduler', 'mxkit.dispatch.worker']
+
+# Dependencies that must only be imported on first use
+HEAVY = ['Bio', 'numpy']
+
+
+class ImportSuite(object):
+    params = MODULES
+    param_names = ['module']
+
+    def timeraw_import(self, module):
+        return "import {0}".format(module)
+
+    def track_importtime(self, module):
+        """The cumulative import time reported by ``python -X importtime``"""
+        stderr = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import " + module],
+                                  stderr=subprocess.PIPE, universal_newlines=True).communicate()[1]
+        for line in stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                return int(fields[1])
+        raise RuntimeError("Module not found in import time report: {0}".format(module))
+
+    track_importtime.unit = "us"
+
+    def track_heavy_imports(self, module):
+        """The number of heavy dependencies loaded as side effect of the import, expected to be 0"""
+        code = "import sys, {0}; print(sum(m in sys.modules for m in {1!r}))".format(module, HEAVY)
+        return int(subprocess.check_output([sys.executable, "-c", code], universal_newlines=True))
+
+    track_heavy_imports.unit = "modules"
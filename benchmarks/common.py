@@ -0,0 +1,47 @@
+"""Shared fixtures for the benchmark suite"""
+
+import math
+import os
+import shutil
+import stat
+import tempfile
+
+EXECUTABLES = ['dssp', 'maxcluster', 'molrep', 'phaser', 'refmac5', 'spicker', 'theseus', 'TMalign', 'TMscore']
+
+
+class StubEnvironment(object):
+    """Temporary directory with stub executables prepended to the PATH"""
+
+    def __init__(self, body="exit 0", extra_paths=None):
+        self.directory = tempfile.mkdtemp(prefix="mxkit_bench_")
+        self.bindir = os.path.join(self.directory, "bin")
+        os.mkdir(self.bindir)
+        for exe in EXECUTABLES:
+            path = os.path.join(self.bindir, exe)
+            with open(path, "w") as f_out:
+                f_out.write("#!/bin/sh\n{0}\n".format(body))
+            os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        self._path = os.environ.get("PATH", "")
+        paths = list(extra_paths or []) + [self.bindir, self._path]
+        os.environ["PATH"] = os.pathsep.join(paths)
+
+    def close(self):
+        os.environ["PATH"] = self._path
+        shutil.rmtree(self.directory)
+
+
+def helix(nres, rise=1.5, radius=2.3, offset=0.0):
+    """Return synthetic C-alpha coordinates of an ideal helix"""
+    return [(radius * math.cos(math.radians(100.0 * i)) + offset,
+             radius * math.sin(math.radians(100.0 * i)),
+             rise * i) for i in range(nres)]
+
+
+def write_pdb(path, coords):
+    """Write C-alpha coordinates as minimal PDB file"""
+    with open(path, "w") as f_out:
+        for i, (x, y, z) in enumerate(coords, 1):
+            f_out.write("ATOM  {0:5d}  CA  ALA A{1:4d}    {2:8.3f}{3:8.3f}{4:8.3f}  1.00  0.00           C\n".format(
+                i, i, x, y, z))
+        f_out.write("END\n")
+    return path
@@ -1,5 +1,15 @@
 """Macromolecular Crystallography ToolKit"""
 
-from mxkit import version
+import sys
 
-__version__ = version.__version__
+
+def __getattr__(name):
+    if name == "__version__":
+        from mxkit.version import __version__
+        return __version__
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ (PEP 562) is unavailable
+    from mxkit.version import __version__
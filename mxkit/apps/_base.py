@@ -0,0 +1,867 @@
+"""Base classes for the command line wrappers
+
+These classes extend Biopython's :mod:`Bio.Application` and are exposed through
+:mod:`mxkit.apps`, which only imports this module on first access.
+
+"""
+
+from __future__ import print_function
+
+__author__ = "Felix Simkovic"
+__date__ = "20 Feb 2017"
+__version__ = "0.1"
+
+__all__ = ['AbstractCommandline', 'ApplicationTimeout', 'CommandTemplate', 'Argument', 'ArgumentList', 'Option',
+           'Switch', 'Tail']
+
+import bz2
+import collections
+import copy
+import gzip
+import os
+import platform
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+import warnings
+
+from Bio.Application import AbstractCommandline
+from Bio.Application import ApplicationError
+from Bio.Application import _Argument
+from Bio.Application import _ArgumentList
+from Bio.Application import _Option
+from Bio.Application import _Switch
+from Bio.Application import _escape_filename
+from Bio.Application import _local_reserved_names
+from Bio.Application import _re_prop_name
+from Bio.Application import _reserved_names
+
+from mxkit import instrument
+from mxkit import probe
+from mxkit import scratch
+
+
+class AbstractCommandline(AbstractCommandline):
+    """Extension to the original :obj:`AbstractCommandline <Bio.Application.AbstractCommandline>`
+
+    Subclasses declare their parameters once in the class attribute ``_parameters``,
+    which is compiled into a :obj:`_Schema` on first instantiation. Each instance only
+    stores the values of the parameters that have been set, so constructing a wrapper
+    and building its command line scale with the number of set parameters rather than
+    the number of available ones.
+
+    Subclasses assigning ``self.parameters`` in their ``__init__``, as required by
+    :obj:`Bio.Application.AbstractCommandline`, are still supported.
+
+    """
+
+    _parameters = []
+
+    # The expected resource use of a single call, see resources()
+    _cores = 1
+    _memory = 256
+
+    # Whether the program reads its keywords from stdin, so that the command line alone
+    # does not determine what it computes
+    _stdin_keywords = False
+
+    # The arguments making the program print its version and flags, see capabilities()
+    _probe_args = ("--version", )
+
+    def __init__(self, cmd, **kwargs):
+        """Initialise a new :obj:`AbstractCommandline`"""
+        start = instrument.now()
+        cmd = AbstractCommandline.find_exec(cmd)
+        # Bypass __setattr__ which treats all other attributes as parameters
+        attrs = self.__dict__
+        attrs['_lookup_time'] = instrument.now() - start
+        attrs['program_name'] = cmd
+        if 'parameters' in attrs:
+            attrs['_schema'] = _Schema(attrs.pop('parameters'), self.__class__)
+        else:
+            attrs['_schema'] = self.__class__._compiled_schema()
+        attrs['_values'] = {}
+        for key, value in kwargs.items():
+            self.set_parameter(key, value)
+
+    @property
+    def parameters(self):
+        """A snapshot of the parameters holding the values of this instance"""
+        bound = []
+        for i, template in enumerate(self._schema.parameters):
+            parameter = copy.copy(template)
+            if i in self._values:
+                parameter.is_set = True
+                if not isinstance(parameter, _Switch):
+                    parameter.value = self._values[i]
+            bound.append(parameter)
+        return bound
+
+    @classmethod
+    def _compiled_schema(cls):
+        """Return the :obj:`_Schema` of this class, building it on first use"""
+        schema = cls.__dict__.get('_schema')
+        if schema is None:
+            schema = _Schema(cls._parameters, cls)
+            setattr(cls, '_schema', schema)
+        return schema
+
+    def set_parameter(self, name, value=None):
+        """Set a command line parameter by any of its names"""
+        try:
+            i = self._schema.index[name]
+        except KeyError:
+            raise ValueError("Option name %s was not found." % name)
+        parameter = self._schema.parameters[i]
+        if isinstance(parameter, _Switch):
+            if value is None:
+                warnings.warn("For a switch type argument like %s, we expect a boolean.  "
+                              "None is treated as FALSE!" % parameter.names[-1])
+            if value:
+                self._values[i] = True
+            else:
+                self._values.pop(i, None)
+        elif value is None:
+            self._values.setdefault(i, None)
+        else:
+            self._check_value(value, name, parameter.checker_function)
+            self._values[i] = value
+
+    def _get_parameter(self, name):
+        try:
+            i = self._schema.index[name]
+        except KeyError:
+            raise ValueError("Option name %s was not found." % name)
+        if isinstance(self._schema.parameters[i], _Switch):
+            return i in self._values
+        return self._values.get(i)
+
+    def _clear_parameter(self, name):
+        try:
+            i = self._schema.index[name]
+        except KeyError:
+            raise ValueError("Option name %s was not found." % name)
+        self._values.pop(i, None)
+
+    def _validate(self):
+        for i in self._schema.required:
+            if i not in self._values:
+                raise ValueError("Parameter %s is not set." % self._schema.parameters[i].names[-1])
+
+    def __repr__(self):
+        answer = "%s(cmd=%r" % (self.__class__.__name__, self.program_name)
+        for i in sorted(self._values):
+            parameter = self._schema.parameters[i]
+            if isinstance(parameter, _Switch):
+                answer += ", %s=True" % parameter.names[-1]
+            else:
+                answer += ", %s=%r" % (parameter.names[-1], self._values[i])
+        return answer + ")"
+
+    def __str__(self):
+        return " ".join(self._as_list())
+
+    def __call__(self, stdin=None, stdout=True, stderr=True, cwd=None, env=None, timeout=None):
+        """Execute the command, wait for it to finish, return (stdout, stderr)
+
+        This behaves like :obj:`AbstractCommandline.__call__ <Bio.Application.AbstractCommandline.__call__>`,
+        but the child process is reaped with :func:`os.wait4` where available so that its
+        resource usage can be passed to the sinks registered in :mod:`mxkit.instrument`.
+
+        Besides ``True`` (capture), ``False`` (discard) and a file path, ``stdout`` and
+        ``stderr`` accept a :obj:`Tail`, which only keeps the end of the output, so
+        that verbose programs do not accumulate their logs in memory. Paths ending in
+        ``.gz``, ``.bz2`` or ``.xz`` are compressed while the program is running. When
+        the program fails, the :obj:`ApplicationError <Bio.Application.ApplicationError>`
+        holds the last :attr:`Tail.size` characters of output written to files.
+
+        With a ``timeout`` in seconds, the program is started in its own session and the
+        whole session is killed once the timeout expires.
+
+        Input files ending in ``.gz``, ``.bz2`` or ``.xz`` are passed to the program
+        decompressed, and :obj:`Buffer <mxkit.scratch.Buffer>` inputs as named pipes or
+        scratch files, see :mod:`mxkit.scratch`.
+
+        Raises
+        ------
+        :obj:`ApplicationError <Bio.Application.ApplicationError>`
+           The program returned a non-zero exit status
+        :obj:`ApplicationTimeout`
+           The program was killed after the timeout expired
+
+        """
+        self._prepare()
+        popen_kwargs = {}
+        if timeout is not None and hasattr(os, "killpg"):
+            # Killing the session also reaches the children of the shell. Unlike preexec_fn,
+            # start_new_session is safe when other threads run while the child is forked.
+            if sys.version_info[0] >= 3:
+                popen_kwargs['start_new_session'] = True
+            else:
+                popen_kwargs['preexec_fn'] = os.setsid
+        # Windows 7, 8, 8.1 and 10 want shell = True
+        use_shell = sys.platform != "win32" or platform.win32_ver()[0] in ["7", "8", "post2012Server", "10"]
+
+        # Scratch inputs and output files are released however the call ends
+        handles = []
+        watchdog = None
+        try:
+            values = self._scratch_inputs(handles)
+            start = instrument.now()
+            command = " ".join(self._as_list(values))
+            argv_time = instrument.now() - start
+            args, consumers = AbstractCommandline._streams(stdout, stderr, handles)
+
+            timestamp = time.time()
+            start = instrument.now()
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=args["stdout"], stderr=args["stderr"],
+                                       universal_newlines=True, cwd=cwd, env=env, shell=use_shell, **popen_kwargs)
+            if timeout is not None:
+                watchdog = _Watchdog(process, timeout)
+            stdout_str, stderr_str, rusage = AbstractCommandline._communicate(process, stdin, consumers, watchdog)
+        finally:
+            if watchdog is not None:
+                watchdog.finish()
+            for handle in handles:
+                handle.close()
+        wall_time = instrument.now() - start
+
+        if instrument.enabled():
+            files = [f for f in self.filenames() if os.path.isfile(f)]
+            record = instrument.Record(
+                tool=self.__class__.__name__, command=command, returncode=process.returncode, argv_time=argv_time,
+                lookup_time=self.__dict__.get('_lookup_time', 0.0), wall_time=wall_time, timestamp=timestamp,
+                input_bytes=sum(os.path.getsize(f) for f in files), input_files=files,
+            )
+            if rusage is not None:
+                record.user_time = rusage.ru_utime
+                record.sys_time = rusage.ru_stime
+                # Linux reports kilobytes, macOS bytes
+                record.max_rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+                record.read_bytes = rusage.ru_inblock * 512
+                record.write_bytes = rusage.ru_oublock * 512
+            instrument.emit(record)
+
+        if process.returncode:
+            # A program exiting by itself just before it would have been killed succeeded
+            error = ApplicationTimeout if watchdog is not None and watchdog.expired else ApplicationError
+            raise error(process.returncode, command, _tail(stdout, stdout_str, consumers.get("stdout")),
+                        _tail(stderr, stderr_str, consumers.get("stderr")))
+        return stdout_str, stderr_str
+
+    @staticmethod
+    def _streams(stdout, stderr, handles):
+        """Return the :obj:`subprocess.Popen` arguments and the consumers of the output streams
+
+        Parameters
+        ----------
+        stdout, stderr : bool, str, :obj:`Tail`
+           The destinations of the streams, see :meth:`__call__`
+        handles : list
+           Receives the opened files, to be closed after the call
+
+        """
+        consumers = {}
+        args = {}
+        for name, target in (("stdout", stdout), ("stderr", stderr)):
+            if name == "stderr" and not isinstance(target, bool) and (target is stdout or target == stdout):
+                # Both streams go to the same destination
+                args[name] = subprocess.STDOUT
+            elif target is True:
+                args[name] = subprocess.PIPE
+            elif not target:
+                args[name] = open(os.devnull, "w")
+                handles.append(args[name])
+            elif isinstance(target, Tail):
+                args[name] = subprocess.PIPE
+                consumers[name] = target
+            elif target.endswith(_COMPRESSED):
+                args[name] = subprocess.PIPE
+                consumers[name] = _CompressedOutput(target)
+                handles.append(consumers[name])
+            else:
+                args[name] = open(target, "w")
+                handles.append(args[name])
+        return args, consumers
+
+    @staticmethod
+    def _communicate(process, stdin, consumers=None, watchdog=None):
+        """Feed stdin and collect stdout/stderr of a process before reaping it
+
+        Parameters
+        ----------
+        process : :obj:`subprocess.Popen`
+        stdin : str
+        consumers : dict, optional
+           Objects with a ``write`` method receiving the ``stdout`` or ``stderr``
+           stream in chunks instead of collecting it
+        watchdog : :obj:`_Watchdog`, optional
+           The watchdog killing the process, disarmed before the process is reaped
+
+        Returns
+        -------
+        tuple
+           The captured stdout and stderr strings and the resource usage of the
+           child process, or :obj:`None` if :func:`os.wait4` is unavailable
+
+        """
+        consumers = consumers or {}
+        if not hasattr(os, "wait4"):
+            output = dict(zip(("stdout", "stderr"), process.communicate(stdin)))
+            for name, consumer in consumers.items():
+                consumer.write(output[name] or "")
+                output[name] = consumer.getvalue() if isinstance(consumer, Tail) else ""
+            return output["stdout"] or "", output["stderr"] or "", None
+
+        output = {}
+
+        def read(name, stream):
+            consumer = consumers.get(name)
+            if consumer is None:
+                output[name] = stream.read()
+            else:
+                for chunk in iter(lambda: stream.read(_CHUNK_SIZE), ""):
+                    consumer.write(chunk)
+                output[name] = consumer.getvalue() if isinstance(consumer, Tail) else ""
+            stream.close()
+
+        threads = []
+        for name in ("stdout", "stderr"):
+            stream = getattr(process, name)
+            if stream is not None:
+                threads.append(threading.Thread(target=read, args=(name, stream)))
+        for t in threads:
+            t.start()
+        try:
+            if stdin:
+                process.stdin.write(stdin)
+        except (IOError, OSError):
+            # The program exited without consuming its input
+            pass
+        finally:
+            process.stdin.close()
+        for t in threads:
+            t.join()
+
+        if watchdog is not None and hasattr(os, "waitid"):
+            # Wait without reaping, so that the watchdog cannot signal a reused process id
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            watchdog.finish()
+        _, status, rusage = os.wait4(process.pid, 0)
+        if os.WIFSIGNALED(status):
+            process.returncode = -os.WTERMSIG(status)
+        else:
+            process.returncode = os.WEXITSTATUS(status)
+        return output.get("stdout", ""), output.get("stderr", ""), rusage
+
+    def _as_list(self, values=None):
+        """Return the command line as list"""
+        self._validate()
+        values = self._values if values is None else values
+        commandline = [_escape_filename(self.program_name)]
+        for i in sorted(values):
+            commandline.extend(self._format_parameter(i, values[i]))
+        return commandline
+
+    def _format_parameter(self, i, value):
+        """Return the argv chunk of the parameter at index ``i`` set to ``value``
+
+        Subclasses override this method to adapt the syntax to the version of their
+        executable; it is also used by :obj:`CommandTemplate`.
+
+        """
+        return self._schema.parameters[i]._format(value)
+
+    def _prepare(self):
+        """Prepare a call before its command line is built
+
+        Subclasses override this method, e.g. to probe their executable, which must
+        not happen whenever a command line is merely formatted.
+
+        """
+
+    def _scratch_inputs(self, handles):
+        """Substitute buffers and compressed input files by scratch files or named pipes
+
+        Parameters
+        ----------
+        handles : list
+           Receives objects whose ``close`` method releases a substituted file; the
+           caller closes them, also if this method raises
+
+        Returns
+        -------
+        dict
+           The parameter values to build the command line from
+
+        """
+        parameters = self._schema.parameters
+        values = None
+        for i in sorted(self._values):
+            parameter, value = parameters[i], self._values[i]
+            if not getattr(parameter, 'is_filename', False) or getattr(parameter, 'is_output', False):
+                continue
+            paths = value if isinstance(value, (list, tuple)) else [value]
+            if not any(isinstance(p, scratch.Buffer) or scratch.is_compressed(p) for p in paths):
+                continue
+            substituted = []
+            for path in paths:
+                if not isinstance(path, scratch.Buffer) and not (scratch.is_compressed(path) and os.path.isfile(path)):
+                    substituted.append(path)
+                    continue
+                if isinstance(path, scratch.Buffer):
+                    handles.append(path.open())
+                else:
+                    handles.append(_Lease(scratch.default_cache(), path))
+                substituted.append(handles[-1].path)
+            if values is None:
+                values = dict(self._values)
+            values[i] = substituted if isinstance(value, (list, tuple)) else substituted[0]
+        return values
+
+    def template(self, *names):
+        """Return a :obj:`CommandTemplate` in which only the named parameters vary
+
+        All other parameters are fixed to their current values, validated and
+        formatted once when the template is created.
+
+        Parameters
+        ----------
+        *names : str
+           The names of the parameters to vary, e.g. ``"model"``
+
+        Returns
+        -------
+        :obj:`CommandTemplate`
+
+        Examples
+        --------
+        >>> from mxkit.apps import tmalign
+        >>> template = tmalign.TMalignCommandline("/usr/bin/TMalign", normalized=True).template("chain1", "chain2")
+        >>> for argv in template.generate([("a.pdb", "b.pdb"), ("a.pdb", "c.pdb")]):
+        ...     print(argv)
+        ['/usr/bin/TMalign', 'a.pdb', 'b.pdb', '-a']
+        ['/usr/bin/TMalign', 'a.pdb', 'c.pdb', '-a']
+
+        """
+        return CommandTemplate(self, names)
+
+    def filenames(self, output=False):
+        """Return the values of all set filename parameters
+
+        Parameters
+        ----------
+        output : bool, optional
+           Return the files written by the program instead of those read
+
+        Returns
+        -------
+        list
+           The file paths in parameter order; :obj:`Buffer <mxkit.scratch.Buffer>`
+           inputs are not files and thus excluded
+
+        """
+        files = []
+        for i in sorted(self._values):
+            parameter = self._schema.parameters[i]
+            if not getattr(parameter, 'is_filename', False) or self._values[i] is None:
+                continue
+            elif getattr(parameter, 'is_output', False) != output:
+                continue
+            elif isinstance(self._values[i], (list, tuple)):
+                files.extend(f for f in self._values[i] if not isinstance(f, scratch.Buffer))
+            elif not isinstance(self._values[i], scratch.Buffer):
+                files.append(self._values[i])
+        return files
+
+    def _check_serializable(self):
+        """Raise a ValueError if the command line only works when called in this process
+
+        :obj:`Buffer <mxkit.scratch.Buffer>` inputs only exist for the duration of a
+        call of the wrapper, so their command line cannot be run by other executors.
+
+        """
+        for value in self._values.values():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            if any(isinstance(v, scratch.Buffer) for v in values):
+                raise ValueError("Command lines with Buffer inputs must be called directly: {0}".format(self))
+
+    def resources(self):
+        """Return the expected resource use of a single call
+
+        Subclasses override this method to estimate the resources from their inputs,
+        e.g. the number of reflections in an MTZ file.
+
+        Returns
+        -------
+        dict
+           The number of ``cores`` and the ``memory`` in MiB
+
+        """
+        return {'cores': self._cores, 'memory': self._memory}
+
+    def capabilities(self):
+        """Return the version and supported flags of the executable
+
+        The executable is probed once per installed version, see :mod:`mxkit.probe`.
+
+        Returns
+        -------
+        :obj:`Capabilities <mxkit.probe.Capabilities>`
+
+        """
+        return probe.default_cache().probe(self.program_name, self._probe_args)
+
+    @staticmethod
+    def find_exec(program, dirs=None):
+        """Find the executable exename.
+
+        Parameters
+        ----------
+        program : str
+           The name or path to an executable
+        dirs : list, tuple, optional
+           Additional directories to search for the location
+
+        """
+        def is_exe(exe):
+            return os.path.isfile(exe) and os.access(exe, os.X_OK)
+
+        fpath, fname = os.path.split(program)
+        if fpath:
+            if is_exe(program):
+                return program
+        else:
+            paths = os.environ["PATH"].split(os.pathsep)
+            if dirs:
+                # Convert in case it's a tuple
+                paths += list(dirs)
+
+            for path in paths:
+                path = path.strip('"')
+                exe_file = os.path.join(path, program)
+                if is_exe(exe_file):
+                    return exe_file
+
+        msg = "Executable unavailable: {0}".format(program)
+        raise ValueError(msg)
+
+
+class ApplicationTimeout(ApplicationError):
+    """Raised when a program was killed after its timeout expired"""
+
+
+class _Watchdog(object):
+    """Kill a process and its session once its timeout expires"""
+
+    def __init__(self, process, timeout):
+        self.process = process
+        self.expired = False
+        self._finished = False
+        self._lock = threading.Lock()
+        self._timer = threading.Timer(timeout, self._kill)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def finish(self):
+        """Disarm the watchdog once the process has exited"""
+        with self._lock:
+            self._finished = True
+        self._timer.cancel()
+
+    def _kill(self):
+        with self._lock:
+            if self._finished:
+                return
+            self.expired = True
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                else:
+                    self.process.kill()
+            except OSError:
+                # The process exited in the meantime
+                self.expired = False
+
+
+class Tail(object):
+    """Keep only the last ``size`` characters of an output stream
+
+    Pass an instance as ``stdout`` or ``stderr`` of a call of an
+    :obj:`AbstractCommandline`; the call then returns the retained characters.
+
+    """
+
+    def __init__(self, size=65536):
+        self.size = size
+        self._chunks = collections.deque()
+        self._length = 0
+
+    def write(self, data):
+        self._chunks.append(data)
+        self._length += len(data)
+        while self._chunks and self._length - len(self._chunks[0]) >= self.size:
+            self._length -= len(self._chunks.popleft())
+
+    def getvalue(self):
+        """Return the retained characters"""
+        return "".join(self._chunks)[-self.size:] if self.size else ""
+
+
+# Output file suffixes handled by _CompressedOutput
+_COMPRESSED = (".gz", ".bz2", ".xz")
+# The number of characters read from a pipe at once
+_CHUNK_SIZE = 65536
+
+
+class _CompressedOutput(object):
+    """Compress a stream into a file while retaining its :obj:`Tail` for error reporting"""
+
+    def __init__(self, path):
+        if path.endswith(".gz"):
+            self._handle = gzip.open(path, "wt")
+        elif path.endswith(".bz2"):
+            self._handle = bz2.open(path, "wt")
+        else:
+            import lzma
+            self._handle = lzma.open(path, "wt")
+        self.tail = Tail()
+
+    def write(self, data):
+        self._handle.write(data)
+        self.tail.write(data)
+
+    def close(self):
+        self._handle.close()
+
+
+class _Lease(object):
+    """A reference to a decompressed copy in a :obj:`DecompressionCache <mxkit.scratch.DecompressionCache>`"""
+
+    def __init__(self, cache, path):
+        self.cache = cache
+        self.path = cache.acquire(path)
+
+    def close(self):
+        self.cache.release(self.path)
+
+
+def _tail(target, captured, consumer=None):
+    """Return the end of the output of a failed call for its error"""
+    if isinstance(consumer, _CompressedOutput):
+        return consumer.tail.getvalue()
+    elif isinstance(target, str) and os.path.isfile(target):
+        size = Tail().size
+        with open(target, "rb") as f_in:
+            f_in.seek(max(os.path.getsize(target) - size, 0))
+            return f_in.read().decode("utf-8", "replace")
+    return captured
+
+
+def _reflections(path):
+    """Return the number of reflections in an MTZ file, or None if it cannot be read"""
+    # Imported here so that importing the wrappers does not import NumPy
+    from mxkit.formats.mtz import read_header
+    try:
+        return read_header(path).nref
+    except (IOError, OSError, ValueError, IndexError, struct.error):
+        # Truncated or malformed headers fail while unpacking their records
+        return None
+
+
+class CommandTemplate(object):
+    """Generate many command lines differing only in a few parameters
+
+    Instances are created with :meth:`AbstractCommandline.template`. Constant parts
+    of the command line are stored pre-formatted, so each generated command line
+    only formats the varying values. Changes to the originating command line after
+    the template has been created are not reflected in the template.
+
+    """
+
+    def __init__(self, cmdline, names):
+        """Initialise a new :obj:`CommandTemplate`
+
+        Raises
+        ------
+        ValueError
+           A parameter is unknown, given more than once, a switch, or a required
+           parameter is neither set nor varying
+
+        """
+        schema = cmdline._schema
+        slots = []
+        for name in names:
+            try:
+                slots.append(schema.index[name])
+            except KeyError:
+                raise ValueError("Option name %s was not found." % name)
+        if len(set(slots)) != len(slots):
+            raise ValueError("Varying parameters multiply defined: %s" % ", ".join(names))
+        for i in slots:
+            if isinstance(schema.parameters[i], _Switch):
+                raise ValueError("Switch %s cannot vary" % schema.parameters[i].names[-1])
+        for i in schema.required:
+            if i not in cmdline._values and i not in slots:
+                raise ValueError("Parameter %s is not set." % schema.parameters[i].names[-1])
+
+        self.names = tuple(schema.parameters[i].names[-1] for i in slots)
+        self._parameters = tuple(schema.parameters[i] for i in slots)
+        self._slots = tuple(slots)
+        self._format = cmdline._format_parameter
+        self._checkers = tuple((k, p.names[-1], p.checker_function) for k, p in enumerate(self._parameters)
+                               if p.checker_function is not None)
+        self._check_value = cmdline._check_value
+
+        # Alternating constant argv chunks and indices into the varying values
+        self._segments = []
+        constant = [_escape_filename(cmdline.program_name)]
+        varying = {pos: k for k, pos in enumerate(slots)}
+        for pos in sorted(set(cmdline._values).union(slots)):
+            if pos in varying:
+                if constant:
+                    self._segments.append(constant)
+                    constant = []
+                self._segments.append(varying[pos])
+            else:
+                constant.extend(cmdline._format_parameter(pos, cmdline._values[pos]))
+        if constant:
+            self._segments.append(constant)
+
+    def generate(self, values):
+        """Generate a command line per set of varying values
+
+        Parameters
+        ----------
+        values : list, tuple, generator
+           Sequences holding one value per varying parameter, in the order the
+           parameters were named when creating the template
+
+        Returns
+        -------
+        generator
+           The command lines as list
+
+        """
+        n = len(self._parameters)
+        for row in values:
+            if isinstance(row, str) or len(row) != n:
+                raise ValueError("Expected {0} values for {1}: {2!r}".format(n, ", ".join(self.names), row))
+            for k, name, checker in self._checkers:
+                self._check_value(row[k], name, checker)
+            argv = []
+            for segment in self._segments:
+                if segment.__class__ is int:
+                    argv.extend(self._format(self._slots[segment], row[segment]))
+                else:
+                    argv.extend(segment)
+            yield argv
+
+    def commands(self, values):
+        """Generate a command line string per set of varying values, see :meth:`generate`"""
+        for argv in self.generate(values):
+            yield " ".join(argv)
+
+
+class _Schema(object):
+    """Build-once lookup tables for the parameters of a command line wrapper"""
+
+    __slots__ = ['parameters', 'index', 'required']
+
+    def __init__(self, parameters, cls):
+        """Compile the parameters and create a property per parameter on ``cls``"""
+        self.parameters = tuple(parameters)
+        self.index = {}
+        for i, p in enumerate(self.parameters):
+            for name in p.names:
+                if name in self.index:
+                    raise ValueError("Parameter alias %s multiply defined" % name)
+                self.index[name] = i
+            name = p.names[-1]
+            if _re_prop_name.match(name) is None:
+                raise ValueError("Final parameter name %r cannot be used as an argument or property "
+                                 "name in python" % name)
+            elif name in _reserved_names or name in _local_reserved_names:
+                raise ValueError("Final parameter name %r cannot be used as an argument or property "
+                                 "name because it is a reserved word" % name)
+            if not isinstance(cls.__dict__.get(name), property):
+                setattr(cls, name, _Schema._property(name, p.description))
+        self.required = tuple(i for i, p in enumerate(self.parameters) if p.is_required)
+
+    @staticmethod
+    def _property(name, doc):
+        return property(lambda x: x._get_parameter(name),
+                        lambda x, value: x.set_parameter(name, value),
+                        lambda x: x._clear_parameter(name),
+                        doc)
+
+
+class Argument(_Argument):
+    def __init__(self, names, description, output=False, **kwargs):
+        super(Argument, self).__init__(names, description, **kwargs)
+        self.is_output = output
+
+    def _as_list(self):
+        return self._format(self.value)
+
+    def _format(self, value):
+        if value is None:
+            return []
+        elif self.is_filename:
+            return [_escape_filename(value)]
+        else:
+            return [str(value)]
+
+
+class ArgumentList(_ArgumentList):
+    def __init__(self, names, description, output=False, **kwargs):
+        super(ArgumentList, self).__init__(names, description, **kwargs)
+        self.is_output = output
+
+    def _as_list(self):
+        return self._format(self.value)
+
+    def _format(self, value):
+        assert isinstance(value, list), \
+                "Arguments should be a list"
+        assert value, "Requires at least one filename"
+        if self.is_filename:
+            return [_escape_filename(v) for v in value]
+        else:
+            return [str(v) for v in value]
+
+
+class Option(_Option):
+    def __init__(self, names, description, output=False, **kwargs):
+        super(Option, self).__init__(names, description, **kwargs)
+        self.is_output = output
+
+    def _as_list(self):
+        return self._format(self.value)
+
+    def _format(self, value):
+        if value is None:
+            return [self.names[0]]
+        if self.is_filename:
+            v = _escape_filename(value)
+        else:
+            v = str(value)
+        if self.equate:
+            return ["%s=%s" % (self.names[0], v)]
+        else:
+            return [self.names[0], v]
+
+
+class Switch(_Switch):
+    def _as_list(self):
+        assert not hasattr(self, "value")
+        if self.is_set:
+            return [self.names[0]]
+        else:
+            return []
+
+    def _format(self, value):
+        return [self.names[0]]
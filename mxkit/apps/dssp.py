@@ -9,6 +9,19 @@ Examples
 >>> print(dssp_exe)
 /usr/bin/dssp -i model.pdb -o model.dssp
 
+Since version 4, ``mkdssp`` takes its input and output files as positional arguments
+and writes mmCIF unless asked for the classic format. When called, the wrapper probes
+its executable once, see :meth:`capabilities <mxkit.apps.AbstractCommandline.capabilities>`,
+and builds the command line in the syntax of that version. Formatting a command line
+never probes; :meth:`DsspCommandline.resolve` selects the syntax beforehand, e.g. for
+command lines run through :mod:`mxkit.dispatch` or a
+:obj:`CommandTemplate <mxkit.apps.CommandTemplate>`:
+
+>>> dssp_exe = dssp.DsspCommandline("/usr/bin/mkdssp", input="model.pdb", output="model.dssp")
+>>> capabilities = dssp_exe.resolve()
+>>> print(dssp_exe)
+/usr/bin/mkdssp model.pdb model.dssp --output-format dssp
+
 Citations
 ---------
 .. [#] Kabsch W, Sander C (1983). Dictionary of protein secondary structure: pattern
@@ -20,6 +33,8 @@ __author__ = "Felix Simkovic"
 __date__ = "17 May 2017"
 __version__ = "0.1"
 
+from Bio.Application import _escape_filename
+
 from mxkit.apps import AbstractCommandline
 from mxkit.apps import Argument
 from mxkit.apps import Option
@@ -28,19 +43,57 @@ from mxkit.apps import Switch
 
 class DsspCommandline(AbstractCommandline):
 
+    _parameters = [
+        Switch(['-v', 'verbose'],
+               'Verbose output'),
+        Option(['-i', 'input'],
+                "Input structure",
+                equate=False,
+                filename=True,
+                is_required=True),
+        Option(['-o', 'output'],
+                "Output DSSP file",
+                equate=False,
+                filename=True,
+                output=True,
+                is_required=True),
+    ]
+
     def __init__(self, cmd='dssp', **kwargs):
-        self.parameters = [
-            Switch(['-v', 'verbose'],
-                   'Verbose output'),
-            Option(['-i', 'input'],
-                    "Input structure",
-                    equate=False,
-                    filename=True,
-                    is_required=True),
-            Option(['-o', 'output'],
-                    "Output DSSP file",
-                    equate=False,
-                    filename=True,
-                    is_required=True),
-        ]
         AbstractCommandline.__init__(self, cmd, **kwargs)
+
+    def resolve(self, capabilities=None):
+        """Select the command line syntax for the version of the executable
+
+        Parameters
+        ----------
+        capabilities : :obj:`Capabilities <mxkit.probe.Capabilities>`, optional
+           The capabilities of the executable, e.g. shared by many command lines
+           [default: probe the executable]
+
+        Returns
+        -------
+        :obj:`Capabilities <mxkit.probe.Capabilities>`
+
+        """
+        if capabilities is None:
+            capabilities = self.capabilities()
+        positional = capabilities.major is not None and capabilities.major >= 4
+        # Bypass __setattr__ which treats all other attributes as parameters
+        self.__dict__['_syntax'] = (positional, positional and capabilities.supports("--output-format"))
+        return capabilities
+
+    def _prepare(self):
+        if '_syntax' not in self.__dict__:
+            self.resolve()
+
+    def _format_parameter(self, i, value):
+        positional, output_format = self.__dict__.get('_syntax', (False, False))
+        if not positional:
+            return AbstractCommandline._format_parameter(self, i, value)
+        name = self._schema.parameters[i].names[-1]
+        if name == 'verbose':
+            return ["--verbose"]
+        elif name == 'output' and output_format:
+            return [_escape_filename(value), "--output-format", "dssp"]
+        return [_escape_filename(value)]
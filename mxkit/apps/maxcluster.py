@@ -42,6 +42,8 @@ __author__ = "Felix Simkovic"
 __date__ = "30 Aug 2016"
 __version__ = "0.1"
 
+import os
+
 from mxkit.apps import AbstractCommandline
 from mxkit.apps import Option
 from mxkit.apps import Switch
@@ -49,6 +51,75 @@ from mxkit.apps import Switch
 
 class MaxclusterCommandline(AbstractCommandline):
 
+    _parameters = [
+        Option(['-e', 'pdb_experiment'],
+               'PDB experiment',
+               equate=False,
+               filename=True),
+        Option(['-p', 'pdb_prediction'],
+               'PDB prediction',
+               equate=False,
+               filename=True),
+        Option(['-l', 'pdb_list'],
+               'File containing a list of PDB model fragments',
+               equate=False,
+               filename=True),
+
+        # OPTIONS
+        Option(['-L', 'log_level'],
+               'Log level (default is 4 for single MaxSub, 1 for lists)',
+               equate=False),
+        Option(['-d', 'distance_cutoff'],
+               'The distance cut-off for search (default auto-calibrate)',
+               equate=False),
+        Option(['-N', 'norm_length'],
+               'The normalisation length for TM score (default is length of experiment)',
+               equate=False),
+        Switch(['-rmsd', 'rmsd'],
+               'Perform only RMSD fit'),
+        Option(['-i', 'maxsubdom_iterations'],
+               'MaxSubDom iterations (default = 1)',
+               equate=False),
+        Switch(['-in', 'sequence_independent'],
+               'Sequence independant mode'),
+
+        # CLUSTERING OPTIONS
+        Option(['-C', 'cluster_method'],
+                "Cluster method:"
+                "   0 - No clustering"
+                "   1 - Single linkage"
+                "   2 - Average linkage"
+                "   3 - Maximum linkage"
+                "   4 - Neighbour pairs (min size)"
+                "   5 - Neighbour pairs (absolute size)"
+                "(default = 5)",
+                equate=False),
+        Option(['-T', 'init_cluster_threshold'],
+               'Initial clustering threshold (default RMSD = 4; MaxSub = 0.5)',
+               equate=False),
+        Option(['-Tm', 'max_cluster_threshold'],
+               'Maximum clustering threshold (default RMSD = 8; MaxSub = 0.8)',
+               equate=False),
+        Option(['-a', 'adj_cluster_threshold'],
+               'Clustering threshold adjustment (default RMSD = 0.2; MaxSub = 0.05)',
+               equate=False),
+        Option(['-is', 'init_cluster_size'],
+               'Initial cluster size (default = 50)',
+               equate=False),
+        Option(['-ms', 'min_cluster_size'],
+               'Minimum cluster size (default = 5)',
+               equate=False),
+        Option(['-s', 'score_threshold'],
+               '3D-jury score threshold (default = 0.2)',
+               equate=False),
+        Option(['-P', 'pair_threshold'],
+               '3D-jury pair threshold (default = 20)',
+               equate=False)
+
+    ]
+
+    _memory = 64
+
     def __init__(self, cmd='maxcluster', **kwargs):
         if not self.options_ok(**kwargs):
             msg = "Unknown combination: Please use one of the following:" \
@@ -61,72 +132,6 @@ class MaxclusterCommandline(AbstractCommandline):
                   "     -l [file]   File containing a list of PDB model fragments"
             raise RuntimeError(msg)
 
-        self.parameters = [
-            Option(['-e', 'pdb_experiment'],
-                   'PDB experiment',
-                   equate=False,
-                   filename=True),
-            Option(['-p', 'pdb_prediction'],
-                   'PDB prediction',
-                   equate=False,
-                   filename=True),
-            Option(['-l', 'pdb_list'],
-                   'File containing a list of PDB model fragments',
-                   equate=False,
-                   filename=True),
-
-            # OPTIONS
-            Option(['-L', 'log_level'],
-                   'Log level (default is 4 for single MaxSub, 1 for lists)',
-                   equate=False),
-            Option(['-d', 'distance_cutoff'],
-                   'The distance cut-off for search (default auto-calibrate)',
-                   equate=False),
-            Option(['-N', 'norm_length'],
-                   'The normalisation length for TM score (default is length of experiment)',
-                   equate=False),
-            Switch(['-rmsd', 'rmsd'],
-                   'Perform only RMSD fit'),
-            Option(['-i', 'maxsubdom_iterations'],
-                   'MaxSubDom iterations (default = 1)',
-                   equate=False),
-            Switch(['-in', 'sequence_independent'],
-                   'Sequence independant mode'),
-
-            # CLUSTERING OPTIONS
-            Option(['-C', 'cluster_method'],
-                    "Cluster method:"
-                    "   0 - No clustering"
-                    "   1 - Single linkage"
-                    "   2 - Average linkage"
-                    "   3 - Maximum linkage"
-                    "   4 - Neighbour pairs (min size)"
-                    "   5 - Neighbour pairs (absolute size)"
-                    "(default = 5)",
-                    equate=False),
-            Option(['-T', 'init_cluster_threshold'],
-                   'Initial clustering threshold (default RMSD = 4; MaxSub = 0.5)',
-                   equate=False),
-            Option(['-Tm', 'max_cluster_threshold'],
-                   'Maximum clustering threshold (default RMSD = 8; MaxSub = 0.8)',
-                   equate=False),
-            Option(['-a', 'adj_cluster_threshold'],
-                   'Clustering threshold adjustment (default RMSD = 0.2; MaxSub = 0.05)',
-                   equate=False),
-            Option(['-is', 'init_cluster_size'],
-                   'Initial cluster size (default = 50)',
-                   equate=False),
-            Option(['-ms', 'min_cluster_size'],
-                   'Minimum cluster size (default = 5)',
-                   equate=False),
-            Option(['-s', 'score_threshold'],
-                   '3D-jury score threshold (default = 0.2)',
-                   equate=False),
-            Option(['-P', 'pair_threshold'],
-                   '3D-jury pair threshold (default = 20)',
-                   equate=False)
-
-        ]
         AbstractCommandline.__init__(self, cmd, **kwargs)
 
     @staticmethod
@@ -143,3 +148,13 @@ class MaxclusterCommandline(AbstractCommandline):
             return True
         return False
 
+    def resources(self):
+        """Estimate the memory from the number of models in ``pdb_list``"""
+        resources = AbstractCommandline.resources(self)
+        if self.pdb_list and os.path.isfile(self.pdb_list):
+            with open(self.pdb_list, "r") as f_in:
+                n = sum(1 for line in f_in if line.strip())
+            # Memory is dominated by the pairwise score matrix
+            resources['memory'] += n * n * 4 // 2 ** 20
+        return resources
+
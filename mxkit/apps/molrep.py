@@ -114,50 +114,67 @@ from mxkit.apps import AbstractCommandline
 from mxkit.apps import Argument
 from mxkit.apps import Option
 from mxkit.apps import Switch
+from mxkit.apps._base import _reflections
 
 
 class MolrepCommandline(AbstractCommandline):
 
+    _parameters = [
+        Switch(['-h', 'help'],
+               ''),
+        Switch(['-i', 'interactive'],
+               ''),
+
+        Option(['-f', 'hklin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-m', 'xyzin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-m2', 'xyzin2'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-mx', 'fixed_xyzin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-s', 'seqin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-s2', 'seqin2'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-k', 'keyin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['-po', 'out_dir'],
+               '',
+               equate=False),
+        Option(['-ps', 'out_scr'],
+               '',
+               equate=False),
+    ]
+
+    _memory = 512
+
+    @property
+    def _stdin_keywords(self):
+        # Keywords are read from stdin in interactive mode
+        return bool(self.interactive)
+
     def __init__(self, cmd='molrep', **kwargs):
-        self.parameters = [
-            Switch(['-h', 'help'],
-                   ''),
-            Switch(['-i', 'interactive'],
-                   ''),
-
-            Option(['-f', 'hklin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-m', 'xyzin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-m2', 'xyzin2'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-mx', 'fixed_xyzin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-s', 'seqin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-s2', 'seqin2'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-k', 'keyin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['-po', 'out_dir'],
-                   '',
-                   equate=False),
-            Option(['-ps', 'out_scr'],
-                   '',
-                   equate=False),
-        ]
         AbstractCommandline.__init__(self, cmd, **kwargs)
+
+    def resources(self):
+        """Estimate the memory from the number of reflections in ``hklin``"""
+        resources = AbstractCommandline.resources(self)
+        nref = _reflections(self.hklin) if self.hklin else None
+        if nref:
+            resources['memory'] += nref * 2 // 1024
+        return resources
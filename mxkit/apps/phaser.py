@@ -33,12 +33,15 @@ from mxkit.apps import Switch
 
 class PhaserCommandline(AbstractCommandline):
 
-    def __init__(self, cmd='phaser', **kwargs):
-        self.parameters = [
-            Switch(['-h', 'help'],
-                   ''),
-            Switch(['-i', 'interactive'],
-                   '')
-            ]
+    _parameters = [
+        Switch(['-h', 'help'],
+               ''),
+        Switch(['-i', 'interactive'],
+               '')
+    ]
+
+    _memory = 2048
+    _stdin_keywords = True
 
+    def __init__(self, cmd='phaser', **kwargs):
         AbstractCommandline.__init__(self, cmd, **kwargs)
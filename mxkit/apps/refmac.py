@@ -30,33 +30,47 @@ from mxkit.apps import AbstractCommandline
 from mxkit.apps import Argument
 from mxkit.apps import Option
 from mxkit.apps import Switch
+from mxkit.apps._base import _reflections
 
 
 class RefmacCommandline(AbstractCommandline):
 
-    def __init__(self, cmd='refmac5', **kwargs):
-        self.parameters = [
-            Switch(['-h', 'help'],
-                   ''),
-            Switch(['-i', 'interactive'],
-                   ''),
-
-            Option(['HKLIN', 'hklin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['HKLOUT', 'hklout'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['XYZIN', 'xyzin'],
-                   '',
-                   equate=False,
-                   filename=True),
-            Option(['XYZOUT', 'xyzout'],
-                   '',
-                   equate=False,
-                   filename=True),
-            ]
+    _parameters = [
+        Switch(['-h', 'help'],
+               ''),
+        Switch(['-i', 'interactive'],
+               ''),
+
+        Option(['HKLIN', 'hklin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['HKLOUT', 'hklout'],
+               '',
+               equate=False,
+               filename=True,
+               output=True),
+        Option(['XYZIN', 'xyzin'],
+               '',
+               equate=False,
+               filename=True),
+        Option(['XYZOUT', 'xyzout'],
+               '',
+               equate=False,
+               filename=True,
+               output=True),
+    ]
+
+    _memory = 512
+    _stdin_keywords = True
 
+    def __init__(self, cmd='refmac5', **kwargs):
         AbstractCommandline.__init__(self, cmd, **kwargs)
+
+    def resources(self):
+        """Estimate the memory from the number of reflections in ``hklin``"""
+        resources = AbstractCommandline.resources(self)
+        nref = _reflections(self.hklin) if self.hklin else None
+        if nref:
+            resources['memory'] += nref * 4 // 1024
+        return resources
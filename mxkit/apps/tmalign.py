@@ -39,44 +39,51 @@ from mxkit.apps import Switch
 
 class TMalignCommandline(AbstractCommandline):
 
+    _parameters = [
+        Argument(['chain1'],
+                 'first PDB structure',
+                 filename=True,
+                 is_required=True),
+        Argument(['chain2'],
+                 'second PDB structure',
+                 filename=True,
+                 is_required=True),
+
+        Option(['-i', 'aln_in'],
+               'an alignment specified in fasta file',
+               equate=False,
+               filename=True),
+        Option(['-I', 'aln_out'],
+               'stick the alignment to this file',
+               equate=False,
+               filename=True),
+
+        Option(['-o', 'superposition'],
+               "output the superposition to 'TM.sup', 'TM.sup_all' and 'TM.sup_atm'",
+               equate=False,
+               filename=True,
+               output=True),
+
+        Switch(['-a', 'normalized'],
+               'TM-score normalized by the average length of two proteins'),
+
+        Option(['-L', 'assigned_length'],
+               'TM-score normalized by an assigned length (>L_min)',
+               equate=False),
+        Option(['-d', 'scale_factor'],
+               'TM-score scaled by an assigned d0',
+               equate=False),
+
+        Option(['-m', 'rotation_matrix'],
+               'output TM-align rotation matrix',
+               equate=False,
+               filename=True,
+               output=True),
+    ]
+
+    _memory = 32
+    # Called without arguments, the program prints its version and usage
+    _probe_args = ()
+
     def __init__(self, cmd='TMalign', **kwargs):
-        self.parameters = [
-            Argument(['chain1'],
-                     'first PDB structure',
-                     filename=True,
-                     is_required=True),
-            Argument(['chain2'],
-                     'second PDB structure',
-                     filename=True,
-                     is_required=True),
-
-            Option(['-i', 'aln_in'],
-                   'an alignment specified in fasta file',
-                   equate=False,
-                   filename=True),
-            Option(['-I', 'aln_out'],
-                   'stick the alignment to this file',
-                   equate=False,
-                   filename=True),
-
-            Option(['-o', 'superposition'],
-                   "output the superposition to 'TM.sup', 'TM.sup_all' and 'TM.sup_atm'",
-                   equate=False,
-                   filename=True),
-
-            Switch(['-a', 'normalized'],
-                   'TM-score normalized by the average length of two proteins'),
-
-            Option(['-L', 'assigned_length'],
-                   'TM-score normalized by an assigned length (>L_min)',
-                   equate=False),
-            Option(['-d', 'scale_factor'],
-                   'TM-score scaled by an assigned d0',
-                   equate=False),
-
-            Option(['-m', 'rotation_matrix'],
-                   'output TM-align rotation matrix',
-                   equate=False,
-                   filename=True),
-        ]
         AbstractCommandline.__init__(self, cmd, **kwargs)
@@ -64,24 +64,29 @@ from mxkit.apps import Switch
 
 class TMscoreCommandline(AbstractCommandline):
 
+    _parameters = [
+        Switch(['-c', 'complex'],
+               'Run TM-score to compare two complex structures with multiple chains'),
+        Option(['-d', 'norm_scale'],
+               'TM-score normalized with an assigned scale d0',
+                equate=False),
+        Option(['-l', 'norm_length'],
+               'TM-score normalized by a specific length',
+               equate=False),
+
+        Argument(['model'],
+                 "Input model structure",
+                 filename=True,
+                 is_required=True),
+        Argument(['native'],
+                  "Input native structure",
+                  filename=True,
+                  is_required=True),
+    ]
+
+    _memory = 32
+    # Called without arguments, the program prints its version and usage
+    _probe_args = ()
+
     def __init__(self, cmd='TMscore', **kwargs):
-        self.parameters = [
-            Switch(['-c', 'complex'],
-                   'Run TM-score to compare two complex structures with multiple chains'),
-            Option(['-d', 'norm_scale'],
-                   'TM-score normalized with an assigned scale d0',
-                    equate=False),
-            Option(['-l', 'norm_length'],
-                   'TM-score normalized by a specific length',
-                   equate=False),
-
-            Argument(['model'],
-                     "Input model structure",
-                     filename=True,
-                     is_required=True),
-            Argument(['native'],
-                      "Input native structure",
-                      filename=True,
-                      is_required=True),
-        ]
         AbstractCommandline.__init__(self, cmd, **kwargs)
@@ -0,0 +1,11 @@
+"""Drivers for running command line wrappers over large sets of structures
+
+The modules in this package combine the wrappers in :mod:`mxkit.apps` with the
+execution layer in :mod:`mxkit.dispatch`, and store the parsed results compactly
+so interrupted runs can be resumed.
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
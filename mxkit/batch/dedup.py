@@ -0,0 +1,272 @@
+"""Content-addressed deduplication of molecular replacement jobs
+
+Description
+-----------
+Search model ensembles generated by different tools often contain models that are
+byte-identical, or that only differ in their headers, atom serial numbers, B-factors
+or insignificant coordinate digits. Running Molrep or Phaser once per copy is wasted
+time.
+
+The :obj:`Deduplicator` fingerprints every search model by
+
+* a content hash of the file, which identifies byte-identical files without parsing
+  them a second time, and
+* a coordinate hash over the atom and residue names, residue numbers and the
+  coordinates rounded to a tolerance grid, which identifies models with identical
+  atoms in different files.
+
+Jobs that only differ in the files of equivalent search models, or in parameters that do
+not affect the result such as output locations, are grouped. Only the first job of each
+group is run, and its result is fanned out to all other jobs of the group, including
+copies of the output files it declared and of the files it wrote to its output
+locations.
+
+Programs reading their keywords from stdin, such as Phaser, are only grouped if the
+stdin of every job is given; without it, each job is run on its own.
+
+Coordinates within the tolerance but on different sides of a grid boundary are not
+recognised as identical; the deduplication may miss such models, but never groups
+models whose coordinates differ by more than the tolerance.
+
+Examples
+--------
+>>> from mxkit.apps.molrep import MolrepCommandline
+>>> from mxkit.batch.dedup import Deduplicator
+>>> cmdlines = [MolrepCommandline(hklin="data.mtz", xyzin=m, out_dir=m[:-4]) for m in models]
+>>> results = Deduplicator().run(cmdlines)
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import hashlib
+import os
+import shutil
+
+import numpy as np
+
+from mxkit.dispatch.backends import LocalBackend
+from mxkit.dispatch.backends import Result
+from mxkit.formats.pdb import open_structure
+
+
+def content_hash(path, blocksize=1 << 20):
+    """Return the SHA-1 hex digest of the content of a file"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f_in:
+        for block in iter(lambda: f_in.read(blocksize), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def coordinate_hash(path, tolerance=0.01):
+    """Return a digest of the atoms of a PDB file that is insensitive to formatting
+
+    Parameters
+    ----------
+    path : str
+       The path to the PDB file, optionally gzip-compressed
+    tolerance : float, optional
+       The grid spacing coordinates are rounded to in Angstrom [default: 0.01]
+
+    Returns
+    -------
+    str
+       The SHA-1 hex digest, or None if the file contains no atoms
+
+    """
+    atoms, coords = [], []
+    with open_structure(path) as f_in:
+        for line in f_in:
+            record = line[:6]
+            if record == "ENDMDL":
+                break
+            elif record in ("ATOM  ", "HETATM"):
+                # Atom name, alternate location, residue name, chain, residue number, insertion code
+                atoms.append(line[12:27])
+                coords.append((float(line[30:38]), float(line[38:46]), float(line[46:54])))
+    if not atoms:
+        return None
+    grid = np.round(np.array(coords) / tolerance).astype(np.int64)
+    digest = hashlib.sha1("\n".join(atoms).encode("ascii", "replace"))
+    digest.update(grid.tobytes())
+    return digest.hexdigest()
+
+
+class Deduplicator(object):
+    """Group jobs with equivalent search models and run each group once"""
+
+    def __init__(self, models=('xyzin', 'xyzin2', 'fixed_xyzin'), ignore=('out_scr', ), outputs=('out_dir', ),
+                 tolerance=0.01):
+        """Initialise a new :obj:`Deduplicator`
+
+        Parameters
+        ----------
+        models : list, tuple, optional
+           The names of the parameters holding search models
+        ignore : list, tuple, optional
+           The names of parameters that do not affect the result; output filename
+           parameters are always ignored
+        outputs : list, tuple, optional
+           The names of parameters holding output directories or path prefixes; they
+           are ignored, and the files written there are copied to those of the duplicates
+        tolerance : float, optional
+           The coordinate tolerance in Angstrom, see :func:`coordinate_hash`
+
+        """
+        self.models = set(models)
+        self.ignore = set(ignore)
+        self.outputs = set(outputs)
+        self.tolerance = tolerance
+        self._content = {}
+        self._coordinates = {}
+
+    def fingerprint(self, path):
+        """Return the fingerprint of a search model"""
+        path = os.path.abspath(path)
+        if path not in self._content:
+            self._content[path] = content_hash(path)
+        content = self._content[path]
+        # Byte-identical files share their coordinate hash
+        if content not in self._coordinates:
+            self._coordinates[content] = coordinate_hash(path, tolerance=self.tolerance) or content
+        return self._coordinates[content]
+
+    def key(self, cmdline, stdin=None, models=None):
+        """Return the key identifying equivalent jobs
+
+        Parameters
+        ----------
+        cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`
+           The command line
+        stdin : str, optional
+           The standard input of the job, e.g. Phaser keywords
+        models : list, tuple, optional
+           Paths to search models referenced in ``stdin``; their occurrences are
+           replaced by the model fingerprints
+
+        """
+        fields = [cmdline.program_name]
+        for parameter in cmdline.parameters:
+            name = parameter.names[-1]
+            if not parameter.is_set or name in self.ignore or name in self.outputs \
+                    or getattr(parameter, 'is_output', False):
+                continue
+            value = getattr(parameter, 'value', True)
+            if name in self.models and value is not None:
+                if isinstance(value, (list, tuple)):
+                    value = [self.fingerprint(v) for v in value]
+                else:
+                    value = self.fingerprint(value)
+            fields.append("{0}={1!r}".format(name, value))
+        if stdin is not None:
+            for path in sorted(models or [], key=len, reverse=True):
+                stdin = stdin.replace(path, self.fingerprint(path))
+            fields.append(stdin)
+        return hashlib.sha1("\0".join(fields).encode("utf-8")).hexdigest()
+
+    def groups(self, cmdlines, stdins=None, models=None):
+        """Group equivalent jobs
+
+        Parameters
+        ----------
+        cmdlines : list, tuple
+           The command lines
+        stdins : list, tuple, optional
+           The standard input per job
+        models : list, tuple, optional
+           The search model paths referenced in the standard input per job
+
+        Returns
+        -------
+        list
+           The lists of job indices per group in order of first occurrence; the first
+           index of each group is the job to run
+
+        """
+        cmdlines = list(cmdlines)
+        stdins = stdins or [None] * len(cmdlines)
+        models = models or [None] * len(cmdlines)
+        groups = {}
+        order = []
+        for i, (cmdline, stdin, paths) in enumerate(zip(cmdlines, stdins, models)):
+            if stdin is None and getattr(cmdline, '_stdin_keywords', False):
+                # The command line alone does not determine the result
+                key = i
+            else:
+                key = self.key(cmdline, stdin=stdin, models=paths)
+            if key not in groups:
+                groups[key] = []
+                order.append(key)
+            groups[key].append(i)
+        return [groups[key] for key in order]
+
+    def run(self, cmdlines, stdins=None, models=None, backend=None):
+        """Run each group of equivalent jobs once and fan the results out
+
+        Parameters
+        ----------
+        cmdlines : list, tuple
+           The command lines
+        stdins : list, tuple, optional
+           The standard input per job
+        models : list, tuple, optional
+           The search model paths referenced in the standard input per job
+        backend : :obj:`Backend <mxkit.dispatch.backends.Backend>`, optional
+           The backend running the unique jobs [default: :obj:`LocalBackend <mxkit.dispatch.backends.LocalBackend>`]
+
+        Returns
+        -------
+        list
+           The :obj:`Result <mxkit.dispatch.backends.Result>` per command line
+
+        """
+        cmdlines = list(cmdlines)
+        stdins = list(stdins) if stdins is not None else [None] * len(cmdlines)
+        groups = self.groups(cmdlines, stdins=stdins, models=models)
+        backend = backend or LocalBackend()
+        unique = backend.run([cmdlines[group[0]] for group in groups], stdins=[stdins[group[0]] for group in groups])
+        results = [None] * len(cmdlines)
+        for group, result in zip(groups, unique):
+            results[group[0]] = result
+            source = cmdlines[group[0]]
+            for i in group[1:]:
+                if result.ok:
+                    for a, b in zip(source.filenames(output=True), cmdlines[i].filenames(output=True)):
+                        if os.path.isfile(a) and os.path.abspath(a) != os.path.abspath(b):
+                            shutil.copyfile(a, b)
+                    for name in self.outputs:
+                        a, b = getattr(source, name, None), getattr(cmdlines[i], name, None)
+                        if a and b and os.path.abspath(a) != os.path.abspath(b):
+                            _copy_outputs(a, b)
+                results[i] = Result(str(cmdlines[i]), returncode=result.returncode, stdout=result.stdout,
+                                    stderr=result.stderr)
+        return results
+
+
+def _copy_outputs(source, destination):
+    """Copy the files written to an output directory or below a path prefix"""
+    if os.path.isdir(source):
+        if not os.path.isdir(destination):
+            os.makedirs(destination)
+        for name in os.listdir(source):
+            a, b = os.path.join(source, name), os.path.join(destination, name)
+            if os.path.isdir(a):
+                if os.path.isdir(b):
+                    shutil.rmtree(b)
+                shutil.copytree(a, b)
+            else:
+                shutil.copyfile(a, b)
+        return
+    directory, prefix = os.path.split(source)
+    if not prefix or not os.path.isdir(directory or os.curdir):
+        return
+    target = os.path.dirname(destination)
+    if target and not os.path.isdir(target):
+        os.makedirs(target)
+    for name in os.listdir(directory or os.curdir):
+        a = os.path.join(directory, name)
+        if name.startswith(prefix) and os.path.isfile(a):
+            shutil.copyfile(a, destination + name[len(prefix):])
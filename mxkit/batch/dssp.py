@@ -0,0 +1,380 @@
+"""Secondary structure assignment of a structure library with DSSP
+
+Description
+-----------
+The :obj:`BatchDssp` driver runs :obj:`DsspCommandline <mxkit.apps.dssp.DsspCommandline>`
+over a directory or list of structures on a pool of persistent shells. Instead of
+keeping one ``.dssp`` file per structure, the secondary structure string and the
+solvent accessibility per residue of every chain are stored in a single
+:obj:`SecondaryStructureStore`, an SQLite database indexed by model identifier, so that
+the assignments of individual models are looked up without reading the others.
+
+The store also holds a manifest of the modification time, size and SHA-1 digest of every
+processed file. When restarted, files whose modification time and size are unchanged
+are skipped, as are files whose modification time changed but whose content did not.
+Files for which DSSP failed are not recorded and thus retried on the next run.
+
+Models are identified by their file name without the structure and compression
+extensions, e.g. ``model_0001`` for ``library/model_0001.pdb.gz``.
+
+Examples
+--------
+>>> from mxkit.batch.dssp import BatchDssp
+>>> driver = BatchDssp("library", "library.ss.sqlite", nproc=16, cmd="mkdssp")
+>>> failed = driver.run()
+>>> ss, acc = driver.store.get("model_0001")["A"]
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import collections
+import glob
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+
+from mxkit import scratch
+from mxkit.apps.dssp import DsspCommandline
+from mxkit.batch.dedup import content_hash
+from mxkit.dispatch.worker import ShellPool
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+#: The extensions of structure files picked up from a directory
+EXTENSIONS = ('.pdb', '.ent', '.cif', '.mmcif')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chains (
+    model TEXT NOT NULL,
+    chain TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    ss TEXT NOT NULL,
+    acc BLOB NOT NULL,
+    PRIMARY KEY (model, chain)
+) WITHOUT ROWID;
+"""
+
+
+def parse(text):
+    """Parse the residue section of a classic DSSP file
+
+    Chain identifiers are read from the ``AUTHCHAIN`` or ``CHAIN`` columns at the end of
+    the lines written by recent versions, which unlike column 12 hold identifiers of more
+    than one character, e.g. of mmCIF models.
+
+    Parameters
+    ----------
+    text : str
+       The content of the DSSP file
+
+    Returns
+    -------
+    :obj:`collections.OrderedDict`
+       The secondary structure string and the accessibility array per chain, in
+       order of appearance; coil residues are assigned ``-``
+
+    Raises
+    ------
+    ValueError
+       The text does not contain a DSSP residue section
+
+    """
+    lines = iter(text.splitlines())
+    for line in lines:
+        if line.startswith("  #  RESIDUE"):
+            break
+    else:
+        raise ValueError("Unable to parse DSSP output")
+    # The chain columns follow the coordinates; the author chain is the last if present
+    tail = line.index("Z-CA") + len("Z-CA") if "CHAIN" in line and "Z-CA" in line else None
+    ss = collections.OrderedDict()
+    acc = {}
+    for line in lines:
+        if len(line) < 38 or line[13] == "!":
+            # Chain breaks are marked by an exclamation mark instead of an amino acid
+            continue
+        columns = line[tail:].split() if tail is not None else None
+        chain = columns[-1] if columns else line[11]
+        if chain not in ss:
+            ss[chain], acc[chain] = [], []
+        ss[chain].append(line[16] if line[16] != " " else "-")
+        acc[chain].append(int(line[34:38]))
+    return collections.OrderedDict(
+        (chain, ("".join(ss[chain]), np.array(acc[chain], dtype=np.uint16))) for chain in ss)
+
+
+def model_id(path):
+    """Return the identifier of a model, i.e. its file name without extensions"""
+    name = os.path.basename(path)
+    for suffixes in (scratch.COMPRESSED, EXTENSIONS):
+        for suffix in suffixes:
+            if name.lower().endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+    return name
+
+
+def _is_structure(path):
+    """Check whether a path refers to a structure file, optionally compressed, by its extension"""
+    for suffix in scratch.COMPRESSED:
+        # Matched like the suffixes of the files decompressed by the scratch module
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    return path.lower().endswith(EXTENSIONS)
+
+
+class SecondaryStructureStore(object):
+    """SQLite store of per-chain secondary structure assignments"""
+
+    def __init__(self, path):
+        """Initialise a new :obj:`SecondaryStructureStore`
+
+        Parameters
+        ----------
+        path : str
+           The path to the SQLite database, created if it does not exist
+
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM models").fetchone()[0]
+
+    def __contains__(self, model):
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM models WHERE id = ?", (model, )).fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def ids(self):
+        """Return the identifiers of all stored models"""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT id FROM models ORDER BY id")]
+
+    def get(self, model):
+        """Return the assignments of a model
+
+        Returns
+        -------
+        :obj:`collections.OrderedDict`
+           The secondary structure string and the accessibility array per chain
+
+        Raises
+        ------
+        KeyError
+           The model is not in the store
+
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT chain, ss, acc FROM chains WHERE model = ? ORDER BY position", (model, )).fetchall()
+            if not rows and self._connection.execute(
+                    "SELECT 1 FROM models WHERE id = ?", (model, )).fetchone() is None:
+                raise KeyError(model)
+        return collections.OrderedDict(
+            (chain, (ss, np.frombuffer(acc, dtype="<u2").astype(np.uint16))) for chain, ss, acc in rows)
+
+    def manifest(self, model):
+        """Return the path, modification time, size and SHA-1 digest recorded for a model, or None"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT path, mtime, size, sha1 FROM models WHERE id = ?", (model, )).fetchone()
+
+    def put(self, model, path, mtime, size, sha1, chains):
+        """Store the assignments of a model, replacing any previous ones
+
+        Parameters
+        ----------
+        model : str
+           The model identifier
+        path : str
+           The path to the structure file
+        mtime : float
+           The modification time of the file
+        size : int
+           The size of the file in bytes
+        sha1 : str
+           The SHA-1 hex digest of the file
+        chains : dict
+           The secondary structure string and accessibility array per chain, see :func:`parse`
+
+        """
+        with self._lock:
+            with self._connection:
+                self._put(model, path, mtime, size, sha1, chains)
+
+    def touch(self, model, path, mtime, size):
+        """Update the manifest of a model whose file changed without changing its content"""
+        with self._lock:
+            with self._connection:
+                self._connection.execute("UPDATE models SET path = ?, mtime = ?, size = ? WHERE id = ?",
+                                         (path, mtime, size, model))
+
+    def _put(self, model, path, mtime, size, sha1, chains):
+        self._connection.execute("DELETE FROM chains WHERE model = ?", (model, ))
+        self._connection.execute("INSERT OR REPLACE INTO models (id, path, mtime, size, sha1) VALUES (?, ?, ?, ?, ?)",
+                                 (model, path, mtime, size, sha1))
+        self._connection.executemany(
+            "INSERT INTO chains (model, chain, position, ss, acc) VALUES (?, ?, ?, ?, ?)",
+            [(model, chain, i, ss, sqlite3.Binary(np.asarray(acc, dtype="<u2").tobytes()))
+             for i, (chain, (ss, acc)) in enumerate(chains.items())])
+
+    def update(self, entries):
+        """Store the assignments of many models in a single transaction, see :meth:`put`"""
+        with self._lock:
+            with self._connection:
+                for entry in entries:
+                    self._put(*entry)
+
+
+class BatchDssp(object):
+    """Resumable DSSP driver over a structure library"""
+
+    def __init__(self, structures, store, nproc=1, chunk=500, cmd='dssp', **kwargs):
+        """Initialise a new :obj:`BatchDssp` driver
+
+        Parameters
+        ----------
+        structures : str, list, tuple
+           A directory holding the structures, or the paths to the structures
+        store : str, :obj:`SecondaryStructureStore`
+           The store, or the path to its SQLite database
+        nproc : int, optional
+           The number of concurrent DSSP processes [default: 1]
+        chunk : int, optional
+           The number of structures run between storing results [default: 500]
+        cmd : str, optional
+           The DSSP executable [default: dssp]
+        **kwargs
+           Further options passed to :obj:`DsspCommandline <mxkit.apps.dssp.DsspCommandline>`
+
+        Raises
+        ------
+        ValueError
+           Two structures share the same model identifier
+
+        """
+        if isinstance(structures, basestring):
+            structures = sorted(p for p in glob.glob(os.path.join(structures, "*")) if _is_structure(p))
+        self.structures = collections.OrderedDict()
+        for path in structures:
+            model = model_id(path)
+            if model in self.structures:
+                raise ValueError("Duplicate model identifier {0}: {1}, {2}".format(
+                    model, self.structures[model], path))
+            self.structures[model] = path
+        self.store = store if isinstance(store, SecondaryStructureStore) else SecondaryStructureStore(store)
+        self.nproc = nproc
+        self.chunk = chunk
+        self.cmd = cmd
+        self.kwargs = kwargs
+
+    def outstanding(self):
+        """Return the structures that are new or changed since they were last processed
+
+        Returns
+        -------
+        list
+           The model identifier, path, modification time, size and SHA-1 digest per structure
+
+        """
+        outstanding, unchanged = [], []
+        for model, path in self.structures.items():
+            stat = os.stat(path)
+            recorded = self.store.manifest(model)
+            if recorded is not None and recorded[1] == stat.st_mtime and recorded[2] == stat.st_size:
+                continue
+            sha1 = content_hash(path)
+            if recorded is not None and recorded[3] == sha1:
+                unchanged.append((model, path, stat.st_mtime, stat.st_size))
+            else:
+                outstanding.append((model, path, stat.st_mtime, stat.st_size, sha1))
+        for entry in unchanged:
+            self.store.touch(*entry)
+        return outstanding
+
+    def run(self):
+        """Run DSSP on all outstanding structures
+
+        Compressed structures are decompressed through the :obj:`DecompressionCache
+        <mxkit.scratch.DecompressionCache>` of the wrappers before DSSP is run on them.
+
+        Returns
+        -------
+        list
+           The paths of the structures for which DSSP failed; they are retried on the next run
+
+        """
+        failed = []
+        outstanding = self.outstanding()
+        cache = scratch.default_cache()
+        # The output is only read once, so it is kept in memory-backed storage where available
+        directory = tempfile.mkdtemp(prefix="mxkit_dssp_", dir=scratch.scratch_dir())
+        try:
+            # The shells only format the command lines, so the syntax is selected here
+            capabilities = None
+            with ShellPool(nproc=self.nproc) as pool:
+                for start in range(0, len(outstanding), self.chunk):
+                    # The shells run the formatted command lines, so archives are decompressed here
+                    batch, leases = [], []
+                    try:
+                        for entry in outstanding[start:start + self.chunk]:
+                            if not scratch.is_compressed(entry[1]):
+                                batch.append((entry, entry[1]))
+                                continue
+                            try:
+                                leases.append(cache.acquire(entry[1]))
+                            except (IOError, OSError, EOFError, ValueError):
+                                failed.append(entry[1])
+                            else:
+                                batch.append((entry, leases[-1]))
+                        outputs = [os.path.join(directory, "{0}.dssp".format(i)) for i in range(len(batch))]
+                        cmdlines = [DsspCommandline(self.cmd, input=path, output=output, **self.kwargs)
+                                    for (_, path), output in zip(batch, outputs)]
+                        for cmdline in cmdlines:
+                            capabilities = cmdline.resolve(capabilities)
+                        results = pool.map(cmdlines)
+                    finally:
+                        for lease in leases:
+                            cache.release(lease)
+                    entries = []
+                    for (entry, _), output, result in zip(batch, outputs, results):
+                        try:
+                            if not result.ok:
+                                raise ValueError(result.stderr)
+                            with open(output, "r") as f_in:
+                                entries.append(entry + (parse(f_in.read()), ))
+                        except (IOError, ValueError):
+                            failed.append(entry[1])
+                        finally:
+                            if os.path.isfile(output):
+                                os.remove(output)
+                    self.store.update(entries)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        return failed
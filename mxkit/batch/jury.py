@@ -0,0 +1,194 @@
+"""In-process 3D-Jury consensus scoring
+
+Description
+-----------
+3D-Jury ranks the models of a pool by their structural similarity to all other
+models; models resembling many others are more likely to be correct. maxcluster
+implements it for list files, but needs a process and a full pairwise comparison per
+run. :func:`score` computes the same kind of consensus score in-process from a pairwise
+similarity matrix, and :func:`score_models` computes the similarities on the fly from
+the C-alpha coordinates of the models.
+
+The score of a model is the mean of its highest similarities to the other models of
+the pool, where similarities not exceeding ``score_threshold`` contribute zero. With
+``top=None`` all other models contribute, otherwise only the ``top`` best pairs are
+selected with a partial sort per row.
+
+Similarities are processed in row blocks, so that only ``chunk`` rows of the matrix are
+held in memory at any time. A precomputed matrix may therefore also be a
+:obj:`numpy.memmap` larger than the available memory.
+
+Examples
+--------
+>>> import numpy as np
+>>> from mxkit.batch.jury import rank, score_models
+>>> coords = np.load("decoys.npy")  # shape (nmodels, nresidues, 3)
+>>> scores, pairs = score_models(coords, top=50, nproc=8)
+>>> best = rank(names, scores)[:5]
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import numpy as np
+
+# The coordinates shared with the worker processes of score_models
+_COORDS = None
+
+
+def _reduce(block, rows, top, score_threshold):
+    """Reduce a block of similarity rows to consensus scores and pair counts"""
+    block = np.array(block, dtype=np.float32)
+    n = block.shape[1]
+    # A model is not part of its own jury
+    block[np.arange(block.shape[0]), rows] = 0.0
+    block[block <= score_threshold] = 0.0
+    pairs = np.count_nonzero(block, axis=1)
+    if top is None or top >= n - 1:
+        return block.sum(axis=1) / max(n - 1, 1), pairs
+    best = np.partition(block, n - top, axis=1)[:, n - top:]
+    return best.sum(axis=1) / float(top), pairs
+
+
+def score(similarity, top=None, score_threshold=0.2, chunk=1024):
+    """Compute 3D-Jury scores from a pairwise similarity matrix
+
+    Parameters
+    ----------
+    similarity : :obj:`numpy.ndarray`
+       The square similarity matrix, e.g. TM-scores or MaxSub scores; NaN entries
+       are treated as dissimilar
+    top : int, optional
+       The number of best pairs per model contributing to its score [default: all]
+    score_threshold : float, optional
+       The similarity a pair must exceed to contribute [default: 0.2]
+    chunk : int, optional
+       The number of rows processed at once [default: 1024]
+
+    Returns
+    -------
+    tuple
+       The score and the number of pairs above the threshold per model
+
+    """
+    n = similarity.shape[0]
+    if similarity.ndim != 2 or similarity.shape[1] != n:
+        raise ValueError("Similarity matrix must be square")
+    elif top is not None and top < 1:
+        raise ValueError("At least one pair per model is required")
+    scores = np.zeros(n, dtype=np.float32)
+    pairs = np.zeros(n, dtype=np.int64)
+    for start in range(0, n, chunk):
+        rows = np.arange(start, min(start + chunk, n))
+        block = np.nan_to_num(np.asarray(similarity[start:rows[-1] + 1]))
+        scores[rows], pairs[rows] = _reduce(block, rows, top, score_threshold)
+    return scores, pairs
+
+
+def tm_block(a, b, d0=None):
+    """TM-scores of two sets of equal-length models after a single optimal superposition
+
+    The models are superposed on all C-alpha atoms by the Kabsch algorithm; unlike
+    TM-score, no iterative search for the superposition maximising the score is made,
+    so the scores are lower bounds of the true TM-scores.
+
+    Parameters
+    ----------
+    a : :obj:`numpy.ndarray`
+       The centred coordinates of the first set with shape ``(m, L, 3)``
+    b : :obj:`numpy.ndarray`
+       The centred coordinates of the second set with shape ``(n, L, 3)``
+    d0 : float, optional
+       The distance scale [default: derived from ``L``]
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       The TM-scores with shape ``(m, n)``
+
+    """
+    length = a.shape[1]
+    if d0 is None:
+        d0 = max(1.24 * max(length - 15, 1) ** (1.0 / 3.0) - 1.8, 0.5)
+    h = np.tensordot(a, b, axes=([1], [1])).transpose(0, 2, 1, 3)
+    u, _, vt = np.linalg.svd(h)
+    # Correct for reflections
+    sign = np.sign(np.linalg.det(np.matmul(u, vt)))
+    u[..., :, 2] *= sign[..., None]
+    rot = np.matmul(u, vt)
+    d2 = ((np.matmul(a[:, None], rot) - b[None]) ** 2).sum(axis=-1)
+    return (1.0 / (1.0 + d2 / d0 ** 2)).mean(axis=-1)
+
+
+def _score_rows(args):
+    start, stop, top, score_threshold, chunk = args
+    rows = np.arange(start, stop)
+    block = np.empty((rows.shape[0], _COORDS.shape[0]), dtype=np.float32)
+    for col in range(0, _COORDS.shape[0], chunk):
+        block[:, col:col + chunk] = tm_block(_COORDS[start:stop], _COORDS[col:col + chunk])
+    return _reduce(block, rows, top, score_threshold)
+
+
+def _init_worker(coords):
+    global _COORDS
+    _COORDS = coords
+
+
+def score_models(coords, top=None, score_threshold=0.2, chunk=64, nproc=1):
+    """Compute 3D-Jury scores of models with the same residue numbering
+
+    The pairwise similarities are TM-scores computed by :func:`tm_block` and are never
+    held in memory as a full matrix.
+
+    Parameters
+    ----------
+    coords : :obj:`numpy.ndarray`
+       The C-alpha coordinates of all models with shape ``(nmodels, L, 3)``
+    top : int, optional
+       The number of best pairs per model contributing to its score [default: all]
+    score_threshold : float, optional
+       The similarity a pair must exceed to contribute [default: 0.2]
+    chunk : int, optional
+       The edge length of the blocks of pairs compared at once [default: 64]
+    nproc : int, optional
+       The number of processes [default: 1]
+
+    Returns
+    -------
+    tuple
+       The score and the number of pairs above the threshold per model
+
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 3 or coords.shape[2] != 3:
+        raise ValueError("Expected coordinates with shape (nmodels, nresidues, 3)")
+    elif top is not None and top < 1:
+        raise ValueError("At least one pair per model is required")
+    coords = coords - coords.mean(axis=1)[:, None, :]
+    n = coords.shape[0]
+    tasks = [(start, min(start + chunk, n), top, score_threshold, chunk) for start in range(0, n, chunk)]
+    if nproc > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes=nproc, initializer=_init_worker, initargs=(coords,))
+        try:
+            results = pool.map(_score_rows, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _init_worker(coords)
+        try:
+            results = [_score_rows(task) for task in tasks]
+        finally:
+            _init_worker(None)
+    if not results:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def rank(names, scores):
+    """Return the ``(name, score)`` tuples ordered by decreasing score"""
+    order = np.argsort(-np.asarray(scores), kind='mergesort')
+    return [(names[i], float(scores[i])) for i in order]
@@ -0,0 +1,229 @@
+"""Maxcluster runs over model sets too large for a single list file
+
+Description
+-----------
+The memory use of maxcluster grows quadratically with the number of models in its
+list file. :obj:`ShardedMaxcluster` splits a large decoy set into shards, runs
+maxcluster on each shard in parallel and merges the per-shard 3D-jury scores and
+cluster centroids into a global ranking.
+
+Every shard contains the same set of anchor models in addition to its own share of the
+decoys. As 3D-jury scores depend on the composition of the pool they were computed in,
+the scores of each shard are rescaled so that the mean anchor score matches across
+shards before the rankings are merged.
+
+Examples
+--------
+>>> from mxkit.batch.maxcluster import ShardedMaxcluster
+>>> sharded = ShardedMaxcluster("decoys/*.pdb", "maxcluster_shards", size=4000, overlap=200, nproc=8)
+>>> ranking, centroids = sharded.run()
+>>> best_model, best_score = ranking[0]
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import glob
+import os
+import re
+
+from mxkit.apps.maxcluster import MaxclusterCommandline
+from mxkit.dispatch.backends import LocalBackend
+
+_RE_ROW = re.compile(r"^INFO\s+:\s+(\d+)\s+:\s+(.*)$")
+
+
+def expand(models):
+    """Return a list of model paths from a glob pattern or an iterable"""
+    if isinstance(models, str):
+        return sorted(glob.glob(models))
+    return list(models)
+
+
+def write_list(path, models):
+    """Write a maxcluster list file
+
+    Parameters
+    ----------
+    path : str
+       The path to the list file
+    models : str, list, tuple, generator
+       A glob pattern or the paths to the models
+
+    Returns
+    -------
+    str
+       The path to the list file
+
+    """
+    if isinstance(models, str):
+        models = expand(models)
+    with open(path, "w") as f_out:
+        f_out.writelines(m + "\n" for m in models)
+    return path
+
+
+def shard(models, size, overlap=0):
+    """Split models into shards sharing a common set of anchor models
+
+    Parameters
+    ----------
+    models : list, tuple
+       The paths to the models
+    size : int
+       The maximum number of models per shard, including the anchors
+    overlap : int, optional
+       The number of anchor models contained in every shard [default: 0]
+
+    Returns
+    -------
+    tuple
+       The list of shards and the list of anchors
+
+    """
+    models = list(models)
+    if overlap >= size:
+        raise ValueError("Shard size must exceed the overlap")
+    elif len(models) <= size:
+        return [models], []
+    # Evenly spaced anchors avoid bias towards models from any one source
+    step = len(models) / float(overlap) if overlap else 0
+    anchor_idx = set(int(i * step) for i in range(overlap))
+    anchors = [models[i] for i in sorted(anchor_idx)]
+    rest = [m for i, m in enumerate(models) if i not in anchor_idx]
+    chunk = size - len(anchors)
+    return [anchors + rest[i:i + chunk] for i in range(0, len(rest), chunk)], anchors
+
+
+def parse(stdout):
+    """Parse the 3D-jury ranking and cluster centroids from maxcluster output
+
+    Parameters
+    ----------
+    stdout : str
+       The maxcluster log
+
+    Returns
+    -------
+    tuple
+       The ``(model, score)`` tuples of the 3D-jury ranking and the
+       ``(model, size, spread)`` tuples of the cluster centroids
+
+    """
+    jury, centroids = [], []
+    section = None
+    for line in stdout.splitlines():
+        if "3D-jury" in line or "3D-Jury" in line:
+            section = "jury"
+            continue
+        elif "Centroids" in line:
+            section = "centroids"
+            continue
+        m = _RE_ROW.match(line)
+        if m is None or section is None:
+            continue
+        fields = m.group(2).split()
+        try:
+            if section == "jury" and len(fields) >= 3:
+                jury.append((fields[-1], float(fields[-2])))
+            elif section == "centroids" and len(fields) >= 4:
+                centroids.append((fields[-1], int(fields[-3]), float(fields[-2])))
+        except ValueError:
+            continue
+    return jury, centroids
+
+
+def merge(results, anchors):
+    """Merge per-shard results into a global ranking
+
+    Parameters
+    ----------
+    results : list, tuple
+       The ``(jury, centroids)`` tuples per shard as returned by :func:`parse`
+    anchors : list, tuple
+       The anchor models contained in every shard
+
+    Returns
+    -------
+    tuple
+       The global ``(model, score)`` 3D-jury ranking and the ``(model, score, size, spread)``
+       centroids ordered by their global score
+
+    """
+    anchors = set(anchors)
+    factors = []
+    for jury, _ in results:
+        scores = [s for m, s in jury if m in anchors]
+        factors.append(sum(scores) / len(scores) if scores else None)
+    known = [f for f in factors if f]
+    reference = sum(known) / len(known) if known else None
+
+    totals, counts = {}, {}
+    for (jury, _), factor in zip(results, factors):
+        scale = reference / factor if reference and factor else 1.0
+        for model, score in jury:
+            totals[model] = totals.get(model, 0.0) + score * scale
+            counts[model] = counts.get(model, 0) + 1
+    scores = {m: totals[m] / counts[m] for m in totals}
+    ranking = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+
+    centroids = {}
+    for _, shard_centroids in results:
+        for model, size, spread in shard_centroids:
+            if model not in centroids or size > centroids[model][2]:
+                centroids[model] = (model, scores.get(model, 0.0), size, spread)
+    return ranking, sorted(centroids.values(), key=lambda x: (-x[1], -x[2], x[0]))
+
+
+class ShardedMaxcluster(object):
+    """Run maxcluster over shards of a large model set and merge the results"""
+
+    def __init__(self, models, directory, size=5000, overlap=100, nproc=1, cmd='maxcluster', **kwargs):
+        """Initialise a new :obj:`ShardedMaxcluster`
+
+        Parameters
+        ----------
+        models : str, list, tuple, generator
+           A glob pattern or the paths to the models
+        directory : str
+           The directory for the shard list files
+        size : int, optional
+           The maximum number of models per shard [default: 5000]
+        overlap : int, optional
+           The number of anchor models shared by all shards [default: 100]
+        nproc : int, optional
+           The number of concurrent maxcluster processes [default: 1]
+        cmd : str, optional
+           The maxcluster executable [default: maxcluster]
+        **kwargs
+           Further options passed to :obj:`MaxclusterCommandline <mxkit.apps.maxcluster.MaxclusterCommandline>`
+
+        """
+        self.models = expand(models)
+        self.directory = directory
+        self.size = size
+        self.overlap = overlap
+        self.nproc = nproc
+        self.cmd = cmd
+        self.kwargs = kwargs
+
+    def cmdlines(self):
+        """Write the shard list files and return the command lines and anchors"""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        shards, anchors = shard(self.models, self.size, overlap=self.overlap)
+        cmdlines = []
+        for i, models in enumerate(shards):
+            path = write_list(os.path.join(self.directory, "shard_{0}.list".format(i)), models)
+            cmdlines.append(MaxclusterCommandline(self.cmd, pdb_list=path, **self.kwargs))
+        return cmdlines, anchors
+
+    def run(self):
+        """Run maxcluster on all shards and merge the results, see :func:`merge`"""
+        cmdlines, anchors = self.cmdlines()
+        results = LocalBackend(nproc=self.nproc).run(cmdlines)
+        for result in results:
+            result.check()
+        return merge([parse(r.stdout) for r in results], anchors)
@@ -0,0 +1,178 @@
+"""Vectorised GDT and MaxSub model quality scores
+
+Description
+-----------
+TMscore and maxcluster report the global distance test (GDT) and MaxSub scores of a
+model against its native structure. This module computes both in-process for many
+models of the same target at once.
+
+All scores are derived from the largest subset of residues that superpose within a
+distance cut-off. As in TMscore and maxcluster, the superposition is searched by
+seeding the Kabsch algorithm with contiguous fragments of the chain, and then
+iteratively re-superposing on the residues found within the cut-off. Seeds are all
+fragments with lengths ``L, L/2, L/4, ...`` down to four residues, placed with a step
+of half their length. The seed superpositions are independent of the cut-off and
+shared between all scores.
+
+* GDT-TS is the mean fraction of native residues within 1, 2, 4 and 8 A
+* GDT-HA is the mean fraction of native residues within 0.5, 1, 2 and 4 A
+* MaxSub is the sum of ``1 / (1 + (d / 3.5) ** 2)`` over the residues within
+  3.5 A, divided by the number of native residues
+
+Models must be aligned to the native, i.e. element ``[k, i]`` of the model array is the
+residue matching native residue ``i``. Residues missing from a model are NaN.
+
+Examples
+--------
+>>> from mxkit.batch.metrics import scores
+>>> result = scores(models, native)  # shapes (nmodels, L, 3) and (L, 3)
+>>> result['gdt_ts'].argmax()
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import numpy as np
+
+#: The distance cut-offs of GDT-TS in Angstrom
+GDT_TS_CUTOFFS = (1.0, 2.0, 4.0, 8.0)
+#: The distance cut-offs of GDT-HA in Angstrom
+GDT_HA_CUTOFFS = (0.5, 1.0, 2.0, 4.0)
+#: The distance cut-off of MaxSub in Angstrom
+MAXSUB_CUTOFF = 3.5
+
+
+def seeds(length, min_length=4):
+    """Return the fragment seeds of a chain as boolean masks with shape ``(nseeds, length)``"""
+    masks = []
+    size = length
+    while True:
+        size = max(size, min(min_length, length))
+        step = max(1, size // 2)
+        for start in range(0, max(length - size, 0) + 1, step):
+            mask = np.zeros(length, dtype=bool)
+            mask[start:start + size] = True
+            masks.append(mask)
+        if size <= min_length:
+            break
+        size //= 2
+    return np.array(masks)
+
+
+def _superpose(weights, models, native):
+    """Weighted Kabsch superposition of every model onto the native per weight set
+
+    Returns the distances per residue with shape ``(m, s, L)``.
+    """
+    w = weights.astype(np.float64)
+    total = np.maximum(w.sum(axis=-1), 1.0)[..., None]
+    cm = np.matmul(w, models) / total
+    cn = np.matmul(w, native) / total
+    h = np.matmul(np.swapaxes(w[..., None] * models[:, None], -1, -2), native)
+    h -= total[..., None] * cm[..., :, None] * cn[..., None, :]
+    u, _, vt = np.linalg.svd(h)
+    # Correct for reflections
+    sign = np.sign(np.linalg.det(np.matmul(u, vt)))
+    sign[sign == 0] = 1.0
+    u[..., :, 2] *= sign[..., None]
+    rot = np.matmul(u, vt)
+    moved = np.matmul(models[:, None] - cm[..., None, :], rot) + cn[..., None, :]
+    return np.sqrt(((moved - native) ** 2).sum(axis=-1))
+
+
+def _search(models, native, valid, masks, cutoffs, iterations):
+    """Best number of residues within each cut-off, and the best MaxSub sum"""
+    m = models.shape[0]
+    start = masks[None] & valid[:, None]
+    missing = ~valid[:, None]
+    dist0 = _superpose(start, models, native)
+    dist0[np.broadcast_to(missing, dist0.shape)] = np.inf
+    counts = np.zeros((m, len(cutoffs)), dtype=np.int64)
+    subsums = np.zeros(m)
+    for c, cutoff in enumerate(cutoffs):
+        dist, weights = dist0, start
+        for i in range(iterations):
+            within = dist < cutoff
+            n = within.sum(axis=-1)
+            counts[:, c] = np.maximum(counts[:, c], n.max(axis=-1))
+            if cutoff == MAXSUB_CUTOFF:
+                s = np.where(within, 1.0 / (1.0 + (dist / MAXSUB_CUTOFF) ** 2), 0.0).sum(axis=-1)
+                subsums = np.maximum(subsums, s.max(axis=-1))
+            if i == iterations - 1:
+                # A further superposition would not be scored
+                break
+            # Keep superpositions whose subset became too small to define a rotation
+            weights = np.where((n >= 3)[..., None], within, weights)
+            dist = _superpose(weights, models, native)
+            dist[np.broadcast_to(missing, dist.shape)] = np.inf
+    return counts, subsums
+
+
+def scores(models, native, iterations=4, chunk=16):
+    """Compute GDT-TS, GDT-HA and MaxSub of models against a native structure
+
+    Parameters
+    ----------
+    models : :obj:`numpy.ndarray`
+       The aligned C-alpha coordinates of the models with shape ``(nmodels, L, 3)``
+       or ``(L, 3)``; missing residues are NaN
+    native : :obj:`numpy.ndarray`
+       The C-alpha coordinates of the native with shape ``(L, 3)``; missing residues are NaN
+    iterations : int, optional
+       The number of superpositions scored per seed and cut-off, including the initial one
+       [default: 4]
+    chunk : int, optional
+       The number of models processed at once [default: 16]
+
+    Returns
+    -------
+    dict
+       The arrays ``gdt_ts``, ``gdt_ha`` and ``maxsub`` with one score per model
+
+    """
+    models = np.asarray(models, dtype=np.float64)
+    native = np.asarray(native, dtype=np.float64)
+    if models.ndim == 2:
+        models = models[None]
+    if native.ndim != 2 or native.shape[1] != 3 or models.shape[1:] != native.shape:
+        raise ValueError("Models must be aligned to the native")
+    native_valid = ~np.isnan(native).any(axis=-1)
+    nres = native_valid.sum()
+    if nres < 3:
+        raise ValueError("At least three native residues are required")
+    native = np.where(native_valid[:, None], native, 0.0)
+
+    cutoffs = sorted(set(GDT_TS_CUTOFFS + GDT_HA_CUTOFFS + (MAXSUB_CUTOFF,)))
+    masks = seeds(native.shape[0])
+    counts = np.zeros((models.shape[0], len(cutoffs)), dtype=np.int64)
+    subsums = np.zeros(models.shape[0])
+    for start in range(0, models.shape[0], chunk):
+        block = models[start:start + chunk]
+        valid = ~np.isnan(block).any(axis=-1) & native_valid
+        block = np.where(valid[..., None], block, 0.0)
+        counts[start:start + chunk], subsums[start:start + chunk] = _search(
+            block, native, valid, masks, cutoffs, iterations)
+
+    fractions = counts / float(nres)
+    return {
+        'gdt_ts': fractions[:, [cutoffs.index(c) for c in GDT_TS_CUTOFFS]].mean(axis=1),
+        'gdt_ha': fractions[:, [cutoffs.index(c) for c in GDT_HA_CUTOFFS]].mean(axis=1),
+        'maxsub': subsums / float(nres),
+    }
+
+
+def gdt_ts(models, native, **kwargs):
+    """Compute GDT-TS, see :func:`scores`"""
+    return scores(models, native, **kwargs)['gdt_ts']
+
+
+def gdt_ha(models, native, **kwargs):
+    """Compute GDT-HA, see :func:`scores`"""
+    return scores(models, native, **kwargs)['gdt_ha']
+
+
+def maxsub(models, native, **kwargs):
+    """Compute MaxSub, see :func:`scores`"""
+    return scores(models, native, **kwargs)['maxsub']
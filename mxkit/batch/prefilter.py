@@ -0,0 +1,235 @@
+"""Sequence-independent structural prefilter for TMalign searches
+
+Description
+-----------
+Aligning a query against every template of a large library is wasteful when most
+templates have an unrelated fold. The :obj:`PrefilterIndex` stores a compact descriptor
+per template in a single NumPy matrix and returns the nearest templates of a query,
+so that only those top-k candidates are passed on to TMalign.
+
+A descriptor is built from the C-alpha trace alone and consists of
+
+* the normalised histogram of all pairwise C-alpha distances in 2 A bins,
+* the fractions of helix-, strand- and coil-like residues estimated from the
+  ``i, i+3`` C-alpha distances,
+* the radius of gyration relative to that of a compact globule of the same length, and
+* the logarithm of the chain length.
+
+Descriptors are standardised across the library and compared by Euclidean distance.
+:func:`recall` measures how many of the true hits of an exhaustive TMalign run the
+prefilter retains.
+
+Examples
+--------
+>>> import glob
+>>> from mxkit.batch.prefilter import PrefilterIndex
+>>> index = PrefilterIndex.build(sorted(glob.glob("library/*.pdb")), nproc=8)
+>>> index.save("library.npz")
+>>> hits = index.search("query.pdb", k=50, nproc=8)
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import numpy as np
+
+from mxkit.formats.pdb import read_ca
+
+#: The bin edges of the C-alpha distance histogram in Angstrom
+DISTANCE_BINS = np.append(np.arange(0.0, 42.0, 2.0), np.inf)
+
+
+def descriptor(coords):
+    """Compute the structural descriptor of a C-alpha trace
+
+    Parameters
+    ----------
+    coords : :obj:`numpy.ndarray`
+       The C-alpha coordinates with shape ``(n, 3)``
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       The descriptor vector
+
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = coords.shape[0]
+    if n < 4:
+        raise ValueError("At least four residues are required")
+
+    iu = np.triu_indices(n, k=1)
+    dist = np.sqrt(((coords[:, None, :] - coords[None, :, :]) ** 2).sum(axis=-1))[iu]
+    hist = np.histogram(dist, bins=DISTANCE_BINS)[0] / float(dist.size)
+
+    # Ideal helices have i,i+3 distances near 5 A, extended strands near 10 A
+    d3 = np.sqrt(((coords[3:] - coords[:-3]) ** 2).sum(axis=-1))
+    helix = np.mean(d3 < 6.0)
+    strand = np.mean(d3 > 9.0)
+    coil = 1.0 - helix - strand
+
+    rg = np.sqrt(((coords - coords.mean(axis=0)) ** 2).sum(axis=-1).mean())
+    compactness = rg / (2.2 * n ** 0.38)
+    return np.concatenate([hist, [helix, strand, coil, compactness, np.log(n)]])
+
+
+def _descriptor_from_file(path):
+    return descriptor(read_ca(path).coords)
+
+
+class PrefilterIndex(object):
+    """A library of structural descriptors with nearest-neighbour lookup"""
+
+    def __init__(self, names, descriptors):
+        """Initialise a new :obj:`PrefilterIndex`
+
+        Parameters
+        ----------
+        names : list, tuple
+           The template paths or identifiers
+        descriptors : :obj:`numpy.ndarray`
+           The descriptor per template with shape ``(len(names), m)``
+
+        """
+        self.names = np.asarray(names)
+        self.descriptors = np.asarray(descriptors, dtype=np.float32)
+        if self.descriptors.ndim != 2 or self.descriptors.shape[0] != self.names.shape[0]:
+            raise ValueError("Expected one descriptor per template")
+        self.mean = self.descriptors.mean(axis=0)
+        std = self.descriptors.std(axis=0)
+        # Constant features carry no information and are ignored
+        std[std == 0] = np.inf
+        self.scale = (1.0 / std).astype(np.float32)
+        self._matrix = (self.descriptors - self.mean) * self.scale
+
+    def __len__(self):
+        return self.names.shape[0]
+
+    @classmethod
+    def build(cls, structures, nproc=1):
+        """Compute the descriptors of a structure library
+
+        Parameters
+        ----------
+        structures : list, tuple
+           The paths to the template structures
+        nproc : int, optional
+           The number of processes computing descriptors [default: 1]
+
+        """
+        structures = list(structures)
+        if nproc > 1:
+            import multiprocessing
+            pool = multiprocessing.Pool(processes=nproc)
+            try:
+                descriptors = pool.map(_descriptor_from_file, structures, chunksize=16)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            descriptors = [_descriptor_from_file(s) for s in structures]
+        return cls(structures, np.vstack(descriptors))
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by :meth:`save`"""
+        with np.load(path) as data:
+            return cls(data['names'], data['descriptors'])
+
+    def save(self, path):
+        """Write the index to a NumPy ``.npz`` file"""
+        np.savez(path, names=self.names, descriptors=self.descriptors)
+
+    def query(self, query, k=100):
+        """Return the ``k`` templates nearest to a query
+
+        Parameters
+        ----------
+        query : str, :obj:`numpy.ndarray`
+           The path to the query structure or its descriptor
+        k : int, optional
+           The number of candidates [default: 100]
+
+        Returns
+        -------
+        list
+           The ``(name, distance)`` tuples of the candidates, nearest first
+
+        """
+        if k < 1:
+            raise ValueError("At least one candidate is required")
+        elif isinstance(query, str):
+            query = _descriptor_from_file(query)
+        q = (np.asarray(query, dtype=np.float32) - self.mean) * self.scale
+        dist = np.sqrt(((self._matrix - q) ** 2).sum(axis=1))
+        k = min(k, dist.shape[0])
+        top = np.argpartition(dist, k - 1)[:k] if k < dist.shape[0] else np.arange(dist.shape[0])
+        top = top[np.argsort(dist[top])]
+        return [(self.names[i].item(), float(dist[i])) for i in top]
+
+    def search(self, query, k=100, nproc=1, cmd='TMalign', **kwargs):
+        """Align a query against its ``k`` nearest templates with TMalign
+
+        Parameters
+        ----------
+        query : str
+           The path to the query structure
+        k : int, optional
+           The number of candidates to align [default: 100]
+        nproc : int, optional
+           The number of concurrent TMalign processes [default: 1]
+        cmd : str, optional
+           The TMalign executable [default: TMalign]
+        **kwargs
+           Further options passed to :obj:`TMalignCommandline <mxkit.apps.tmalign.TMalignCommandline>`
+
+        Returns
+        -------
+        list
+           The ``(name, tm_query, tm_template)`` tuples of all successful alignments,
+           ordered by the TM-score normalised by the query length
+
+        """
+        # Imported here so that building and querying the index does not import Biopython
+        from mxkit.apps.tmalign import TMalignCommandline
+        from mxkit.batch.tmalign import parse
+        from mxkit.dispatch.worker import ShellPool
+
+        candidates = [name for name, _ in self.query(query, k=k)]
+        template = TMalignCommandline(cmd, **kwargs).template('chain1', 'chain2')
+        hits = []
+        with ShellPool(nproc=nproc) as pool:
+            for name, result in zip(candidates, pool.map(template.commands((query, c) for c in candidates))):
+                if result.ok:
+                    try:
+                        tm_query, tm_template = parse(result.stdout)[:2]
+                    except ValueError:
+                        continue
+                    hits.append((name, tm_query, tm_template))
+        return sorted(hits, key=lambda h: h[1], reverse=True)
+
+
+def recall(candidates, scores, threshold=0.5):
+    """Fraction of the true hits of an exhaustive search retained by the prefilter
+
+    Parameters
+    ----------
+    candidates : list, tuple
+       The names returned by :meth:`PrefilterIndex.query`
+    scores : dict
+       The TM-score of every template from an exhaustive TMalign run
+    threshold : float, optional
+       The TM-score defining a true hit [default: 0.5]
+
+    Returns
+    -------
+    float
+       The recall, or NaN if the exhaustive run has no true hits
+
+    """
+    hits = set(name for name, score in scores.items() if score >= threshold)
+    if not hits:
+        return float('nan')
+    return len(hits.intersection(candidates)) / float(len(hits))
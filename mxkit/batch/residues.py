@@ -0,0 +1,203 @@
+"""Residue number index for sequence-dependent model/native comparisons
+
+Description
+-----------
+TMscore-style comparisons match the residues of a model to those of the native by
+their residue number. A :obj:`ResidueIndex` is built once per target: it encodes the
+chain, residue number and insertion code of every native residue as a sortable integer
+key, so that the residues of any number of models are mapped onto native positions
+with a single vectorised :func:`numpy.searchsorted` per model.
+
+The index is small and can be cached on disk next to the native with
+:meth:`ResidueIndex.cached`; the cache is rebuilt when the native changes.
+
+The aligned coordinates returned by :meth:`ResidueIndex.align` can be passed directly
+to :func:`mxkit.batch.metrics.scores`.
+
+Examples
+--------
+>>> from mxkit.batch.metrics import scores
+>>> from mxkit.batch.residues import ResidueIndex
+>>> index = ResidueIndex.cached("native.pdb")
+>>> result = scores(index.align_files(models), index.coords)
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+
+import numpy as np
+
+from mxkit.formats.pdb import read_ca
+
+# Residue numbers in PDB files occupy four columns
+_RESSEQ_OFFSET = 10000
+
+
+def encode(chain, resseq, icode, chains=True):
+    """Encode residue identifiers as sortable integer keys
+
+    Parameters
+    ----------
+    chain : :obj:`numpy.ndarray`
+       The chain identifier per residue
+    resseq : :obj:`numpy.ndarray`
+       The residue sequence number per residue
+    icode : :obj:`numpy.ndarray`
+       The insertion code per residue
+    chains : bool, optional
+       Distinguish residues by chain [default: True]
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+
+    """
+    resseq = np.asarray(resseq, dtype=np.int64)
+    keys = (resseq + _RESSEQ_OFFSET) << 8
+    keys |= np.asarray(icode, dtype='U1').view(np.uint32).astype(np.int64) & 0xff
+    if chains:
+        keys |= (np.asarray(chain, dtype='U1').view(np.uint32).astype(np.int64) & 0xff) << 32
+    return keys
+
+
+class ResidueIndex(object):
+    """Mapping of residue identifiers to positions in the native"""
+
+    def __init__(self, keys, coords, chains=True):
+        """Initialise a new :obj:`ResidueIndex`
+
+        Parameters
+        ----------
+        keys : :obj:`numpy.ndarray`
+           The residue keys of the native in chain order, see :func:`encode`
+        coords : :obj:`numpy.ndarray`
+           The C-alpha coordinates of the native with shape ``(len(keys), 3)``
+        chains : bool, optional
+           Distinguish residues by chain [default: True]
+
+        """
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.chains = bool(chains)
+        if self.keys.shape[0] != self.coords.shape[0]:
+            raise ValueError("Expected one key per native residue")
+        self._order = np.argsort(self.keys, kind='mergesort')
+        self._sorted = self.keys[self._order]
+        if np.any(self._sorted[1:] == self._sorted[:-1]):
+            raise ValueError("Native residue identifiers are not unique")
+
+    def __len__(self):
+        return self.keys.shape[0]
+
+    @classmethod
+    def from_trace(cls, trace, chains=True):
+        """Build the index of a :obj:`CaTrace <mxkit.formats.pdb.CaTrace>`"""
+        return cls(encode(trace.chain, trace.resseq, trace.icode, chains=chains), trace.coords, chains=chains)
+
+    @classmethod
+    def from_file(cls, path, chains=True):
+        """Build the index of a native structure file"""
+        return cls.from_trace(read_ca(path), chains=chains)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by :meth:`save`"""
+        with np.load(path) as data:
+            return cls(data['keys'], data['coords'], chains=bool(data['chains']))
+
+    def save(self, path):
+        """Write the index to a NumPy ``.npz`` file"""
+        # Write via a file object so that NumPy does not append another suffix
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f_out:
+            np.savez(f_out, keys=self.keys, coords=self.coords, chains=self.chains)
+        os.rename(tmp, path)
+
+    @classmethod
+    def cached(cls, path, cache=None, chains=True):
+        """Load the index of a native structure from its cache, building it if outdated
+
+        Parameters
+        ----------
+        path : str
+           The path to the native structure
+        cache : str, optional
+           The path to the cache file [default: ``path`` with the suffix ``.residx.npz``]
+        chains : bool, optional
+           Distinguish residues by chain [default: True]
+
+        """
+        cache = cache or path + ".residx.npz"
+        if os.path.isfile(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+            try:
+                index = cls.load(cache)
+            except (IOError, OSError, ValueError, KeyError):
+                index = None
+            if index is not None and index.chains == chains:
+                return index
+        index = cls.from_file(path, chains=chains)
+        index.save(cache)
+        return index
+
+    def positions(self, keys):
+        """Map residue keys onto native positions
+
+        Parameters
+        ----------
+        keys : :obj:`numpy.ndarray`
+           The residue keys, see :func:`encode`
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           The native position per key, or -1 if the residue is not in the native
+
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if self._sorted.shape[0] == 0:
+            return np.full(keys.shape, -1, dtype=np.int64)
+        idx = np.searchsorted(self._sorted, keys)
+        idx[idx == self._sorted.shape[0]] = 0
+        found = self._sorted[idx] == keys
+        return np.where(found, self._order[idx], -1)
+
+    def map(self, trace):
+        """Map the residues of a :obj:`CaTrace <mxkit.formats.pdb.CaTrace>` onto native positions"""
+        return self.positions(encode(trace.chain, trace.resseq, trace.icode, chains=self.chains))
+
+    def align(self, trace, out=None):
+        """Arrange the coordinates of a model in native residue order
+
+        Parameters
+        ----------
+        trace : :obj:`CaTrace <mxkit.formats.pdb.CaTrace>`
+           The model
+        out : :obj:`numpy.ndarray`, optional
+           The array with shape ``(len(self), 3)`` to write to
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           The model coordinates with shape ``(len(self), 3)``; native residues absent
+           from the model are NaN
+
+        """
+        if out is None:
+            out = np.empty(self.coords.shape)
+        out.fill(np.nan)
+        pos = self.map(trace)
+        hit = pos >= 0
+        out[pos[hit]] = trace.coords[hit]
+        return out
+
+    def align_files(self, paths):
+        """Read models and arrange their coordinates with shape ``(len(paths), len(self), 3)``"""
+        paths = list(paths)
+        aligned = np.empty((len(paths), len(self), 3))
+        for i, path in enumerate(paths):
+            self.align(read_ca(path), out=aligned[i])
+        return aligned
@@ -0,0 +1,249 @@
+"""All-vs-all TMalign comparisons of a set of structures
+
+Description
+-----------
+TMalign reports the TM-score normalised by the length of either chain, so a single
+comparison of (A, B) also provides the result of (B, A). The :obj:`AllVsAll` driver
+therefore only runs the pairs ``i < j`` of the structure list, dispatches them to a
+pool of persistent shells and appends the parsed results as fixed-size binary records
+to a results file. When restarted, pairs already present in the results file are
+skipped.
+
+The structures are referred to by their index in the list, which is stored next to the
+results file with the suffix ``.names``. Appending structures to the list of an existing
+run is permitted; only the new pairs are then computed.
+
+Examples
+--------
+>>> import glob
+>>> from mxkit.batch.tmalign import AllVsAll, tm_matrix
+>>> driver = AllVsAll(sorted(glob.glob("library/*.pdb")), "library.tma", nproc=16)
+>>> failed = driver.run()
+>>> tm = tm_matrix(driver.read(), len(driver.structures))
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+import re
+
+import numpy as np
+
+from mxkit.apps.tmalign import TMalignCommandline
+from mxkit.dispatch.worker import ShellPool
+
+#: The layout of a single record in the results file
+RECORD = np.dtype([
+    ('i', '<u4'), ('j', '<u4'),
+    ('tm_i', '<f4'), ('tm_j', '<f4'),
+    ('rmsd', '<f4'), ('aligned', '<u4'), ('seq_id', '<f4'),
+])
+
+_RE_ALIGNED = re.compile(r"Aligned length=\s*(\d+),\s*RMSD=\s*([\d.]+),\s*Seq_ID=n_identical/n_aligned=\s*([\d.]+)")
+_RE_TMSCORE = re.compile(r"TM-score=\s*([\d.]+)\s*\(if normalized by length of Chain_([12])")
+
+
+def parse(stdout):
+    """Parse the standard output of TMalign
+
+    Parameters
+    ----------
+    stdout : str
+       The TMalign log
+
+    Returns
+    -------
+    tuple
+       The TM-scores normalised by the length of the first and second chain,
+       the RMSD, the aligned length and the sequence identity
+
+    Raises
+    ------
+    ValueError
+       The log does not contain the expected scores
+
+    """
+    aligned = _RE_ALIGNED.search(stdout)
+    scores = dict((chain, float(score)) for score, chain in _RE_TMSCORE.findall(stdout))
+    if aligned is None or len(scores) != 2:
+        raise ValueError("Unable to parse TMalign output")
+    return scores['1'], scores['2'], float(aligned.group(2)), int(aligned.group(1)), float(aligned.group(3))
+
+
+class AllVsAll(object):
+    """Resumable all-vs-all TMalign driver"""
+
+    def __init__(self, structures, results, nproc=1, chunk=1000, cmd='TMalign', **kwargs):
+        """Initialise a new :obj:`AllVsAll` driver
+
+        Parameters
+        ----------
+        structures : list, tuple
+           The paths to the structures to compare
+        results : str
+           The path to the binary results file
+        nproc : int, optional
+           The number of concurrent TMalign processes [default: 1]
+        chunk : int, optional
+           The number of pairs run between appending results to disk [default: 1000]
+        cmd : str, optional
+           The TMalign executable [default: TMalign]
+        **kwargs
+           Further options passed to :obj:`TMalignCommandline <mxkit.apps.tmalign.TMalignCommandline>`
+
+        Raises
+        ------
+        ValueError
+           The structure list is inconsistent with the one of an existing results file
+
+        """
+        self.structures = list(structures)
+        self.results = results
+        self.nproc = nproc
+        self.chunk = chunk
+        self.template = TMalignCommandline(cmd, **kwargs).template('chain1', 'chain2')
+        self._check_names()
+
+    @property
+    def names_file(self):
+        return self.results + ".names"
+
+    def pairs(self):
+        """Generate the pairs ``(i, j)`` with ``i < j`` not yet in the results file"""
+        n = len(self.structures)
+        done = np.zeros((n, n), dtype=bool)
+        records = self.read()
+        done[records['i'], records['j']] = True
+        for i in range(n - 1):
+            for j in np.flatnonzero(~done[i, i + 1:]) + i + 1:
+                yield i, int(j)
+
+    def run(self):
+        """Run all outstanding comparisons
+
+        Returns
+        -------
+        list
+           The pairs ``(i, j)`` for which TMalign failed; they are retried on the next run
+
+        """
+        failed = []
+        pairs = self.pairs()
+        with ShellPool(nproc=self.nproc) as pool:
+            while True:
+                batch = [p for _, p in zip(range(self.chunk), pairs)]
+                if not batch:
+                    break
+                commands = self.template.commands((self.structures[i], self.structures[j]) for i, j in batch)
+                records = []
+                for (i, j), result in zip(batch, pool.map(commands)):
+                    try:
+                        if not result.ok:
+                            raise ValueError(result.stderr)
+                        records.append((i, j) + parse(result.stdout))
+                    except ValueError:
+                        failed.append((i, j))
+                self._append(np.array(records, dtype=RECORD))
+        return failed
+
+    def read(self):
+        """Read the results file
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           A structured array with fields ``i``, ``j``, ``tm_i``, ``tm_j``, ``rmsd``,
+           ``aligned`` and ``seq_id``
+
+        """
+        return read(self.results)
+
+    def _append(self, records):
+        with open(self.results, "ab") as f_out:
+            records.tofile(f_out)
+
+    def _check_names(self):
+        if os.path.isfile(self.names_file):
+            with open(self.names_file, "r") as f_in:
+                previous = f_in.read().splitlines()
+            if previous != self.structures[:len(previous)]:
+                raise ValueError("Structures do not extend those of the existing results: {0}".format(self.results))
+        if os.path.isfile(self.results):
+            # Discard a partially written record from an interrupted run
+            size = os.path.getsize(self.results)
+            if size % RECORD.itemsize:
+                with open(self.results, "r+b") as f_out:
+                    f_out.truncate(size - size % RECORD.itemsize)
+        with open(self.names_file, "w") as f_out:
+            f_out.write("\n".join(self.structures) + "\n")
+
+
+def read(path):
+    """Read a results file written by :obj:`AllVsAll`, see :meth:`AllVsAll.read`"""
+    if not os.path.isfile(path):
+        return np.zeros(0, dtype=RECORD)
+    size = os.path.getsize(path)
+    return np.fromfile(path, dtype=RECORD, count=size // RECORD.itemsize)
+
+
+def read_matrix(path):
+    """Read the rotation matrix file written by TMalign with the ``-m`` option
+
+    Parameters
+    ----------
+    path : str
+       The path to the rotation matrix file
+
+    Returns
+    -------
+    tuple
+       The rotation matrix and translation vector superposing the first chain onto
+       the second, see :func:`mxkit.formats.pdb.transform`
+
+    Raises
+    ------
+    ValueError
+       The file does not contain a rotation matrix
+
+    """
+    rows = {}
+    with open(path, "r") as f_in:
+        for line in f_in:
+            fields = line.split()
+            if len(fields) == 5 and fields[0] in ("0", "1", "2"):
+                try:
+                    rows[int(fields[0])] = [float(x) for x in fields[1:]]
+                except ValueError:
+                    continue
+    if len(rows) != 3:
+        raise ValueError("Unable to parse TMalign rotation matrix: {0}".format(path))
+    matrix = np.array([rows[m] for m in range(3)])
+    return matrix[:, 1:], matrix[:, 0]
+
+
+def tm_matrix(records, n):
+    """Expand results into a square TM-score matrix
+
+    Parameters
+    ----------
+    records : :obj:`numpy.ndarray`
+       The records as returned by :func:`read`
+    n : int
+       The number of structures
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+       The matrix where element ``[a, b]`` is the TM-score of the comparison of ``a``
+       and ``b`` normalised by the length of ``a``; missing pairs are NaN and the
+       diagonal is 1
+
+    """
+    tm = np.full((n, n), np.nan, dtype=np.float32)
+    np.fill_diagonal(tm, 1.0)
+    tm[records['i'], records['j']] = records['tm_i']
+    tm[records['j'], records['i']] = records['tm_j']
+    return tm
@@ -6,6 +6,8 @@ __version__ = "0.1"
 
 __all__ = ['atomic_composition', 'periodic_table']
 
+import sys
+
 
 class AtomicComposition(object):
 
@@ -204,6 +206,18 @@ class _AtomComposition(object):
             self.__class__.__name__, ", ".join(["{0}={1}".format(k, v) for k, v in self.__dict__.items()])
         )
 
-# Instantiate some stuff here so we can call it immediately
-atomic_composition = AtomicComposition()
-periodic_table = PeriodicTable()
\ No newline at end of file
+_TABLES = {'atomic_composition': AtomicComposition, 'periodic_table': PeriodicTable}
+
+
+def __getattr__(name):
+    # Build the tables on first access rather than at import
+    if name in _TABLES:
+        value = globals()[name] = _TABLES[name]()
+        return value
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ (PEP 562) is unavailable
+    atomic_composition = AtomicComposition()
+    periodic_table = PeriodicTable()
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""Execution layer for running command line wrappers in bulk
+
+This package contains the machinery to run many :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`
+instances, e.g. chaining molecular replacement, refinement and validation stages
+across a pool of workers.
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
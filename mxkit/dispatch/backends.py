@@ -0,0 +1,428 @@
+"""Executor backends for running many command line wrappers in batch
+
+Description
+-----------
+All backends accept an iterable of :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`
+instances (or plain command strings) and return one :obj:`Result` per command, in
+submission order. The :obj:`LocalBackend` runs commands across a pool of processes on
+this machine, whereas the :obj:`SlurmBackend` and :obj:`SgeBackend` write array job
+scripts that pack many short commands into each array task to amortise the scheduler
+overhead of the cluster.
+
+Examples
+--------
+1. Run a set of TMalign comparisons on the local machine:
+
+>>> from mxkit.apps import tmalign
+>>> from mxkit.dispatch.backends import LocalBackend
+>>> cmds = [tmalign.TMalignCommandline(chain1=a, chain2=b) for a, b in pairs]
+>>> results = LocalBackend(nproc=8, pack=20).run(cmds)
+
+2. Write a SLURM array job running 200 commands per array task:
+
+>>> from mxkit.dispatch.backends import SlurmBackend
+>>> backend = SlurmBackend("tmalign_jobs", pack=200, max_running=50)
+>>> script = backend.write(cmds)
+>>> print(script)
+tmalign_jobs/mxkit.sh
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import time
+
+
+class Result(object):
+    """The outcome of a single command line call
+
+    Attributes
+    ----------
+    command : str
+       The command line executed
+    returncode : int, None
+       The exit status of the command, or :obj:`None` if it has not completed
+    stdout : str
+       The standard output of the command
+    stderr : str
+       The standard error of the command
+
+    """
+
+    __slots__ = ['command', 'returncode', 'stdout', 'stderr']
+
+    def __init__(self, command, returncode=None, stdout="", stderr=""):
+        self.command = command
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def __repr__(self):
+        return "{0}(command={1}, returncode={2})".format(self.__class__.__name__, self.command, self.returncode)
+
+    @property
+    def ok(self):
+        """The command completed with a zero exit status"""
+        return self.returncode == 0
+
+    def check(self):
+        """Raise an :obj:`ApplicationError <Bio.Application.ApplicationError>` if the command did not succeed"""
+        if not self.ok:
+            from Bio.Application import ApplicationError
+            raise ApplicationError(self.returncode, self.command, self.stdout, self.stderr)
+
+
+class Backend(object):
+    """Abstract interface for all executor backends"""
+
+    def run(self, cmdlines, stdins=None):
+        """Run the command lines and block until all have completed
+
+        Parameters
+        ----------
+        cmdlines : list, tuple, generator
+           The :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>` instances or command strings
+        stdins : list, tuple, optional
+           The standard input per command, :obj:`None` for none
+
+        Returns
+        -------
+        list
+           A :obj:`Result` per command in submission order
+
+        Raises
+        ------
+        ValueError
+           A command spans multiple lines or has :obj:`Buffer <mxkit.scratch.Buffer>` inputs
+
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _commands(cmdlines):
+        cmdlines = list(cmdlines)
+        for cmdline in cmdlines:
+            if hasattr(cmdline, "_check_serializable"):
+                cmdline._check_serializable()
+        commands = [str(c) for c in cmdlines]
+        for command in commands:
+            if "\n" in command:
+                raise ValueError("Command lines must not span multiple lines: {0}".format(command))
+        return commands
+
+    @staticmethod
+    def _stdins(stdins, n):
+        stdins = list(stdins) if stdins is not None else [None] * n
+        if len(stdins) != n:
+            raise ValueError("Expected {0} stdins, got {1}".format(n, len(stdins)))
+        return stdins
+
+
+class LocalBackend(Backend):
+    """Run commands across a pool of local processes"""
+
+    def __init__(self, nproc=None, pack=1):
+        """Initialise a new :obj:`LocalBackend`
+
+        Parameters
+        ----------
+        nproc : int, optional
+           The number of worker processes [default: number of CPUs]
+        pack : int, optional
+           The number of commands handed to a worker at once [default: 1]
+
+        """
+        self.nproc = nproc or multiprocessing.cpu_count()
+        self.pack = pack
+
+    def run(self, cmdlines, stdins=None):
+        commands = self._commands(cmdlines)
+        if not commands:
+            return []
+        jobs = list(zip(commands, self._stdins(stdins, len(commands))))
+        pool = multiprocessing.Pool(processes=min(self.nproc, len(commands)))
+        try:
+            return pool.map(_execute, jobs, chunksize=self.pack)
+        finally:
+            pool.close()
+            pool.join()
+
+
+class _ArrayBackend(Backend):
+    """Base class for array job script generators
+
+    The commands are written one per line to a command file. Each array task executes a
+    contiguous block of ``pack`` commands and records the standard output, standard error
+    and exit status of every command in the ``results`` subdirectory, from which
+    :meth:`collect` assembles the :obj:`Result` objects.
+
+    """
+
+    submit_exe = None
+    task_variable = None
+
+    def __init__(self, directory, pack=100, max_running=None, name="mxkit", directives=None, poll=30, timeout=None):
+        """Initialise a new array job backend
+
+        Parameters
+        ----------
+        directory : str
+           The directory to write the script, command file and results to
+        pack : int, optional
+           The number of commands executed by each array task [default: 100]
+        max_running : int, optional
+           The maximum number of concurrently running array tasks
+        name : str, optional
+           The name of the job [default: mxkit]
+        directives : list, tuple, optional
+           Additional scheduler directives, e.g. ``["--mem=2G"]``
+        poll : int, float, optional
+           The interval in seconds for checking completion in :meth:`run` [default: 30]
+        timeout : int, float, optional
+           The seconds after which :meth:`run` stops waiting for the array job [default: no timeout]
+
+        """
+        if pack < 1:
+            raise ValueError("At least one command per array task is required")
+        self.directory = directory
+        self.pack = pack
+        self.max_running = max_running
+        self.name = name
+        self.directives = list(directives or [])
+        self.poll = poll
+        self.timeout = timeout
+        self._ncommands = 0
+        self._job_id = None
+
+    @property
+    def command_file(self):
+        return os.path.join(self.directory, self.name + ".cmd")
+
+    @property
+    def results_dir(self):
+        return os.path.join(self.directory, "results")
+
+    @property
+    def script(self):
+        return os.path.join(self.directory, self.name + ".sh")
+
+    @property
+    def stdin_dir(self):
+        return os.path.join(self.directory, "stdin")
+
+    def write(self, cmdlines, stdins=None):
+        """Write the command file and array job script
+
+        The results of a previous submission from the same directory are removed.
+
+        Parameters
+        ----------
+        cmdlines : list, tuple, generator
+           The :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>` instances or command strings
+        stdins : list, tuple, optional
+           The standard input per command, written to the ``stdin`` subdirectory
+
+        Returns
+        -------
+        str
+           The path to the array job script
+
+        """
+        commands = self._commands(cmdlines)
+        if not commands:
+            raise ValueError("No commands provided")
+        stdins = self._stdins(stdins, len(commands))
+        # Results of a previous submission would otherwise be collected as those of this one
+        for d in (self.results_dir, self.stdin_dir):
+            if os.path.isdir(d):
+                shutil.rmtree(d)
+        for d in (self.directory, self.results_dir, self.stdin_dir):
+            if not os.path.isdir(d):
+                os.makedirs(d)
+        with open(self.command_file, "w") as f_out:
+            f_out.write("\n".join(commands) + "\n")
+        for i, stdin in enumerate(stdins, 1):
+            path = os.path.join(self.stdin_dir, "{0}.in".format(i))
+            if stdin is not None:
+                with open(path, "w") as f_out:
+                    f_out.write(stdin)
+        self._ncommands = len(commands)
+        ntasks = (len(commands) + self.pack - 1) // self.pack
+
+        lines = ["#!/bin/bash"]
+        lines += self._header(ntasks)
+        lines += [
+            'TASK=${0}'.format(self.task_variable),
+            'FIRST=$(( (TASK - 1) * {0} + 1 ))'.format(self.pack),
+            'LAST=$(( TASK * {0} ))'.format(self.pack),
+            'RESULTS="{0}"'.format(os.path.abspath(self.results_dir)),
+            'STDINS="{0}"'.format(os.path.abspath(self.stdin_dir)),
+            'i=0',
+            'while IFS= read -r line; do',
+            '    i=$(( i + 1 ))',
+            '    [ $i -lt $FIRST ] && continue',
+            '    [ $i -gt $LAST ] && break',
+            '    STDIN="$STDINS/$i.in"',
+            '    [ -f "$STDIN" ] || STDIN=/dev/null',
+            # The subshell stops a cd, export or exit in one command from affecting the next
+            '    ( eval "$line" ) > "$RESULTS/$i.out" 2> "$RESULTS/$i.err" < "$STDIN"',
+            '    echo $? > "$RESULTS/$i.rc"',
+            'done < "{0}"'.format(os.path.abspath(self.command_file)),
+        ]
+        with open(self.script, "w") as f_out:
+            f_out.write("\n".join(lines) + "\n")
+        os.chmod(self.script, 0o755)
+        return self.script
+
+    def submit(self):
+        """Submit the array job script to the cluster queue
+
+        Returns
+        -------
+        str
+           The output of the submission command
+
+        """
+        output = subprocess.check_output([self.submit_exe, self.script], universal_newlines=True)
+        match = re.search(r"\d+", output)
+        self._job_id = match.group(0) if match else None
+        return output
+
+    def collect(self):
+        """Read the results written by the array tasks
+
+        Returns
+        -------
+        list
+           A :obj:`Result` per command in submission order; commands that have
+           not completed have a ``returncode`` of :obj:`None`
+
+        """
+        with open(self.command_file, "r") as f_in:
+            commands = f_in.read().splitlines()
+        results = []
+        for i, command in enumerate(commands, 1):
+            result = Result(command)
+            prefix = os.path.join(self.results_dir, str(i))
+            try:
+                with open(prefix + ".rc", "r") as f_in:
+                    result.returncode = int(f_in.read().strip())
+            except (IOError, OSError, ValueError):
+                results.append(result)
+                continue
+            for attr in ("stdout", "stderr"):
+                with open(prefix + (".out" if attr == "stdout" else ".err"), "r") as f_in:
+                    setattr(result, attr, f_in.read())
+            results.append(result)
+        return results
+
+    def done(self):
+        """Check whether all commands have completed"""
+        return all(os.path.isfile(os.path.join(self.results_dir, "{0}.rc".format(i)))
+                   for i in range(1, self._ncommands + 1))
+
+    def queued(self):
+        """Check whether the submitted array job is still queued or running
+
+        The job is assumed to be queued if its state cannot be determined.
+
+        """
+        if self._job_id is None:
+            return True
+        try:
+            return self._queued(self._job_id)
+        except OSError:
+            return True
+
+    def run(self, cmdlines, stdins=None):
+        """Submit the command lines and block until the array job has completed
+
+        Waiting ends early once the job has left the queue, e.g. because array tasks were
+        killed, or after :attr:`timeout` seconds; the commands that did not complete have
+        a ``returncode`` of :obj:`None`, see :meth:`collect`.
+
+        """
+        self.write(cmdlines, stdins=stdins)
+        self.submit()
+        start = time.time()
+        while not self.done():
+            if self.timeout is not None and time.time() - start > self.timeout:
+                break
+            elif not self.queued():
+                # Results of the last tasks may only just become visible on shared file systems
+                time.sleep(self.poll)
+                break
+            time.sleep(self.poll)
+        return self.collect()
+
+    def _header(self, ntasks):
+        raise NotImplementedError
+
+    def _queued(self, job_id):
+        raise NotImplementedError
+
+
+class SlurmBackend(_ArrayBackend):
+    """Array job script generator for the SLURM workload manager"""
+
+    submit_exe = "sbatch"
+    task_variable = "SLURM_ARRAY_TASK_ID"
+
+    def _header(self, ntasks):
+        array = "1-{0}".format(ntasks)
+        if self.max_running:
+            array += "%{0}".format(self.max_running)
+        log = os.path.join(os.path.abspath(self.directory), "{0}_%A_%a.log".format(self.name))
+        header = [
+            "#SBATCH --job-name={0}".format(self.name),
+            "#SBATCH --array={0}".format(array),
+            "#SBATCH --output={0}".format(log),
+        ]
+        return header + ["#SBATCH {0}".format(d) for d in self.directives]
+
+    def _queued(self, job_id):
+        p = subprocess.Popen(["squeue", "--noheader", "--jobs", job_id], stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE, universal_newlines=True)
+        stdout, _ = p.communicate()
+        # squeue fails with an invalid job id once the job has been purged
+        return p.returncode == 0 and bool(stdout.strip())
+
+
+class SgeBackend(_ArrayBackend):
+    """Array job script generator for the (Sun/Open) Grid Engine"""
+
+    submit_exe = "qsub"
+    task_variable = "SGE_TASK_ID"
+
+    def _header(self, ntasks):
+        header = [
+            "#$ -N {0}".format(self.name),
+            "#$ -t 1-{0}".format(ntasks),
+            "#$ -S /bin/bash",
+            "#$ -j y",
+            "#$ -o {0}".format(os.path.abspath(self.directory)),
+        ]
+        if self.max_running:
+            header.append("#$ -tc {0}".format(self.max_running))
+        return header + ["#$ {0}".format(d) for d in self.directives]
+
+    def _queued(self, job_id):
+        p = subprocess.Popen(["qstat", "-j", job_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        p.communicate()
+        return p.returncode == 0
+
+
+def _execute(job):
+    """Execute a single command with its stdin and return its :obj:`Result`"""
+    command, stdin = job
+    p = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         universal_newlines=True)
+    stdout, stderr = p.communicate(stdin)
+    return Result(command, p.returncode, stdout, stderr)
@@ -0,0 +1,278 @@
+"""Persistent runtime history and job cost prediction
+
+Description
+-----------
+Batches finish earliest when their longest jobs are started first. The
+:obj:`RuntimeHistory` records the features and runtime of every call in an embedded
+SQLite database and predicts the runtime of new calls from it:
+
+* Runs are grouped by tool and by the set of flags on the command line, since flags
+  often select different algorithms.
+* Within a group, the runtime is modelled as a power law of the combined input size,
+  ``t = a * size ** b``, fitted by least squares in log-log space. The size is the
+  number of residues in the input structures where enough runs recorded it, which
+  predicts the cost of structure-based tools more closely than the input bytes, and
+  the number of input bytes otherwise. Groups with too few runs or without variation
+  in input size use their median runtime, and tools without matching groups the
+  median of all their runs.
+
+The models of a tool are refitted once its runs have grown by a tenth since the last
+fit, rather than on every new run. The database is bounded: every ``compact_every``
+insertions, all but the most recent ``keep`` runs per group are deleted.
+
+The history is a :obj:`Sink <mxkit.instrument.Sink>`, so registering it with
+:func:`mxkit.instrument.add_sink` records every call automatically, including the
+number of residues in the input structures.
+
+Examples
+--------
+>>> from mxkit import instrument
+>>> from mxkit.dispatch.history import RuntimeHistory
+>>> history = instrument.add_sink(RuntimeHistory("runtimes.sqlite"))
+>>> cmdlines = history.order(cmdlines)
+>>> print("Expected completion in {0:.0f} s".format(history.makespan(cmdlines, nproc=16)))
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import heapq
+import math
+import os
+import shlex
+import sqlite3
+import threading
+import time
+
+from mxkit.instrument import Sink
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    input_bytes INTEGER,
+    residues INTEGER,
+    wall_time REAL NOT NULL,
+    returncode INTEGER,
+    timestamp REAL
+);
+CREATE INDEX IF NOT EXISTS runs_group ON runs (tool, flags);
+"""
+
+
+def flags(command):
+    """Return the sorted flags of a command line as a single string"""
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        tokens = command.split()
+    return " ".join(sorted(set(t for t in tokens[1:] if t.startswith("-") and len(t) > 1)))
+
+
+def residues(path):
+    """Return the number of C-alpha atoms in a PDB file, or None if it is not one"""
+    if not path.lower().endswith((".pdb", ".ent", ".pdb.gz", ".ent.gz")):
+        return None
+    # Imported here so that recording runs does not import NumPy
+    from mxkit.formats.pdb import open_structure
+    n = 0
+    with open_structure(path) as f_in:
+        for line in f_in:
+            if line[:6] == "ENDMDL":
+                break
+            elif line[:4] == "ATOM" and line[12:16] == " CA ":
+                n += 1
+    return n
+
+
+def _residues(files):
+    """Return the combined number of residues in the structures among files, or None if there are none"""
+    counts = [n for n in (residues(f) for f in files) if n is not None]
+    return sum(counts) if counts else None
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else 0.5 * (values[mid - 1] + values[mid])
+
+
+class RuntimeHistory(Sink):
+    """SQLite store of past runs with a runtime predictor"""
+
+    def __init__(self, path, keep=1000, compact_every=1000, min_samples=5, default=60.0):
+        """Initialise a new :obj:`RuntimeHistory`
+
+        Parameters
+        ----------
+        path : str
+           The path to the SQLite database, created if it does not exist
+        keep : int, optional
+           The number of most recent runs kept per group on compaction [default: 1000]
+        compact_every : int, optional
+           The number of insertions between compactions [default: 1000]
+        min_samples : int, optional
+           The number of runs required to fit a group [default: 5]
+        default : float, optional
+           The runtime in seconds predicted for tools without history [default: 60]
+
+        """
+        self.path = path
+        self.keep = keep
+        self.compact_every = compact_every
+        self.min_samples = min_samples
+        self.default = default
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self._models = {}
+        # Per tool: the number of runs in the last fit and of runs inserted since
+        self._fitted = {}
+        self._pending = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def write(self, record):
+        files = [f for f in record.input_files or [] if os.path.isfile(f)]
+        self._insert(record.tool, flags(record.command), record.input_bytes, _residues(files), record.wall_time,
+                     record.returncode, record.timestamp)
+
+    def add(self, cmdline, wall_time, returncode=0, timestamp=None):
+        """Record a run of a command line wrapper
+
+        Parameters
+        ----------
+        cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`
+           The command line wrapper
+        wall_time : float
+           The runtime in seconds
+        returncode : int, optional
+           The exit status [default: 0]
+        timestamp : float, optional
+           The start time of the run [default: now]
+
+        """
+        files = [f for f in cmdline.filenames() if os.path.isfile(f)]
+        self._insert(cmdline.__class__.__name__, flags(str(cmdline)), sum(os.path.getsize(f) for f in files),
+                     _residues(files), wall_time, returncode, time.time() if timestamp is None else timestamp)
+
+    def _insert(self, tool, argv_flags, input_bytes, nres, wall_time, returncode, timestamp):
+        if wall_time is None:
+            return
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO runs (tool, flags, input_bytes, residues, wall_time, returncode, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (tool, argv_flags, input_bytes, nres, wall_time, returncode, timestamp))
+            self._pending[tool] = self._pending.get(tool, 0) + 1
+            self._inserts += 1
+            compact = self.compact_every and self._inserts % self.compact_every == 0
+        if compact:
+            self.compact()
+
+    def compact(self):
+        """Delete all but the most recent runs per group and reclaim the space"""
+        with self._lock:
+            with self._connection:
+                groups = self._connection.execute("SELECT DISTINCT tool, flags FROM runs").fetchall()
+                for tool, group in groups:
+                    oldest = self._connection.execute(
+                        "SELECT id FROM runs WHERE tool = ? AND flags = ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+                        (tool, group, self.keep - 1)).fetchone()
+                    if oldest is not None:
+                        self._connection.execute("DELETE FROM runs WHERE tool = ? AND flags = ? AND id < ?",
+                                                 (tool, group, oldest[0]))
+            self._connection.execute("VACUUM")
+            self._models.clear()
+
+    def _model(self, tool):
+        """Fit the runtime model of all groups of a tool"""
+        if tool in self._models and self._pending.get(tool, 0) < max(1, self._fitted[tool] // 10):
+            return self._models[tool]
+        rows = self._connection.execute(
+            "SELECT flags, input_bytes, residues, wall_time FROM runs WHERE tool = ? AND returncode = 0",
+            (tool, )).fetchall()
+        groups = {}
+        for group, size, nres, wall_time in rows:
+            groups.setdefault(group, []).append((size, nres, wall_time))
+        model = {None: _median([r[3] for r in rows]) if rows else None}
+        for group, runs in groups.items():
+            median = _median([r[2] for r in runs])
+            model[group] = (None, None, None, median)
+            for feature, index in (("residues", 1), ("input_bytes", 0)):
+                fit = self._fit([(r[index], r[2]) for r in runs])
+                if fit is not None:
+                    model[group] = (feature, ) + fit + (median, )
+                    break
+        self._models[tool] = model
+        self._fitted[tool] = len(rows)
+        self._pending[tool] = 0
+        return model
+
+    def _fit(self, runs):
+        """Fit the power law of the runtime over a size, or return None if there are too few runs"""
+        points = [(math.log(s), math.log(t)) for s, t in runs if s and s > 0 and t > 0]
+        if len(points) < self.min_samples or len(set(x for x, _ in points)) < 2:
+            return None
+        n = float(len(points))
+        mx = sum(x for x, _ in points) / n
+        my = sum(y for _, y in points) / n
+        sxx = sum((x - mx) ** 2 for x, _ in points)
+        slope = sum((x - mx) * (y - my) for x, y in points) / sxx
+        return slope, my - slope * mx
+
+    def predict(self, cmdline):
+        """Predict the runtime of a command line wrapper in seconds"""
+        tool = cmdline.__class__.__name__
+        with self._lock:
+            model = self._model(tool)
+        group = model.get(flags(str(cmdline)))
+        if group is None:
+            return self.default if model[None] is None else model[None]
+        feature, slope, intercept, median = group
+        if feature is None:
+            return median
+        files = [f for f in cmdline.filenames() if os.path.isfile(f)]
+        if feature == "residues":
+            size = _residues(files)
+        else:
+            size = sum(os.path.getsize(f) for f in files)
+        if not size:
+            return median
+        return math.exp(intercept + slope * math.log(size))
+
+    def order(self, cmdlines):
+        """Return command lines ordered by decreasing predicted runtime"""
+        predicted = [(self.predict(c), i, c) for i, c in enumerate(cmdlines)]
+        return [c for _, _, c in sorted(predicted, key=lambda p: (-p[0], p[1]))]
+
+    def prioritize(self, jobs):
+        """Set the priority of :obj:`Job <mxkit.dispatch.scheduler.Job>` instances to their predicted runtime"""
+        for job in jobs:
+            if hasattr(job.cmdline, "filenames"):
+                job.priority = self.predict(job.cmdline)
+        return jobs
+
+    def makespan(self, cmdlines, nproc=1):
+        """Estimate the seconds to complete command lines on ``nproc`` workers
+
+        The estimate assumes the command lines are started longest first, each on the
+        worker that becomes available first.
+
+        """
+        workers = [0.0] * max(nproc, 1)
+        for runtime in sorted((self.predict(c) for c in cmdlines), reverse=True):
+            heapq.heappush(workers, heapq.heappop(workers) + runtime)
+        return max(workers)
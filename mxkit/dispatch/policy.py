@@ -0,0 +1,242 @@
+"""Timeouts, retries and quarantine for command line wrapper calls
+
+Description
+-----------
+A single hanging maxcluster or Molrep process stalls a whole batch. An
+:obj:`ExecutionPolicy` bounds the time of every call:
+
+* The timeout of a call is derived from the runtimes of previous successful calls of
+  the same tool with inputs of similar size, as learned by a :obj:`TimeoutModel` from
+  the :mod:`mxkit.instrument` records. Inputs are bucketed by the power of two of
+  their combined size, and the timeout is a multiple of a high quantile of the
+  runtimes in the bucket, falling back to all runs of the tool and finally to a
+  default.
+* Calls that time out or fail are retried with an exponential backoff; every retry
+  after a timeout doubles the timeout.
+* Inputs that failed repeatedly are quarantined and not run again, optionally across
+  sessions when a ``quarantine_file`` is used.
+
+Examples
+--------
+>>> from mxkit import instrument
+>>> from mxkit.dispatch.policy import ExecutionPolicy, TimeoutModel
+>>> model = instrument.add_sink(TimeoutModel.from_records(instrument.JsonLinesSink.read("runs.jsonl")))
+>>> policy = ExecutionPolicy(model, retries=2, quarantine_file="quarantine.json")
+>>> stdout, stderr = policy.run(molrep.MolrepCommandline(hklin="data.mtz", xyzin="model.pdb"))
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import collections
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+from mxkit.instrument import Sink
+
+
+class QuarantineError(RuntimeError):
+    """Raised when the inputs of a call have been quarantined"""
+
+
+def input_bytes(cmdline):
+    """Return the combined size of the input files of a command line"""
+    return sum(os.path.getsize(f) for f in cmdline.filenames() if os.path.isfile(f))
+
+
+def _bucket(size):
+    return int(math.log(size, 2)) if size and size > 0 else 0
+
+
+class TimeoutModel(Sink):
+    """Learn timeouts from the runtimes of successful calls
+
+    The model is a :obj:`Sink <mxkit.instrument.Sink>` and keeps learning while it is
+    registered with :func:`mxkit.instrument.add_sink`.
+
+    """
+
+    def __init__(self, quantile=0.99, factor=3.0, min_samples=20, history=1000, default=None, minimum=10.0):
+        """Initialise a new :obj:`TimeoutModel`
+
+        Parameters
+        ----------
+        quantile : float, optional
+           The runtime quantile the timeout is based on [default: 0.99]
+        factor : float, optional
+           The multiple of the quantile used as timeout [default: 3.0]
+        min_samples : int, optional
+           The number of runtimes required to derive a timeout [default: 20]
+        history : int, optional
+           The number of most recent runtimes kept per tool and size bucket [default: 1000]
+        default : float, optional
+           The timeout in seconds used without sufficient history [default: no timeout]
+        minimum : float, optional
+           The lower bound of a derived timeout in seconds [default: 10]
+
+        """
+        self.quantile = quantile
+        self.factor = factor
+        self.min_samples = min_samples
+        self.history = history
+        self.default = default
+        self.minimum = minimum
+        self._runtimes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records, **kwargs):
+        """Build a model from previously collected :obj:`Record <mxkit.instrument.Record>` instances"""
+        model = cls(**kwargs)
+        for record in records:
+            model.write(record)
+        return model
+
+    def write(self, record):
+        if record.returncode != 0 or record.wall_time is None:
+            return
+        bucket = _bucket(record.input_bytes)
+        with self._lock:
+            for key in ((record.tool, bucket), (record.tool, None)):
+                if key not in self._runtimes:
+                    self._runtimes[key] = collections.deque(maxlen=self.history)
+                self._runtimes[key].append(record.wall_time)
+
+    def timeout(self, tool, size=None):
+        """Return the timeout in seconds for a call of a tool with inputs of the given size"""
+        with self._lock:
+            for key in ((tool, _bucket(size)), (tool, None)):
+                runtimes = self._runtimes.get(key)
+                if runtimes is not None and len(runtimes) >= self.min_samples:
+                    runtimes = sorted(runtimes)
+                    value = runtimes[min(int(self.quantile * len(runtimes)), len(runtimes) - 1)]
+                    return max(self.factor * value, self.minimum)
+        return self.default
+
+
+class ExecutionPolicy(object):
+    """Run command line wrappers with timeouts, retries and quarantine"""
+
+    def __init__(self, model=None, retries=2, backoff=1.0, quarantine_after=3, quarantine_file=None):
+        """Initialise a new :obj:`ExecutionPolicy`
+
+        Parameters
+        ----------
+        model : :obj:`TimeoutModel`, optional
+           The model providing timeouts [default: no timeouts]
+        retries : int, optional
+           The number of retries after a failed call [default: 2]
+        backoff : float, optional
+           The seconds to wait before the first retry, doubled for every further retry [default: 1.0]
+        quarantine_after : int, optional
+           The number of failed calls after which inputs are quarantined [default: 3]
+        quarantine_file : str, optional
+           The path to a file recording failures across sessions
+
+        """
+        if retries < 0:
+            raise ValueError("The number of retries must not be negative")
+        self.model = model
+        self.retries = retries
+        self.backoff = backoff
+        self.quarantine_after = quarantine_after
+        self.quarantine_file = quarantine_file
+        self._lock = threading.Lock()
+        self._failures = self._read_failures()
+
+    @staticmethod
+    def key(cmdline, stdin=None):
+        """Return the key identifying the inputs of a command line
+
+        Command lines without input files are identified by the full command, and the
+        standard input, e.g. Phaser keywords, is included as a digest.
+        """
+        files = sorted(os.path.abspath(f) for f in cmdline.filenames())
+        fields = [cmdline.__class__.__name__] + (files or [str(cmdline)])
+        if stdin is not None:
+            data = stdin if isinstance(stdin, bytes) else stdin.encode("utf-8")
+            fields.append("sha1:" + hashlib.sha1(data).hexdigest())
+        return "\t".join(fields)
+
+    def quarantined(self, cmdline, stdin=None):
+        """Check whether the inputs of a command line have been quarantined"""
+        with self._lock:
+            return self._failures.get(self.key(cmdline, stdin), 0) >= self.quarantine_after
+
+    def run(self, cmdline, **kwargs):
+        """Call a command line wrapper under this policy
+
+        A successful call resets the failure count of its inputs.
+
+        Parameters
+        ----------
+        cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`
+           The command line wrapper
+        **kwargs
+           Further arguments passed on to the call of the wrapper
+
+        Returns
+        -------
+        tuple
+           The stdout and stderr of the successful call
+
+        Raises
+        ------
+        :obj:`QuarantineError`
+           The inputs have been quarantined
+        :obj:`ApplicationError <Bio.Application.ApplicationError>`
+           The last retry failed or timed out
+
+        """
+        from mxkit.apps import ApplicationTimeout
+        from Bio.Application import ApplicationError
+
+        key = self.key(cmdline, kwargs.get('stdin'))
+        if self.quarantined(cmdline, kwargs.get('stdin')):
+            raise QuarantineError("Inputs quarantined after repeated failures: {0}".format(cmdline))
+        timeout = None
+        if self.model is not None:
+            timeout = self.model.timeout(cmdline.__class__.__name__, input_bytes(cmdline))
+        for attempt in range(self.retries + 1):
+            try:
+                result = cmdline(timeout=timeout, **kwargs)
+            except ApplicationError as e:
+                if self._fail(key) or attempt == self.retries:
+                    raise
+                elif isinstance(e, ApplicationTimeout) and timeout is not None:
+                    timeout *= 2
+                time.sleep(self.backoff * 2 ** attempt)
+            else:
+                self._succeed(key)
+                return result
+
+    def _fail(self, key):
+        """Count a failure and return whether the inputs are now quarantined"""
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+            self._write_failures()
+            return self._failures[key] >= self.quarantine_after
+
+    def _succeed(self, key):
+        with self._lock:
+            if self._failures.pop(key, None) is not None:
+                self._write_failures()
+
+    def _write_failures(self):
+        if self.quarantine_file:
+            tmp = self.quarantine_file + ".tmp"
+            with open(tmp, "w") as f_out:
+                json.dump(self._failures, f_out, indent=1, sort_keys=True)
+            os.rename(tmp, self.quarantine_file)
+
+    def _read_failures(self):
+        if self.quarantine_file and os.path.isfile(self.quarantine_file):
+            with open(self.quarantine_file, "r") as f_in:
+                return json.load(f_in)
+        return {}
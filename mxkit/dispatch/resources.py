@@ -0,0 +1,190 @@
+"""Resource-aware admission of jobs onto the local host
+
+Description
+-----------
+A single worker count either undersubscribes a node with small jobs like TMscore or
+exhausts its memory with Phaser and Refmac jobs. Every wrapper therefore declares the
+cores and memory a call is expected to use, see
+:meth:`AbstractCommandline.resources <mxkit.apps.AbstractCommandline.resources>`.
+An :obj:`Admission` controller keeps account of the resources held by running jobs
+and only admits a job if its request fits into what remains.
+
+The capacity defaults to the resources available to this process according to
+:func:`host_limits`, which honours CPU affinity and cgroup (v1 and v2) CPU quotas and
+memory limits, as imposed by container runtimes and batch systems.
+
+Examples
+--------
+>>> from mxkit.dispatch.resources import Admission
+>>> from mxkit.dispatch.scheduler import Scheduler
+>>> scheduler = Scheduler(nproc=32, admission=Admission())
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import multiprocessing
+import os
+import threading
+
+_CGROUP = "/sys/fs/cgroup"
+
+
+def _read(path):
+    try:
+        with open(path, "r") as f_in:
+            return f_in.read().strip()
+    except (IOError, OSError):
+        return None
+
+
+def _cgroup_dir(root):
+    """Return the cgroup v2 directory of this process"""
+    for line in (_read("/proc/self/cgroup") or "").splitlines():
+        if line.startswith("0::"):
+            path = os.path.join(root, line[3:].lstrip("/"))
+            if os.path.isdir(path):
+                return path
+    return root
+
+
+def cgroup_limits(root=_CGROUP):
+    """Return the CPU and memory limits of the cgroup of this process
+
+    Parameters
+    ----------
+    root : str, optional
+       The cgroup file system mount point [default: /sys/fs/cgroup]
+
+    Returns
+    -------
+    tuple
+       The number of cores and the memory in MiB, each None if unlimited
+
+    """
+    cores = memory = None
+    # cgroup v2 exposes unified control files, v1 one directory per controller
+    unified = _cgroup_dir(root)
+    cpu_max = _read(os.path.join(unified, "cpu.max"))
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            cores = float(quota) / float(period)
+    else:
+        quota = _read(os.path.join(root, "cpu", "cpu.cfs_quota_us"))
+        period = _read(os.path.join(root, "cpu", "cpu.cfs_period_us"))
+        if quota and period and int(quota) > 0:
+            cores = float(quota) / float(period)
+
+    limit = _read(os.path.join(unified, "memory.max"))
+    if limit is None:
+        limit = _read(os.path.join(root, "memory", "memory.limit_in_bytes"))
+    if limit and limit != "max":
+        # cgroup v1 reports a huge number when unlimited
+        if int(limit) < 2 ** 60:
+            memory = int(limit) // 2 ** 20
+    return cores, memory
+
+
+def host_limits(root=_CGROUP):
+    """Return the cores and memory in MiB available to this process
+
+    Parameters
+    ----------
+    root : str, optional
+       The cgroup file system mount point [default: /sys/fs/cgroup]
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cores = float(len(os.sched_getaffinity(0)))
+    else:
+        cores = float(multiprocessing.cpu_count())
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2 ** 20
+    except (AttributeError, ValueError, OSError):
+        memory = None
+    cg_cores, cg_memory = cgroup_limits(root)
+    if cg_cores is not None:
+        cores = min(cores, max(cg_cores, 1.0))
+    if cg_memory is not None:
+        memory = cg_memory if memory is None else min(memory, cg_memory)
+    return cores, memory
+
+
+class Admission(object):
+    """Thread-safe accounting of the cores and memory held by running jobs
+
+    Requests exceeding the total capacity are clamped to it, so that such jobs are
+    still run, albeit alone.
+
+    """
+
+    def __init__(self, cores=None, memory=None):
+        """Initialise a new :obj:`Admission` controller
+
+        Parameters
+        ----------
+        cores : float, optional
+           The number of cores to allocate [default: see :func:`host_limits`]
+        memory : int, optional
+           The memory to allocate in MiB [default: see :func:`host_limits`]
+
+        """
+        if cores is None or memory is None:
+            host_cores, host_memory = host_limits()
+            cores = host_cores if cores is None else cores
+            memory = host_memory if memory is None else memory
+        if cores <= 0 or (memory is not None and memory <= 0):
+            raise ValueError("Admission capacity must be positive")
+        self.cores = cores
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._cores = 0.0
+        self._memory = 0
+
+    def __repr__(self):
+        return "{0}(cores={1}/{2}, memory={3}/{4})".format(
+            self.__class__.__name__, self._cores, self.cores, self._memory, self.memory)
+
+    def _clamp(self, request):
+        cores = min(float(request.get('cores', 1)), self.cores)
+        memory = int(request.get('memory', 0))
+        if self.memory is not None:
+            memory = min(memory, self.memory)
+        return cores, memory
+
+    def fits(self, request):
+        """Return whether a request fits into the remaining capacity"""
+        cores, memory = self._clamp(request)
+        with self._lock:
+            if self._cores + cores > self.cores + 1e-9:
+                return False
+            return self.memory is None or self._memory + memory <= self.memory
+
+    def acquire(self, request):
+        """Reserve the resources of a request if it fits
+
+        Returns
+        -------
+        bool
+           True if the resources were reserved
+
+        """
+        cores, memory = self._clamp(request)
+        with self._lock:
+            if self._cores + cores > self.cores + 1e-9:
+                return False
+            elif self.memory is not None and self._memory + memory > self.memory:
+                return False
+            self._cores += cores
+            self._memory += memory
+            return True
+
+    def release(self, request):
+        """Return the resources of an acquired request"""
+        cores, memory = self._clamp(request)
+        with self._lock:
+            self._cores = max(self._cores - cores, 0.0)
+            self._memory = max(self._memory - memory, 0)
@@ -0,0 +1,370 @@
+"""Dependency-aware scheduler for chaining command line wrappers
+
+Description
+-----------
+Each :obj:`Job` wraps a single command line call. Its input and output files are
+derived from the ``filename=True`` parameters of the wrapper, and a job only starts
+once every job producing one of its inputs has finished. Independent jobs, e.g. those
+belonging to different search models, run concurrently across a pool of workers.
+
+Examples
+--------
+>>> from mxkit.apps import dssp, refmac
+>>> from mxkit.dispatch.scheduler import Job, Scheduler
+>>> scheduler = Scheduler(nproc=4, limits={'RefmacCommandline': 2}, state_file="pipeline.json")
+>>> scheduler.add(Job("refine_1", refmac.RefmacCommandline(
+...     hklin="data.mtz", xyzin="placed_1.pdb", hklout="refined_1.mtz", xyzout="refined_1.pdb"),
+...     stdin="NCYC 10\nEND\n"))
+>>> scheduler.add(Job("dssp_1", dssp.DsspCommandline(input="refined_1.pdb", output="refined_1.dssp")))
+>>> status = scheduler.run()
+
+With an :obj:`Admission <mxkit.dispatch.resources.Admission>` controller, jobs are
+additionally only started while their declared cores and memory fit onto the host.
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+
+FAILED = "failed"
+FINISHED = "finished"
+PENDING = "pending"
+RUNNING = "running"
+SKIPPED = "skipped"
+
+
+class Job(object):
+    """A single node in the job graph
+
+    Attributes
+    ----------
+    name : str
+       A unique name for this job
+    cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`, callable
+       The command line wrapper (or any callable) to execute
+    priority : int
+       Jobs with a higher priority are started first when several are ready
+    tool : str
+       The key used to look up resource limits, by default the wrapper class name
+    inputs : set
+       The files read by this job
+    outputs : set
+       The files written by this job
+    after : set
+       The names of jobs that must finish before this one, in addition to file dependencies
+    resources : dict
+       The number of ``cores`` and the ``memory`` in MiB used by this job
+    stdin : str
+       The standard input of the call, e.g. Refmac or Phaser keywords
+    signature : str
+       The string identifying the work done by this job
+
+    """
+
+    def __init__(self, name, cmdline, priority=0, tool=None, inputs=None, outputs=None, after=None, resources=None,
+                 stdin=None):
+        """Initialise a new :obj:`Job`
+
+        Parameters
+        ----------
+        name : str
+           A unique name for this job
+        cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`, callable
+           The command line wrapper (or any callable) to execute
+        priority : int, optional
+           Jobs with a higher priority are started first when several are ready [default: 0]
+        tool : str, optional
+           The key used to look up resource limits [default: the wrapper class name]
+        inputs : list, tuple, optional
+           Additional files read by this job
+        outputs : list, tuple, optional
+           Additional files written by this job, e.g. those not passed on the command line
+        after : list, tuple, optional
+           The names of jobs that must finish before this one
+        resources : dict, optional
+           The number of ``cores`` and the ``memory`` in MiB used by this job
+           [default: as declared by the wrapper]
+        stdin : str, optional
+           The standard input passed to the call of the command line wrapper
+
+        """
+        self.name = name
+        self.cmdline = cmdline
+        self.priority = priority
+        self.tool = tool or cmdline.__class__.__name__
+        self.inputs = set(Job._normpaths(inputs or []))
+        self.outputs = set(Job._normpaths(outputs or []))
+        self.after = set(after or [])
+        if hasattr(cmdline, "filenames"):
+            self.inputs.update(Job._normpaths(cmdline.filenames(output=False)))
+            self.outputs.update(Job._normpaths(cmdline.filenames(output=True)))
+        if resources is None:
+            resources = cmdline.resources() if hasattr(cmdline, "resources") else {'cores': 1, 'memory': 0}
+        self.resources = resources
+        self.stdin = stdin
+        self.signature = Job._signature(cmdline, stdin)
+        self.status = PENDING
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return "{0}(name={1}, tool={2}, status={3})".format(self.__class__.__name__, self.name, self.tool, self.status)
+
+    def run(self, policy=None):
+        """Execute the job and return whatever the command line wrapper returns
+
+        Parameters
+        ----------
+        policy : :obj:`ExecutionPolicy <mxkit.dispatch.policy.ExecutionPolicy>`, optional
+           The policy applied to calls of command line wrappers
+
+        """
+        kwargs = {} if self.stdin is None else {'stdin': self.stdin}
+        if policy is not None and hasattr(self.cmdline, "filenames"):
+            return policy.run(self.cmdline, **kwargs)
+        return self.cmdline(**kwargs)
+
+    @staticmethod
+    def _normpaths(paths):
+        return [os.path.abspath(p) for p in paths]
+
+    @staticmethod
+    def _signature(cmdline, stdin):
+        # Wrappers are identified by their parameter values, since the command line itself
+        # may only be finalised by the call, e.g. after probing the version of DSSP
+        signature = repr(cmdline) if hasattr(cmdline, "filenames") else str(cmdline)
+        if stdin is not None:
+            data = stdin if isinstance(stdin, bytes) else stdin.encode("utf-8")
+            signature += " < sha1:" + hashlib.sha1(data).hexdigest()
+        return signature
+
+
+class Scheduler(object):
+    """Run a graph of :obj:`Job` instances across a pool of worker threads
+
+    Jobs are started in order of priority as soon as all their dependencies have finished.
+    If a job fails, all jobs depending on it are skipped. When a ``state_file`` is given,
+    finished jobs are recorded and not run again when the same graph is resubmitted,
+    e.g. after a crash.
+
+    """
+
+    def __init__(self, nproc=1, limits=None, state_file=None, admission=None, policy=None):
+        """Initialise a new :obj:`Scheduler`
+
+        Parameters
+        ----------
+        nproc : int, optional
+           The maximum number of concurrent jobs [default: 1]
+        limits : dict, optional
+           The maximum number of concurrent jobs per :attr:`Job.tool`
+        state_file : str, optional
+           The path to a file recording finished jobs for resumption
+        admission : :obj:`Admission <mxkit.dispatch.resources.Admission>`, optional
+           The controller admitting jobs according to their :attr:`Job.resources`
+        policy : :obj:`ExecutionPolicy <mxkit.dispatch.policy.ExecutionPolicy>`, optional
+           The timeout, retry and quarantine policy applied to all jobs
+
+        """
+        if nproc < 1:
+            raise ValueError("At least one worker is required")
+        elif limits and min(limits.values()) < 1:
+            raise ValueError("Tool limits must allow at least one job")
+        self.nproc = nproc
+        self.limits = dict(limits or {})
+        self.state_file = state_file
+        self.admission = admission
+        self.policy = policy
+        self._jobs = {}
+        self._order = []
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __getitem__(self, name):
+        return self._jobs[name]
+
+    def add(self, job):
+        """Add a :obj:`Job` to the graph
+
+        Raises
+        ------
+        ValueError
+           A job with the same name has already been added
+
+        """
+        if job.name in self._jobs:
+            raise ValueError("Job name multiply defined: {0}".format(job.name))
+        self._jobs[job.name] = job
+        self._order.append(job.name)
+        return job
+
+    def dependencies(self):
+        """Return the names of the jobs each job depends on
+
+        Returns
+        -------
+        dict
+           A mapping of job name to the set of upstream job names
+
+        Raises
+        ------
+        ValueError
+           A job depends on an unknown job or a file is written by more than one job
+        RuntimeError
+           The graph contains a cycle
+
+        """
+        producers = {}
+        for name in self._order:
+            for f in self._jobs[name].outputs:
+                if f in producers:
+                    raise ValueError("File written by {0} and {1}: {2}".format(producers[f], name, f))
+                producers[f] = name
+
+        upstream = {}
+        for name in self._order:
+            job = self._jobs[name]
+            unknown = job.after.difference(self._jobs)
+            if unknown:
+                raise ValueError("Job {0} depends on unknown jobs: {1}".format(name, ", ".join(sorted(unknown))))
+            deps = set(job.after)
+            deps.update(producers[f] for f in job.inputs if f in producers)
+            deps.discard(name)
+            upstream[name] = deps
+
+        # Kahn's algorithm to make sure the graph can be completed
+        remaining = {name: len(deps) for name, deps in upstream.items()}
+        downstream = self._invert(upstream)
+        stack = [name for name, n in remaining.items() if n == 0]
+        while stack:
+            for child in downstream[stack.pop()]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    stack.append(child)
+        cyclic = sorted(name for name, n in remaining.items() if n > 0)
+        if cyclic:
+            raise RuntimeError("Job graph contains a cycle: {0}".format(", ".join(cyclic)))
+        return upstream
+
+    def run(self):
+        """Run all jobs in the graph and block until they have completed
+
+        Returns
+        -------
+        dict
+           A mapping of job name to its final status
+
+        """
+        upstream = self.dependencies()
+        downstream = self._invert(upstream)
+        completed = self._read_state()
+
+        counter = itertools.count()
+        remaining = {}
+        ready = []
+        for name in self._order:
+            job = self._jobs[name]
+            if completed.get(name) == job.signature:
+                job.status = FINISHED
+        for name in self._order:
+            job = self._jobs[name]
+            if job.status == FINISHED:
+                continue
+            remaining[name] = sum(1 for d in upstream[name] if self._jobs[d].status != FINISHED)
+            if remaining[name] == 0:
+                heapq.heappush(ready, (-job.priority, next(counter), name))
+
+        cond = threading.Condition()
+        running = {}
+        state = {"active": 0, "outstanding": len(remaining)}
+
+        def skip(name):
+            for child in downstream[name]:
+                if self._jobs[child].status == PENDING:
+                    self._jobs[child].status = SKIPPED
+                    state["outstanding"] -= 1
+                    skip(child)
+
+        def work(job):
+            try:
+                job.result = job.run(policy=self.policy)
+                job.status = FINISHED
+            except Exception as e:
+                job.error = e
+                job.status = FAILED
+            finally:
+                # Also account for the job if interrupted, e.g. by SystemExit, so that run() returns
+                if job.status == RUNNING:
+                    job.status = FAILED
+                if self.admission is not None:
+                    self.admission.release(job.resources)
+                with cond:
+                    state["active"] -= 1
+                    state["outstanding"] -= 1
+                    running[job.tool] -= 1
+                    if job.status == FINISHED:
+                        completed[job.name] = job.signature
+                        self._write_state(completed)
+                        for child in downstream[job.name]:
+                            remaining[child] -= 1
+                            if remaining[child] == 0 and self._jobs[child].status == PENDING:
+                                heapq.heappush(ready, (-self._jobs[child].priority, next(counter), child))
+                    else:
+                        skip(job.name)
+                    cond.notify()
+
+        with cond:
+            while state["outstanding"] > 0:
+                deferred = []
+                while ready and state["active"] < self.nproc:
+                    item = heapq.heappop(ready)
+                    job = self._jobs[item[2]]
+                    if running.get(job.tool, 0) >= self.limits.get(job.tool, self.nproc):
+                        deferred.append(item)
+                        continue
+                    # Smaller jobs further down the queue may still fit
+                    elif self.admission is not None and not self.admission.acquire(job.resources):
+                        deferred.append(item)
+                        continue
+                    job.status = RUNNING
+                    running[job.tool] = running.get(job.tool, 0) + 1
+                    state["active"] += 1
+                    t = threading.Thread(target=work, args=(job, ))
+                    t.daemon = True
+                    t.start()
+                for item in deferred:
+                    heapq.heappush(ready, item)
+                if state["outstanding"] > 0:
+                    cond.wait()
+
+        return {name: self._jobs[name].status for name in self._order}
+
+    def _read_state(self):
+        if self.state_file and os.path.isfile(self.state_file):
+            with open(self.state_file, "r") as f_in:
+                return json.load(f_in)
+        return {}
+
+    def _write_state(self, completed):
+        if self.state_file:
+            tmp = self.state_file + ".tmp"
+            with open(tmp, "w") as f_out:
+                json.dump(completed, f_out, indent=1, sort_keys=True)
+            os.rename(tmp, self.state_file)
+
+    @staticmethod
+    def _invert(upstream):
+        downstream = {name: [] for name in upstream}
+        for name, deps in upstream.items():
+            for d in deps:
+                downstream[d].append(name)
+        return downstream
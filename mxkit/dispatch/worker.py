@@ -0,0 +1,207 @@
+"""Persistent shell workers for running many short command lines
+
+Description
+-----------
+Spawning a new process from Python for each command line is expensive compared to
+the runtime of very fast tools, e.g. TMscore on small models. A :obj:`ShellWorker`
+keeps a single shell alive and feeds it command lines over a pipe. The standard output
+of each command is delimited by a unique sentinel line carrying the exit status, and
+the standard error is redirected to a scratch file per worker. Each command runs in a
+subshell, so that changes of directory or environment do not affect later commands.
+A :obj:`ShellPool`
+distributes commands across several such workers.
+
+Examples
+--------
+>>> from mxkit.apps import tmscore
+>>> from mxkit.dispatch.worker import ShellPool
+>>> cmds = [tmscore.TMscoreCommandline(model=m, native="native.pdb") for m in models]
+>>> with ShellPool(nproc=4) as pool:
+...     results = pool.map(cmds)
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+import subprocess
+import tempfile
+import threading
+import uuid
+
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
+from mxkit.dispatch.backends import Result
+
+
+class ShellWorker(object):
+    """A single long-lived shell executing command lines sequentially"""
+
+    def __init__(self, shell="/bin/sh"):
+        """Initialise a new :obj:`ShellWorker`
+
+        Parameters
+        ----------
+        shell : str, optional
+           The POSIX shell to run the commands in [default: /bin/sh]
+
+        """
+        self.shell = shell
+        self._sentinel = "__MXKIT_{0}__".format(uuid.uuid4().hex)
+        fd, self._stderr_file = tempfile.mkstemp(prefix="mxkit_", suffix=".err")
+        os.close(fd)
+        self._proc = None
+        self._start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, cmdline):
+        """Execute a single command line in the shell
+
+        Parameters
+        ----------
+        cmdline : :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>`, str
+           The command line to execute
+
+        Returns
+        -------
+        :obj:`Result <mxkit.dispatch.backends.Result>`
+
+        Raises
+        ------
+        ValueError
+           The command line has :obj:`Buffer <mxkit.scratch.Buffer>` inputs
+
+        """
+        if hasattr(cmdline, "_as_list"):
+            cmdline._check_serializable()
+            command = " ".join(cmdline._as_list())
+        else:
+            command = str(cmdline)
+        # The subshell keeps the shell alive on syntax errors or an exit in the command line,
+        # and stops changes of directory or environment leaking into later commands
+        self._proc.stdin.write("( eval {0} ) < /dev/null 2> {1}\nprintf '\\n%s %d\\n' {2} $?\n".format(
+            quote(command), quote(self._stderr_file), self._sentinel))
+        self._proc.stdin.flush()
+
+        stdout = []
+        returncode = None
+        for line in iter(self._proc.stdout.readline, ""):
+            if line.startswith(self._sentinel):
+                returncode = int(line.split()[1])
+                break
+            stdout.append(line)
+
+        if returncode is None:
+            # The command terminated the shell itself, e.g. by calling exit
+            returncode = self._proc.wait()
+            self._start()
+        stdout = "".join(stdout)
+        if stdout.endswith("\n"):
+            stdout = stdout[:-1]
+        with open(self._stderr_file, "r") as f_in:
+            stderr = f_in.read()
+        return Result(command, returncode, stdout, stderr)
+
+    def close(self):
+        """Terminate the shell and remove the scratch file"""
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+            self._proc.stdout.close()
+            self._proc = None
+        if os.path.isfile(self._stderr_file):
+            os.unlink(self._stderr_file)
+
+    def _start(self):
+        self._proc = subprocess.Popen([self.shell], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      universal_newlines=True)
+
+
+class ShellPool(object):
+    """A pool of :obj:`ShellWorker` instances fed from a shared queue"""
+
+    def __init__(self, nproc=1, shell="/bin/sh"):
+        """Initialise a new :obj:`ShellPool`
+
+        Parameters
+        ----------
+        nproc : int, optional
+           The number of shells to keep alive [default: 1]
+        shell : str, optional
+           The POSIX shell to run the commands in [default: /bin/sh]
+
+        """
+        if nproc < 1:
+            raise ValueError("At least one worker is required")
+        self.workers = [ShellWorker(shell=shell) for _ in range(nproc)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def map(self, cmdlines):
+        """Execute all command lines across the pool
+
+        Parameters
+        ----------
+        cmdlines : list, tuple, generator
+           The :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>` instances or command strings
+
+        Returns
+        -------
+        list
+           A :obj:`Result <mxkit.dispatch.backends.Result>` per command in submission order
+
+        Raises
+        ------
+        ValueError
+           A command line has :obj:`Buffer <mxkit.scratch.Buffer>` inputs
+
+        """
+        cmdlines = list(cmdlines)
+        for cmdline in cmdlines:
+            if hasattr(cmdline, "_check_serializable"):
+                cmdline._check_serializable()
+        results = [None] * len(cmdlines)
+        errors = []
+        position = iter(range(len(cmdlines)))
+        lock = threading.Lock()
+
+        def work(worker):
+            while True:
+                with lock:
+                    i = None if errors else next(position, None)
+                if i is None:
+                    break
+                try:
+                    results[i] = worker.execute(cmdlines[i])
+                except Exception as e:
+                    # Re-raised by map instead of leaving a gap in the results
+                    with lock:
+                        errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(w, )) for w in self.workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def close(self):
+        """Terminate all shells in the pool"""
+        for worker in self.workers:
+            worker.close()
@@ -0,0 +1,10 @@
+"""Lightweight readers and writers for structure and reflection files
+
+The modules in this package avoid building full object models of the files
+and instead expose the parts needed for bulk processing as NumPy arrays.
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
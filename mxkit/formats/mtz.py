@@ -0,0 +1,241 @@
+"""Pure-Python access to MTZ reflection files
+
+Description
+-----------
+Planning Molrep, Phaser or Refmac jobs requires the unit cell, space group, resolution
+and column labels of the input reflection file. :func:`read_header` obtains them by
+seeking straight to the header records at the end of the file, so only a few kilobytes
+are read regardless of the number of reflections.
+
+:obj:`MtzReflections` memory-maps the reflection block and exposes each column as a
+NumPy view, so data are only read from disk when they are accessed.
+
+The layout follows the MTZ format definition of CCP4: a 20-word preamble holding the
+file stamp, the position of the header and the machine stamp, followed by the
+reflections as 32-bit floats in rows of ``NCOL`` columns, followed by the header as
+80-character records.
+
+Examples
+--------
+>>> from mxkit.formats.mtz import MtzReflections, read_header
+>>> header = read_header("data.mtz")
+>>> header.space_group, header.resolution
+('P 21 21 21', (45.1, 1.8))
+>>> fobs = MtzReflections("data.mtz")["FP"]
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import math
+import shlex
+import struct
+
+import numpy as np
+
+# The reflection block starts after the 20-word preamble
+_DATA_OFFSET = 80
+_RECORD_LENGTH = 80
+
+
+class MtzColumn(object):
+    """A column of an MTZ file"""
+
+    __slots__ = ['label', 'type', 'min', 'max', 'dataset']
+
+    def __init__(self, label, type, min, max, dataset):
+        self.label = label
+        self.type = type
+        self.min = min
+        self.max = max
+        self.dataset = dataset
+
+    def __repr__(self):
+        return "{0}(label={1}, type={2})".format(self.__class__.__name__, self.label, self.type)
+
+
+class MtzHeader(object):
+    """The header of an MTZ file
+
+    Attributes
+    ----------
+    title : str
+    ncol : int
+       The number of columns
+    nref : int
+       The number of reflections
+    nbatch : int
+       The number of batches
+    cell : tuple
+       The global unit cell ``(a, b, c, alpha, beta, gamma)``
+    space_group : str
+    space_group_number : int
+    symmetry_operators : list
+    resolution : tuple
+       The lowest and highest resolution in Angstrom
+    columns : list
+       The :obj:`MtzColumn` objects in file order
+    datasets : dict
+       The ``(project, crystal, dataset)`` names per dataset identifier
+    missing : float
+       The value flagging missing data, NaN by default
+    byteorder : str
+       The NumPy byte order character of the file
+
+    """
+
+    def __init__(self):
+        self.title = ""
+        self.ncol = self.nref = self.nbatch = 0
+        self.cell = None
+        self.space_group = None
+        self.space_group_number = None
+        self.symmetry_operators = []
+        self.resolution = None
+        self.columns = []
+        self.datasets = {}
+        self.missing = float('nan')
+        self.byteorder = "<"
+
+    def __repr__(self):
+        return "{0}(space_group={1}, cell={2}, nref={3}, columns={4})".format(
+            self.__class__.__name__, self.space_group, self.cell, self.nref, self.labels)
+
+    @property
+    def labels(self):
+        """The column labels in file order"""
+        return [c.label for c in self.columns]
+
+    def column(self, label):
+        """Return the index of a column by its label"""
+        for i, c in enumerate(self.columns):
+            if c.label == label:
+                return i
+        raise ValueError("Column not found: {0}".format(label))
+
+
+def _preamble(f_in, path):
+    """Return the byte order and the byte offset of the header"""
+    preamble = f_in.read(20)
+    if len(preamble) < 20 or preamble[:4] != b"MTZ ":
+        raise ValueError("Not an MTZ file: {0}".format(path))
+    # The upper nibble of the first machine stamp byte encodes the float format
+    byteorder = ">" if (bytearray(preamble[8:9])[0] >> 4) == 1 else "<"
+    position = struct.unpack(byteorder + "i", preamble[4:8])[0]
+    if position == -1:
+        # Files larger than 8 GB store a 64-bit position after the machine stamp
+        position = struct.unpack(byteorder + "q", preamble[12:20])[0]
+    if position < 1:
+        raise ValueError("Invalid MTZ header position: {0}".format(path))
+    return byteorder, (position - 1) * 4
+
+
+def read_header(path):
+    """Read the header of an MTZ file without reading any reflections
+
+    Parameters
+    ----------
+    path : str
+       The path to the MTZ file
+
+    Returns
+    -------
+    :obj:`MtzHeader`
+
+    Raises
+    ------
+    ValueError
+       The file is not an MTZ file or its header is incomplete
+
+    """
+    header = MtzHeader()
+    with open(path, "rb") as f_in:
+        header.byteorder, offset = _preamble(f_in, path)
+        f_in.seek(offset)
+        datasets = {}
+        while True:
+            record = f_in.read(_RECORD_LENGTH)
+            if len(record) < 4:
+                raise ValueError("MTZ header is not terminated: {0}".format(path))
+            record = record.decode("ascii", "replace").rstrip()
+            keyword, _, value = record.partition(" ")
+            keyword = keyword[:4].upper()
+            value = value.strip()
+            if keyword in ("END", "MTZE"):
+                break
+            elif keyword == "TITL":
+                header.title = value
+            elif keyword == "NCOL":
+                fields = value.split()
+                header.ncol, header.nref, header.nbatch = int(fields[0]), int(fields[1]), int(fields[2])
+            elif keyword == "CELL":
+                header.cell = tuple(float(x) for x in value.split()[:6])
+            elif keyword == "SYMI":
+                fields = shlex.split(value)
+                header.space_group_number = int(fields[3])
+                header.space_group = fields[4]
+            elif keyword == "SYMM":
+                header.symmetry_operators.append(value)
+            elif keyword == "RESO":
+                # Stored as 1/d**2 of the lowest and highest resolution reflection
+                low, high = (float(x) for x in value.split()[:2])
+                header.resolution = (1.0 / math.sqrt(low) if low > 0 else float('inf'),
+                                     1.0 / math.sqrt(high) if high > 0 else float('inf'))
+            elif keyword == "VALM":
+                header.missing = float('nan') if value.upper() == "NAN" else float(value)
+            elif keyword == "COLU":
+                fields = value.split()
+                header.columns.append(MtzColumn(fields[0], fields[1], float(fields[2]), float(fields[3]),
+                                                int(fields[4]) if len(fields) > 4 else 0))
+            elif keyword in ("PROJ", "CRYS", "DATA"):
+                fields = value.split(None, 1)
+                names = datasets.setdefault(int(fields[0]), ["", "", ""])
+                names[("PROJ", "CRYS", "DATA").index(keyword)] = fields[1].strip() if len(fields) > 1 else ""
+        header.datasets = dict((k, tuple(v)) for k, v in datasets.items())
+    if header.ncol != len(header.columns):
+        raise ValueError("MTZ header declares {0} columns but lists {1}: {2}".format(
+            header.ncol, len(header.columns), path))
+    return header
+
+
+class MtzReflections(object):
+    """Memory-mapped reflection data of an MTZ file
+
+    Columns are returned as read-only NumPy views of the file; missing values are
+    reported as stored, i.e. as :attr:`MtzHeader.missing`.
+
+    """
+
+    def __init__(self, path, header=None):
+        """Initialise a new :obj:`MtzReflections`
+
+        Parameters
+        ----------
+        path : str
+           The path to the MTZ file
+        header : :obj:`MtzHeader`, optional
+           The header of the file, read if not provided
+
+        """
+        self.path = path
+        self.header = header or read_header(path)
+        shape = (self.header.nref, self.header.ncol)
+        if self.header.nref and self.header.ncol:
+            self.data = np.memmap(path, dtype=self.header.byteorder + "f4", mode="r", offset=_DATA_OFFSET,
+                                  shape=shape)
+        else:
+            self.data = np.zeros(shape, dtype=np.float32)
+
+    def __len__(self):
+        return self.header.nref
+
+    def __getitem__(self, label):
+        """Return a column by its label"""
+        return self.data[:, self.header.column(label)]
+
+    def miller_indices(self):
+        """Return the Miller indices as an integer array with shape ``(nref, 3)``"""
+        idx = [self.header.column(label) for label in ("H", "K", "L")]
+        return self.data[:, idx].astype(np.int32)
@@ -0,0 +1,225 @@
+"""Fast access to the C-alpha trace of PDB files
+
+Description
+-----------
+Many bulk operations, e.g. structural descriptors or model quality scores, only need
+the C-alpha coordinates of a structure. :func:`read_ca` extracts them from the first
+model of a PDB file with a single pass over its lines, without building a full
+structure hierarchy. Gzip-compressed files are read transparently.
+
+:obj:`CoordinateTemplate` writes transformed copies of a PDB file, e.g. models
+superposed with the rotation matrix of TMalign, by substituting only the coordinate
+columns of the original lines.
+
+Examples
+--------
+>>> from mxkit.formats.pdb import read_ca
+>>> trace = read_ca("model.pdb")
+>>> trace.coords.shape
+(120, 3)
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import collections
+import gzip
+
+import numpy as np
+
+
+class CaTrace(object):
+    """The C-alpha atoms of a structure
+
+    Attributes
+    ----------
+    chain : :obj:`numpy.ndarray`
+       The chain identifier per residue
+    resseq : :obj:`numpy.ndarray`
+       The residue sequence number per residue
+    icode : :obj:`numpy.ndarray`
+       The insertion code per residue
+    resname : :obj:`numpy.ndarray`
+       The residue name per residue
+    coords : :obj:`numpy.ndarray`
+       The coordinates with shape ``(n, 3)``
+
+    """
+
+    __slots__ = ['chain', 'resseq', 'icode', 'resname', 'coords']
+
+    def __init__(self, chain, resseq, icode, resname, coords):
+        self.chain = np.asarray(chain)
+        self.resseq = np.asarray(resseq, dtype=np.int32)
+        self.icode = np.asarray(icode)
+        self.resname = np.asarray(resname)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def __repr__(self):
+        return "{0}(residues={1}, chains={2})".format(
+            self.__class__.__name__, len(self), "".join(sorted(set(self.chain.tolist()))))
+
+
+def open_structure(path, mode="r"):
+    """Open a structure file in text mode, decompressing ``.gz`` files on the fly"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t")
+    return open(path, mode)
+
+
+def read_ca(path, chains=None):
+    """Read the C-alpha atoms of the first model of a PDB file
+
+    Only the first alternate location of each atom is used.
+
+    Parameters
+    ----------
+    path : str
+       The path to the PDB file, optionally gzip-compressed
+    chains : list, tuple, str, optional
+       Restrict the trace to these chain identifiers
+
+    Returns
+    -------
+    :obj:`CaTrace`
+
+    """
+    chain, resseq, icode, resname, coords = [], [], [], [], []
+    seen = set()
+    with open_structure(path) as f_in:
+        for line in f_in:
+            record = line[:6]
+            if record == "ENDMDL":
+                break
+            elif record not in ("ATOM  ", "HETATM") or line[12:16] != " CA ":
+                continue
+            elif chains is not None and line[21] not in chains:
+                continue
+            key = (line[21], line[22:26], line[26])
+            if key in seen:
+                continue
+            seen.add(key)
+            chain.append(line[21])
+            resseq.append(int(line[22:26]))
+            icode.append(line[26].strip())
+            resname.append(line[17:20])
+            coords.append((float(line[30:38]), float(line[38:46]), float(line[46:54])))
+    return CaTrace(chain, resseq, icode, resname, coords)
+
+
+def transform(coords, rotation=None, translation=None):
+    """Apply ``x' = R x + t`` to coordinates with shape ``(..., 3)``"""
+    coords = np.asarray(coords, dtype=np.float64)
+    if rotation is not None:
+        coords = np.matmul(coords, np.asarray(rotation, dtype=np.float64).T)
+    if translation is not None:
+        coords = coords + np.asarray(translation, dtype=np.float64)
+    return coords
+
+
+class CoordinateTemplate(object):
+    """The lines of a PDB file with replaceable atom coordinates
+
+    The file is parsed once; every call to :meth:`format` or :meth:`write` only
+    substitutes the coordinate columns of the atom records and leaves all other
+    columns and lines untouched.
+
+    Examples
+    --------
+    >>> template = CoordinateTemplate("model.pdb")
+    >>> for i, (rotation, translation) in enumerate(transforms):
+    ...     template.write("superposed_{0}.pdb".format(i), rotation, translation)
+
+    """
+
+    __slots__ = ['coords', '_format']
+
+    def __init__(self, path):
+        """Initialise a new :obj:`CoordinateTemplate`
+
+        Parameters
+        ----------
+        path : str
+           The path to the PDB file, optionally gzip-compressed
+
+        """
+        segments, coords = [], []
+        with open_structure(path) as f_in:
+            for line in f_in:
+                if line[:6] in ("ATOM  ", "HETATM"):
+                    coords.append((float(line[30:38]), float(line[38:46]), float(line[46:54])))
+                    segments.append(line[:30].replace("%", "%%") + "%8.3f%8.3f%8.3f" + line[54:].replace("%", "%%"))
+                else:
+                    segments.append(line.replace("%", "%%"))
+        # A single format string substitutes all coordinates in one operation
+        self._format = "".join(segments)
+        self.coords = np.array(coords, dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def format(self, coords):
+        """Return the file content with the atom coordinates replaced
+
+        Raises
+        ------
+        ValueError
+           The coordinates do not match the atoms or exceed the PDB column width
+
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.shape != self.coords.shape:
+            raise ValueError("Expected coordinates with shape {0}".format(self.coords.shape))
+        elif coords.size and (coords.max() >= 9999.9995 or coords.min() <= -999.9995):
+            raise ValueError("Coordinates exceed the width of the PDB coordinate columns")
+        return self._format % tuple(coords.ravel().tolist())
+
+    def write(self, path, rotation=None, translation=None):
+        """Write the file with its atom coordinates transformed, see :func:`transform`"""
+        content = self.format(transform(self.coords, rotation, translation))
+        with open(path, "w") as f_out:
+            f_out.write(content)
+        return path
+
+
+def write_superposed(jobs, cache=64):
+    """Write superposed copies of PDB files in bulk
+
+    Parameters
+    ----------
+    jobs : list, tuple, generator
+       The ``(source, destination, rotation, translation)`` tuples; jobs are best grouped
+       by source, as each source file is only parsed once while among the ``cache`` most
+       recently used ones
+    cache : int, optional
+       The maximum number of parsed source files kept in memory [default: 64]
+
+    Returns
+    -------
+    list
+       The destination paths
+
+    Raises
+    ------
+    ValueError
+       The cache holds fewer than one source file
+
+    """
+    if cache < 1:
+        raise ValueError("The cache must hold at least one source file")
+    templates = collections.OrderedDict()
+    written = []
+    for source, destination, rotation, translation in jobs:
+        template = templates.pop(source, None)
+        if template is None:
+            template = CoordinateTemplate(source)
+            while len(templates) >= cache:
+                templates.popitem(last=False)
+        templates[source] = template
+        written.append(template.write(destination, rotation, translation))
+    return written
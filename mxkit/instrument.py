@@ -0,0 +1,266 @@
+"""Instrumentation of command line wrapper invocations
+
+Description
+-----------
+Every call of an :obj:`AbstractCommandline <mxkit.apps.AbstractCommandline>` produces a
+:obj:`Record` holding the time spent on building the command line and looking up the
+executable, the wall clock and CPU times of the child process, its peak resident set
+size, the bytes it read and wrote, and its exit status. Records are only assembled
+if at least one sink has been registered with :func:`add_sink`.
+
+The block I/O counters are taken from :func:`os.wait4` and thus only count I/O that
+reached the block layer; they are reported in bytes assuming 512-byte blocks.
+
+Examples
+--------
+>>> from mxkit import instrument
+>>> from mxkit.apps import tmscore
+>>> aggregator = instrument.add_sink(instrument.Aggregator())
+>>> instrument.add_sink(instrument.JsonLinesSink("runs.jsonl"))
+>>> stdout, stderr = tmscore.TMscoreCommandline(model="model.pdb", native="native.pdb")()
+>>> print(aggregator.report())
+tool                        runs  failed    wall [s]    user [s]     sys [s]  max rss [kB]
+TMscoreCommandline             1       0       0.012       0.008       0.003          2816
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+__all__ = ['Record', 'Aggregator', 'JsonLinesSink', 'PrometheusSink', 'add_sink', 'remove_sink', 'summarize']
+
+import json
+import os
+import threading
+import time
+
+_sinks = []
+
+try:
+    now = time.perf_counter
+except AttributeError:
+    now = time.time
+
+
+class Record(object):
+    """The measurements of a single command line invocation
+
+    Attributes
+    ----------
+    tool : str
+       The name of the command line wrapper class
+    command : str
+       The command line executed
+    returncode : int
+       The exit status of the child process
+    argv_time : float
+       The seconds spent on constructing the command line
+    lookup_time : float
+       The seconds spent on locating the executable
+    wall_time : float
+       The wall clock seconds from spawning to reaping the child process
+    user_time : float, None
+       The user CPU seconds of the child process
+    sys_time : float, None
+       The system CPU seconds of the child process
+    max_rss : int, None
+       The peak resident set size of the child process in kilobytes
+    read_bytes : int, None
+       The bytes read by the child process from the block layer
+    write_bytes : int, None
+       The bytes written by the child process to the block layer
+    input_bytes : int
+       The combined size of all input files
+    input_files : list
+       The paths to all input files
+    timestamp : float
+       The time the child process was started
+
+    """
+
+    __slots__ = ['tool', 'command', 'returncode', 'argv_time', 'lookup_time', 'wall_time', 'user_time', 'sys_time',
+                 'max_rss', 'read_bytes', 'write_bytes', 'input_bytes', 'input_files', 'timestamp']
+
+    def __init__(self, **kwargs):
+        for k in self.__slots__:
+            setattr(self, k, kwargs.get(k))
+
+    def __repr__(self):
+        return "{0}(tool={1}, returncode={2}, wall_time={3:.3f})".format(
+            self.__class__.__name__, self.tool, self.returncode, self.wall_time)
+
+    def as_dict(self):
+        """Return the measurements as :obj:`dict`"""
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class Sink(object):
+    """Abstract destination for :obj:`Record` instances"""
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class Aggregator(Sink):
+    """Keep all records in memory and summarise them per tool"""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self):
+        """Return the per-tool summary of all records, see :func:`summarize`"""
+        with self._lock:
+            return summarize(self.records)
+
+    def report(self):
+        """Return the per-tool summary as formatted table"""
+        lines = ["{0:<24} {1:>7} {2:>7} {3:>11} {4:>11} {5:>11} {6:>13}".format(
+            "tool", "runs", "failed", "wall [s]", "user [s]", "sys [s]", "max rss [kB]")]
+        for tool, s in sorted(self.summary().items()):
+            lines.append("{0:<24} {1:>7d} {2:>7d} {3:>11.3f} {4:>11.3f} {5:>11.3f} {6:>13d}".format(
+                tool, s['runs'], s['failed'], s['wall_time'], s['user_time'], s['sys_time'], s['max_rss']))
+        return "\n".join(lines)
+
+
+class JsonLinesSink(Sink):
+    """Append each record as a single JSON line to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record.as_dict(), sort_keys=True)
+        with self._lock:
+            with open(self.path, "a") as f_out:
+                f_out.write(line + "\n")
+
+    @staticmethod
+    def read(path):
+        """Read all records from a JSON lines file
+
+        Returns
+        -------
+        list
+           The :obj:`Record` instances in the order they were written
+
+        """
+        with open(path, "r") as f_in:
+            return [Record(**json.loads(line)) for line in f_in if line.strip()]
+
+
+class PrometheusSink(Sink):
+    """Maintain per-tool counters in a Prometheus text exposition file
+
+    The file is rewritten atomically after every record, which makes it suitable
+    for the textfile collector of the Prometheus node exporter.
+
+    """
+
+    def __init__(self, path, prefix="mxkit"):
+        self.path = path
+        self.prefix = prefix
+        self._summary = {}
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            _accumulate(self._summary, record)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f_out:
+                f_out.write(self._format(self._summary))
+            os.rename(tmp, self.path)
+
+    def _format(self, summary):
+        metrics = [
+            ('runs_total', 'counter', 'Number of invocations', 'runs'),
+            ('failures_total', 'counter', 'Number of invocations with non-zero exit status', 'failed'),
+            ('wall_seconds_total', 'counter', 'Wall clock seconds of the child processes', 'wall_time'),
+            ('user_seconds_total', 'counter', 'User CPU seconds of the child processes', 'user_time'),
+            ('sys_seconds_total', 'counter', 'System CPU seconds of the child processes', 'sys_time'),
+            ('read_bytes_total', 'counter', 'Bytes read by the child processes', 'read_bytes'),
+            ('write_bytes_total', 'counter', 'Bytes written by the child processes', 'write_bytes'),
+            ('max_rss_kilobytes', 'gauge', 'Peak resident set size of any child process', 'max_rss'),
+        ]
+        lines = []
+        for name, kind, doc, key in metrics:
+            name = "{0}_{1}".format(self.prefix, name)
+            lines.append("# HELP {0} {1}".format(name, doc))
+            lines.append("# TYPE {0} {1}".format(name, kind))
+            for tool, s in sorted(summary.items()):
+                lines.append('{0}{{tool="{1}"}} {2}'.format(name, tool, s[key]))
+        return "\n".join(lines) + "\n"
+
+
+def add_sink(sink):
+    """Register a sink to receive the :obj:`Record` of every invocation
+
+    Returns
+    -------
+    :obj:`Sink`
+       The registered sink
+
+    """
+    if sink not in _sinks:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    """Unregister and close a previously registered sink"""
+    if sink in _sinks:
+        _sinks.remove(sink)
+        sink.close()
+
+
+def enabled():
+    """Check whether any sink is registered"""
+    return bool(_sinks)
+
+
+def emit(record):
+    """Pass a :obj:`Record` to all registered sinks"""
+    for sink in list(_sinks):
+        sink.write(record)
+
+
+def summarize(records):
+    """Summarise records per tool
+
+    Parameters
+    ----------
+    records : list, tuple
+       The :obj:`Record` instances to summarise
+
+    Returns
+    -------
+    dict
+       A mapping of tool name to the number of runs and failures, the summed times
+       and I/O counters, and the maximum peak resident set size
+
+    """
+    summary = {}
+    for r in records:
+        _accumulate(summary, r)
+    return summary
+
+
+def _accumulate(summary, r):
+    s = summary.setdefault(r.tool, {
+        'runs': 0, 'failed': 0, 'argv_time': 0.0, 'lookup_time': 0.0, 'wall_time': 0.0, 'user_time': 0.0,
+        'sys_time': 0.0, 'read_bytes': 0, 'write_bytes': 0, 'max_rss': 0,
+    })
+    s['runs'] += 1
+    s['failed'] += int(r.returncode != 0)
+    for k in ('argv_time', 'lookup_time', 'wall_time', 'user_time', 'sys_time', 'read_bytes', 'write_bytes'):
+        s[k] += getattr(r, k) or 0
+    s['max_rss'] = max(s['max_rss'], r.max_rss or 0)
@@ -0,0 +1,210 @@
+"""Version and capability probes of executables
+
+Description
+-----------
+Different versions of the same program often differ in their command line flags, e.g.
+``mkdssp`` 2 takes its files through ``-i`` and ``-o`` whereas version 4 takes them as
+positional arguments. Wrappers select their flags from the :obj:`Capabilities` of the
+executable, which are determined by running it once with its version or help flags
+and extracting the version number and all flags mentioned in the output.
+
+Probes are kept in a :obj:`ProbeCache` keyed by the resolved path, modification time
+and size of the executable, so that each installed version is only probed once. The
+cache is persisted as a JSON file shared by all processes, by default
+``$XDG_CACHE_HOME/mxkit/probes.json``, or the path in the ``MXKIT_PROBE_CACHE``
+environment variable.
+
+Examples
+--------
+>>> from mxkit.apps import dssp
+>>> capabilities = dssp.DsspCommandline(input="model.pdb", output="model.dssp").capabilities()
+>>> print(capabilities.version, capabilities.major)
+4.4.0 4
+>>> "--output-format" in capabilities.flags
+True
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+_VERSION = re.compile(r"\bversion\b\W*(\d[\w.-]*\w)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b(\d+(?:\.\d+)+)\b")
+_FLAG = re.compile(r"(?<![\w-])(--?[A-Za-z][\w-]*)")
+
+
+class Capabilities(object):
+    """The version and supported flags of an executable"""
+
+    __slots__ = ['path', 'version', 'flags']
+
+    def __init__(self, path, version=None, flags=()):
+        self.path = path
+        self.version = version
+        self.flags = frozenset(flags)
+
+    def __repr__(self):
+        return "{0}(path={1!r}, version={2!r}, flags={3})".format(
+            self.__class__.__name__, self.path, self.version, len(self.flags))
+
+    @property
+    def major(self):
+        """The major version number, or None if the version is unknown"""
+        match = re.match(r"\d+", self.version or "")
+        return int(match.group(0)) if match else None
+
+    def supports(self, flag):
+        """Check whether a flag is mentioned in the output of the probe"""
+        return flag in self.flags
+
+
+def parse(output):
+    """Extract the version and the flags mentioned in the output of a program
+
+    Returns
+    -------
+    tuple
+       The first version number, or None, and the sorted list of flags
+
+    """
+    match = _VERSION.search(output) or _NUMBER.search(output)
+    return match.group(1) if match else None, sorted(set(_FLAG.findall(output)))
+
+
+def _default_path():
+    path = os.environ.get("MXKIT_PROBE_CACHE")
+    if path:
+        return path
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "mxkit", "probes.json")
+
+
+class ProbeCache(object):
+    """Persistent cache of executable probes"""
+
+    def __init__(self, path=None, timeout=10.0):
+        """Initialise a new :obj:`ProbeCache`
+
+        Parameters
+        ----------
+        path : str, optional
+           The path to the JSON file persisting the probes, or an empty string to only
+           keep them in memory [default: see module description]
+        timeout : float, optional
+           The seconds after which a probe is killed [default: 10]
+
+        """
+        self.path = _default_path() if path is None else path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._probes = self._read()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._probes)
+
+    def probe(self, executable, args=("--version", )):
+        """Return the :obj:`Capabilities` of an executable
+
+        Parameters
+        ----------
+        executable : str
+           The path to the executable, e.g. as returned by
+           :meth:`AbstractCommandline.find_exec <mxkit.apps.AbstractCommandline.find_exec>`
+        args : list, tuple, optional
+           The arguments printing the version and flags of the executable
+
+        """
+        path = os.path.realpath(executable)
+        stat = os.stat(path)
+        args = list(args)
+        key = "\t".join([path] + args)
+        with self._lock:
+            entry = self._probes.get(key)
+        if entry is None or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size:
+            version, flags = parse(self._run(path, args))
+            entry = {'mtime': stat.st_mtime, 'size': stat.st_size, 'version': version, 'flags': flags,
+                     'timestamp': time.time()}
+            with self._lock:
+                self._probes[key] = entry
+            self._write(key, entry)
+        return Capabilities(path, entry['version'], entry['flags'])
+
+    def clear(self):
+        """Forget all probes"""
+        with self._lock:
+            self._probes = {}
+            if self.path and os.path.isfile(self.path):
+                os.remove(self.path)
+
+    def _run(self, path, args):
+        try:
+            process = subprocess.Popen([path] + args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, universal_newlines=True)
+        except OSError:
+            return ""
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            output, _ = process.communicate("")
+        finally:
+            timer.cancel()
+        return output or ""
+
+    def _read(self):
+        if not self.path or not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f_in:
+                return json.load(f_in)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, key, entry):
+        if not self.path:
+            return
+        with self._lock:
+            # Merge probes written by other processes in the meantime
+            probes = self._read()
+            probes[key] = entry
+            self._probes.update(probes)
+            directory = os.path.dirname(self.path)
+            try:
+                if directory and not os.path.isdir(directory):
+                    os.makedirs(directory)
+                tmp = "{0}.{1}.tmp".format(self.path, os.getpid())
+                with open(tmp, "w") as f_out:
+                    json.dump(probes, f_out, indent=1, sort_keys=True)
+                os.rename(tmp, self.path)
+            except (IOError, OSError):
+                # The cache is an optimisation, probes are repeated if it cannot be written
+                pass
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Return the :obj:`ProbeCache` used by the command line wrappers"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ProbeCache()
+        return _default_cache
+
+
+def set_default_cache(cache):
+    """Replace the :obj:`ProbeCache` used by the command line wrappers"""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
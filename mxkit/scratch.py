@@ -0,0 +1,388 @@
+"""Scratch files for command line wrapper inputs
+
+Description
+-----------
+Most wrapped programs can only read plain files, whereas model archives are usually
+compressed. When a wrapper is called with a ``.gz``, ``.bz2`` or ``.xz`` file in one of
+its ``filename=True`` input parameters, the file is decompressed on demand and the
+program is given the decompressed copy instead.
+
+Decompressed copies are kept in a :obj:`DecompressionCache` shared by all calls of
+this process. Concurrent calls needing the same archive wait for a single
+decompression and share the copy; copies are reference counted and only evicted once
+no running call uses them and the cache exceeds its size limit. Copies are named
+after the path, modification time and size of the archive and are written atomically.
+The references are only counted within a process, so a cache directory must not be
+used by several processes at the same time.
+
+Inputs generated in memory, such as trimmed models, Spicker ``tra.in`` files or Molrep
+keyword files, are passed to ``filename=True`` parameters as a :obj:`Buffer`. For the
+duration of the call, the buffer is exposed as a file in a memory-backed file system
+(``/dev/shm`` where available), or, for programs known to read it sequentially, as a
+named pipe (FIFO) fed by a :obj:`Fifo` thread. Files and pipes are removed once the
+program has finished.
+
+Examples
+--------
+>>> from mxkit import scratch
+>>> cache = scratch.DecompressionCache(max_bytes=2 ** 30)
+>>> scratch.set_default_cache(cache)
+
+>>> from mxkit.apps import molrep
+>>> keywords = scratch.Buffer("NMON 2\\nNP 5\\n", name="keywords.txt", fifo=True)
+>>> molrep.MolrepCommandline(hklin="data.mtz", xyzin="model.pdb", keyin=keywords)()
+
+"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import atexit
+import bz2
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+#: The suffixes of files decompressed for wrapped programs
+COMPRESSED = ('.gz', '.bz2', '.xz')
+
+_CHUNK_SIZE = 1 << 20
+
+_SHM = "/dev/shm"
+
+
+def is_compressed(path):
+    """Check whether a path refers to a compressed file by its suffix"""
+    return isinstance(path, str) and path.endswith(COMPRESSED)
+
+
+def open_compressed(path):
+    """Open a compressed file for reading its decompressed bytes"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    elif path.endswith(".bz2"):
+        return bz2.BZ2File(path, "rb")
+    elif path.endswith(".xz"):
+        import lzma
+        return lzma.open(path, "rb")
+    raise ValueError("Unknown compression: {0}".format(path))
+
+
+def _plain_name(path):
+    """Return the file name of a compressed file without the compression suffix"""
+    name = os.path.basename(path)
+    for suffix in COMPRESSED:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class DecompressionCache(object):
+    """Reference-counted cache of decompressed copies of compressed files"""
+
+    def __init__(self, directory=None, max_bytes=1 << 30):
+        """Initialise a new :obj:`DecompressionCache`
+
+        Parameters
+        ----------
+        directory : str, optional
+           The directory holding the decompressed copies [default: a new temporary directory]
+        max_bytes : int, optional
+           The size beyond which unused copies are evicted [default: 1 GiB]
+
+        """
+        self._owned = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="mxkit_scratch_")
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Per copy: [reference count, size in bytes, event set once the copy exists]
+        self._entries = {}
+        self._idle = []
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _target(self, path):
+        stat = os.stat(path)
+        key = "{0}\0{1}\0{2}".format(os.path.abspath(path), stat.st_mtime, stat.st_size)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, digest, _plain_name(path))
+
+    def acquire(self, path):
+        """Return the path to a decompressed copy of a file and hold a reference to it
+
+        Raises
+        ------
+        IOError
+           The file cannot be read or decompressed
+
+        """
+        target = self._target(path)
+        with self._lock:
+            entry = self._entries.get(target)
+            if entry is not None:
+                entry[0] += 1
+                if target in self._idle:
+                    self._idle.remove(target)
+                owner = False
+            else:
+                entry = self._entries[target] = [1, 0, threading.Event()]
+                owner = True
+        if owner:
+            try:
+                entry[1] = self._decompress(path, target)
+            except Exception:
+                with self._lock:
+                    del self._entries[target]
+                entry[2].set()
+                raise
+            entry[2].set()
+            self._evict()
+        else:
+            entry[2].wait()
+            if not os.path.isfile(target):
+                with self._lock:
+                    entry[0] -= 1
+                raise IOError("Unable to decompress: {0}".format(path))
+        return target
+
+    def release(self, target):
+        """Drop a reference obtained by :meth:`acquire`"""
+        with self._lock:
+            entry = self._entries.get(target)
+            if entry is None:
+                return
+            entry[0] -= 1
+            if entry[0] <= 0:
+                self._idle.append(target)
+        self._evict()
+
+    def clear(self):
+        """Remove all unused copies, and the cache directory if it was created by the cache"""
+        with self._lock:
+            for target in self._idle:
+                self._remove(target)
+            self._idle = []
+            if self._owned and not self._entries:
+                shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _decompress(self, path, target):
+        if os.path.isfile(target):
+            # Left behind by an earlier session using the same cache directory
+            return os.path.getsize(target)
+        directory = os.path.dirname(target)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f_out, open_compressed(path) as f_in:
+                shutil.copyfileobj(f_in, f_out, _CHUNK_SIZE)
+            os.rename(tmp, target)
+        except Exception:
+            os.remove(tmp)
+            raise
+        return os.path.getsize(target)
+
+    def _evict(self):
+        with self._lock:
+            total = sum(entry[1] for entry in self._entries.values())
+            while self._idle and total > self.max_bytes:
+                target = self._idle.pop(0)
+                total -= self._entries[target][1]
+                self._remove(target)
+
+    def _remove(self, target):
+        self._entries.pop(target, None)
+        try:
+            os.remove(target)
+            os.rmdir(os.path.dirname(target))
+        except OSError:
+            pass
+
+
+class Fifo(object):
+    """A named pipe fed with data by a background thread
+
+    The writer blocks until the program opens the pipe. :meth:`close` unblocks the
+    writer if the program exited without reading all data, and removes the pipe.
+
+    """
+
+    def __init__(self, chunks, name="input", directory=None):
+        """Initialise a new :obj:`Fifo`
+
+        Parameters
+        ----------
+        chunks : callable
+           A callable returning an iterable of :obj:`bytes` chunks to write
+        name : str, optional
+           The file name of the pipe, e.g. to retain an extension the program expects
+        directory : str, optional
+           The directory to create the pipe in [default: a new temporary directory]
+
+        """
+        if not hasattr(os, "mkfifo"):
+            raise RuntimeError("Named pipes are not supported on this platform")
+        self._directory = tempfile.mkdtemp(prefix="mxkit_fifo_", dir=directory)
+        self.path = os.path.join(self._directory, name)
+        os.mkfifo(self.path)
+        self.error = None
+        self._chunks = chunks
+        self._thread = threading.Thread(target=self._write)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _write(self):
+        try:
+            with open(self.path, "wb") as f_out:
+                for chunk in self._chunks():
+                    f_out.write(chunk)
+        except (IOError, OSError) as e:
+            # The reader closed the pipe early
+            self.error = e
+
+    def close(self):
+        """Unblock and join the writer and remove the pipe"""
+        if self._thread.is_alive():
+            try:
+                # Opening the read end releases a writer still waiting for a reader
+                fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+                try:
+                    while self._thread.is_alive():
+                        try:
+                            if not os.read(fd, _CHUNK_SIZE):
+                                self._thread.join(0.01)
+                        except OSError:
+                            self._thread.join(0.01)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+            self._thread.join()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+class Buffer(str):
+    """In-memory content passed to a wrapper in place of an input file
+
+    The buffer is a :obj:`str` of its file name, so that wrappers format and
+    validate it like any other file path. It only exists as a file while the wrapper
+    is called, so it is not reported by :meth:`filenames
+    <mxkit.apps.AbstractCommandline.filenames>`, and command lines holding a buffer
+    cannot be run through :mod:`mxkit.dispatch`.
+
+    """
+
+    def __new__(cls, data, name="input", fifo=False):
+        """Create a new :obj:`Buffer`
+
+        Parameters
+        ----------
+        data : str, bytes, iterable, callable
+           The content, an iterable of content chunks, or a callable returning such an
+           iterable; iterators other than those returned by a callable can only be
+           used for a single call
+        name : str, optional
+           The file name exposed to the program, e.g. to retain an extension it expects
+        fifo : bool, optional
+           Whether to pass the content through a named pipe rather than a file, for
+           programs known to read it once and sequentially [default: False]
+
+        """
+        if os.path.basename(name) != name or not name:
+            raise ValueError("Buffer name must be a plain file name: {0}".format(name))
+        buffer = str.__new__(cls, name)
+        buffer.data = data
+        buffer.fifo = fifo
+        return buffer
+
+    def chunks(self):
+        """Yield the content of the buffer as :obj:`bytes`"""
+        data = self.data() if callable(self.data) else self.data
+        if isinstance(data, (str, bytes)):
+            data = [data]
+        for chunk in data:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    def open(self):
+        """Expose the buffer as a file
+
+        Returns
+        -------
+        :obj:`Fifo`, :obj:`ScratchFile`
+           The object providing the ``path`` to pass to the program, which is removed
+           by its ``close`` method
+
+        """
+        if self.fifo and hasattr(os, "mkfifo"):
+            return Fifo(self.chunks, name=str(self))
+        return ScratchFile(self.chunks(), name=str(self))
+
+
+class ScratchFile(object):
+    """A temporary file in a memory-backed file system where available"""
+
+    def __init__(self, chunks, name="input", directory=None):
+        """Initialise a new :obj:`ScratchFile`
+
+        Parameters
+        ----------
+        chunks : iterable
+           The :obj:`bytes` chunks to write
+        name : str, optional
+           The file name
+        directory : str, optional
+           The directory to create the file in [default: see :func:`scratch_dir`]
+
+        """
+        self._directory = tempfile.mkdtemp(prefix="mxkit_file_", dir=directory or scratch_dir())
+        self.path = os.path.join(self._directory, name)
+        try:
+            with open(self.path, "wb") as f_out:
+                f_out.writelines(chunks)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Remove the file"""
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+def scratch_dir():
+    """Return the memory-backed directory for scratch files, or None for the default temporary directory"""
+    if os.path.isdir(_SHM) and os.access(_SHM, os.W_OK | os.X_OK):
+        return _SHM
+    return None
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Return the :obj:`DecompressionCache` used by the command line wrappers"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = DecompressionCache()
+            atexit.register(_default_cache.clear)
+        return _default_cache
+
+
+def set_default_cache(cache):
+    """Replace the :obj:`DecompressionCache` used by the command line wrappers"""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
@@ -0,0 +1,69 @@
+"""Testing facility for mxkit.dispatch.backends"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from mxkit.dispatch.backends import LocalBackend, SlurmBackend
+
+
+class InlineSlurmBackend(SlurmBackend):
+    """Run the array tasks one after another on submission, the job leaving the queue afterwards"""
+
+    def submit(self):
+        ntasks = (self._ncommands + self.pack - 1) // self.pack
+        for task in range(1, ntasks + 1):
+            env = dict(os.environ, SLURM_ARRAY_TASK_ID=str(task))
+            subprocess.call(["bash", self.script], env=env, cwd=self.directory)
+        self._job_id = "1"
+        return ""
+
+    def _queued(self, job_id):
+        return False
+
+
+class TestLocalBackend(unittest.TestCase):
+    def test_run_1(self):
+        results = LocalBackend(nproc=2).run(["echo a", "cat", "exit 3"], stdins=[None, "keywords", None])
+        self.assertEqual(["a\n", "keywords", ""], [r.stdout for r in results])
+        self.assertEqual([0, 0, 3], [r.returncode for r in results])
+
+
+class TestSlurmBackend(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_run_1(self):
+        backend = InlineSlurmBackend(self.directory, pack=4, poll=0.01)
+        results = backend.run(["cd /; export MXKIT_TEST=1; set -e", 'pwd; echo "value=$MXKIT_TEST"', "exit 3",
+                               "cat"], stdins=[None, None, None, "keywords"])
+        self.assertEqual([0, 0, 3, 0], [r.returncode for r in results])
+        self.assertEqual(os.path.realpath(self.directory), os.path.realpath(results[1].stdout.splitlines()[0]))
+        self.assertEqual("value=", results[1].stdout.splitlines()[1])
+        self.assertEqual("keywords", results[3].stdout)
+
+    def test_run_2(self):
+        backend = InlineSlurmBackend(self.directory, pack=2, poll=0.01)
+        # The second task is killed after its first command
+        results = backend.run(["echo 1", "echo 2", "kill -9 $$", "echo 4", "echo 5"])
+        self.assertEqual([0, 0, None, None, 0], [r.returncode for r in results])
+
+    def test_write_1(self):
+        backend = InlineSlurmBackend(self.directory, pack=2, poll=0.01)
+        backend.run(["echo 1", "echo 2", "echo 3"])
+        results = backend.run(["echo 1"])
+        self.assertEqual(1, len(results))
+        self.assertEqual(["1.err", "1.out", "1.rc"], sorted(os.listdir(backend.results_dir)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
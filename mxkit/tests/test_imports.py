@@ -0,0 +1,40 @@
+"""Testing facility for the lazy imports of heavy dependencies"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import subprocess
+import sys
+import unittest
+
+# Dependencies that must only be imported on first use, see benchmarks/bench_import.py
+HEAVY = ('Bio', 'numpy')
+
+
+def _heavy_imports(module):
+    """Return the heavy modules loaded by importing a module in a fresh interpreter"""
+    code = "import sys, {0}; print(' '.join(sorted(m for m in sys.modules if m.split('.')[0] in {1!r})))".format(
+        module, HEAVY)
+    return subprocess.check_output([sys.executable, "-c", code], universal_newlines=True).split()
+
+
+class TestImports(unittest.TestCase):
+    def test_mxkit_1(self):
+        self.assertEqual([], _heavy_imports("mxkit"))
+
+    def test_apps_1(self):
+        self.assertEqual([], _heavy_imports("mxkit.apps"))
+
+    def test_chemistry_1(self):
+        self.assertEqual([], _heavy_imports("mxkit.chemistry"))
+
+    def test_dispatch_1(self):
+        self.assertEqual([], _heavy_imports("mxkit.dispatch.scheduler"))
+
+    def test_dispatch_2(self):
+        self.assertEqual([], _heavy_imports("mxkit.dispatch.worker"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,49 @@
+"""Testing facility for mxkit.batch.jury"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import unittest
+
+import numpy as np
+
+from mxkit.batch import jury
+
+
+class TestJury(unittest.TestCase):
+    def setUp(self):
+        self.similarity = np.array([[1.0, 0.5, 0.1], [0.5, 1.0, 0.3], [0.1, 0.3, 1.0]])
+
+    def test_score_1(self):
+        scores, pairs = jury.score(self.similarity)
+        self.assertTrue(np.allclose([0.25, 0.4, 0.15], scores))
+        self.assertEqual([1, 2, 1], pairs.tolist())
+
+    def test_score_2(self):
+        scores, _ = jury.score(self.similarity, top=1)
+        self.assertTrue(np.allclose([0.5, 0.5, 0.3], scores))
+
+    def test_score_3(self):
+        similarity = self.similarity.copy()
+        similarity[0, 1] = np.nan
+        scores, pairs = jury.score(similarity, chunk=1)
+        self.assertTrue(np.allclose([0.0, 0.4, 0.15], scores))
+        self.assertEqual([0, 2, 1], pairs.tolist())
+
+    def test_score_4(self):
+        with self.assertRaises(ValueError):
+            jury.score(np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            jury.score(self.similarity, top=0)
+
+    def test_score_models_1(self):
+        rng = np.random.RandomState(7)
+        native = np.cumsum(rng.normal(0.0, 2.2, size=(40, 3)), axis=0)
+        coords = np.array([native, native + 0.1, native + rng.normal(0.0, 6.0, size=native.shape)])
+        scores, _ = jury.score_models(coords)
+        self.assertEqual(2, int(np.argmin(scores)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
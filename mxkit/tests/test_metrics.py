@@ -0,0 +1,61 @@
+"""Testing facility for mxkit.batch.metrics"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import unittest
+
+import numpy as np
+
+from mxkit.batch import metrics
+
+
+def _rotation(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(42)
+        self.native = np.cumsum(rng.normal(0.0, 2.2, size=(60, 3)), axis=0)
+
+    def test_gdt_ts_1(self):
+        model = self.native.dot(_rotation(0.7).T) + np.array([10.0, -5.0, 3.0])
+        self.assertAlmostEqual(1.0, metrics.gdt_ts(model, self.native)[0], places=6)
+
+    def test_gdt_ts_2(self):
+        model = self.native.copy()
+        # Half of the residues are displaced, the other half remains superposable
+        model[30:] += np.array([20.0, 0.0, 0.0])
+        score = metrics.gdt_ts(model, self.native)[0]
+        self.assertGreaterEqual(score, 0.5)
+        self.assertLess(score, 0.75)
+
+    def test_gdt_ts_3(self):
+        model = self.native.copy()
+        model[0] = np.nan
+        self.assertAlmostEqual(59.0 / 60.0, metrics.gdt_ts(model, self.native)[0], places=6)
+
+    def test_scores_1(self):
+        rng = np.random.RandomState(0)
+        models = self.native + rng.normal(0.0, 1.5, size=(5, 60, 3))
+        models[0] = self.native
+        result = metrics.scores(models, self.native)
+        for name in ("gdt_ts", "gdt_ha", "maxsub"):
+            self.assertEqual((5, ), result[name].shape)
+            self.assertAlmostEqual(1.0, result[name][0], places=6)
+            self.assertTrue(np.all(result[name][1:] < 1.0))
+            self.assertTrue(np.all(result[name] >= 0.0))
+        self.assertTrue(np.all(result["gdt_ha"] <= result["gdt_ts"]))
+
+    def test_scores_2(self):
+        rng = np.random.RandomState(1)
+        models = self.native + rng.normal(0.0, 1.5, size=(5, 60, 3))
+        self.assertTrue(np.allclose(metrics.scores(models, self.native, chunk=2)["gdt_ts"],
+                                    metrics.scores(models, self.native, chunk=16)["gdt_ts"]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
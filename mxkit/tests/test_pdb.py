@@ -0,0 +1,56 @@
+"""Testing facility for mxkit.formats.pdb"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from mxkit.formats.pdb import read_ca, write_superposed
+
+ATOM = "ATOM  {0:5d}  CA  ALA {1}{0:4d}    {2:8.3f}{3:8.3f}{4:8.3f}  1.00  0.00           C\n"
+
+
+class TestWriteSuperposed(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sources = []
+        for n, chain in enumerate("AB", 1):
+            path = os.path.join(self.directory, "{0}.pdb".format(chain))
+            with open(path, "w") as f_out:
+                for i in range(1, 6):
+                    f_out.write(ATOM.format(i, chain, n * i, 2.0 * i, -1.0 * i))
+                f_out.write("END\n")
+            self.sources.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_superposed_1(self):
+        with self.assertRaises(ValueError):
+            write_superposed([], cache=0)
+
+    def test_write_superposed_2(self):
+        rotation = np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        translation = np.array([1.0, 2.0, 3.0])
+        jobs = []
+        for k in range(2):
+            for source in self.sources:
+                destination = os.path.join(self.directory, "{0}_{1}.pdb".format(k, os.path.basename(source)[0]))
+                jobs.append((source, destination, rotation, translation))
+        written = write_superposed(jobs, cache=1)
+        self.assertEqual([job[1] for job in jobs], written)
+        for source, destination, _, _ in jobs:
+            expected = read_ca(source).coords.dot(rotation.T) + translation
+            trace = read_ca(destination)
+            self.assertTrue(np.allclose(expected, trace.coords, atol=1e-3))
+            self.assertEqual(read_ca(source).chain.tolist(), trace.chain.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+"""Testing facility for mxkit.dispatch.policy"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Bio.Application import ApplicationError
+
+from mxkit.dispatch.policy import ExecutionPolicy, QuarantineError
+
+
+class Keywords(object):
+    """A wrapper without input files failing for the standard inputs in ``failing``"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = 0
+
+    def __str__(self):
+        return "phaser"
+
+    def filenames(self, output=False):
+        return []
+
+    def __call__(self, stdin=None, timeout=None):
+        self.calls += 1
+        if stdin in self.failing:
+            raise ApplicationError(1, str(self), "", "error")
+        return "", ""
+
+
+class TestExecutionPolicy(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.quarantine_file = os.path.join(self.directory, "quarantine.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_key_1(self):
+        cmdline = Keywords()
+        self.assertEqual(ExecutionPolicy.key(cmdline, "MODE MR_AUTO"), ExecutionPolicy.key(cmdline, "MODE MR_AUTO"))
+        self.assertNotEqual(ExecutionPolicy.key(cmdline, "MODE MR_AUTO"), ExecutionPolicy.key(cmdline, "MODE MR_FRF"))
+        self.assertNotEqual(ExecutionPolicy.key(cmdline), ExecutionPolicy.key(cmdline, ""))
+
+    def test_run_1(self):
+        policy = ExecutionPolicy(retries=0, backoff=0, quarantine_after=2, quarantine_file=self.quarantine_file)
+        cmdline = Keywords(failing=["A", "B", "C"])
+        for stdin in ("A", "B", "C"):
+            with self.assertRaises(ApplicationError):
+                policy.run(cmdline, stdin=stdin)
+        self.assertEqual(("", ""), policy.run(cmdline, stdin="D"))
+        self.assertFalse(policy.quarantined(cmdline, stdin="A"))
+
+    def test_run_2(self):
+        policy = ExecutionPolicy(retries=0, backoff=0, quarantine_after=2, quarantine_file=self.quarantine_file)
+        cmdline = Keywords(failing=["A"])
+        for _ in range(2):
+            with self.assertRaises(ApplicationError):
+                policy.run(cmdline, stdin="A")
+        with self.assertRaises(QuarantineError):
+            policy.run(cmdline, stdin="A")
+        self.assertEqual(2, cmdline.calls)
+        # Persisted across sessions
+        self.assertTrue(ExecutionPolicy(quarantine_after=2, quarantine_file=self.quarantine_file).quarantined(
+            cmdline, stdin="A"))
+
+    def test_run_3(self):
+        policy = ExecutionPolicy(retries=0, backoff=0, quarantine_after=2, quarantine_file=self.quarantine_file)
+        cmdline = Keywords(failing=["A"])
+        with self.assertRaises(ApplicationError):
+            policy.run(cmdline, stdin="A")
+        cmdline.failing.clear()
+        policy.run(cmdline, stdin="A")
+        cmdline.failing.add("A")
+        with self.assertRaises(ApplicationError):
+            policy.run(cmdline, stdin="A")
+        self.assertFalse(policy.quarantined(cmdline, stdin="A"))
+        with open(self.quarantine_file, "r") as f_in:
+            self.assertEqual([1], list(json.load(f_in).values()))
+
+    def test_run_4(self):
+        policy = ExecutionPolicy(retries=2, backoff=0, quarantine_after=10)
+        cmdline = Keywords(failing=["A"])
+        with self.assertRaises(ApplicationError):
+            policy.run(cmdline, stdin="A")
+        self.assertEqual(3, cmdline.calls)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
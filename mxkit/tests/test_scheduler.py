@@ -0,0 +1,84 @@
+"""Testing facility for mxkit.dispatch.scheduler"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from mxkit import probe
+from mxkit.apps.dssp import DsspCommandline
+from mxkit.dispatch.scheduler import FINISHED, Job, Scheduler
+
+# Logs every call and writes the output file given as second positional argument
+MKDSSP = """#!/bin/sh
+if [ "$1" = --version ]; then echo "mkdssp version 4.4.0"; echo "  --output-format arg"; exit 0; fi
+echo "$@" >> "{0}"
+touch "$2"
+"""
+
+
+class Callable(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return kwargs
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log = os.path.join(self.directory, "calls.log")
+        self.exe = os.path.join(self.directory, "mkdssp")
+        with open(self.exe, "w") as f_out:
+            f_out.write(MKDSSP.format(self.log))
+        os.chmod(self.exe, os.stat(self.exe).st_mode | stat.S_IEXEC)
+        self.cache = probe.default_cache()
+        probe.set_default_cache(probe.ProbeCache(path=""))
+
+    def tearDown(self):
+        probe.set_default_cache(self.cache)
+        shutil.rmtree(self.directory)
+
+    def _scheduler(self):
+        scheduler = Scheduler(state_file=os.path.join(self.directory, "state.json"))
+        scheduler.add(Job("dssp", DsspCommandline(self.exe, input=os.path.join(self.directory, "model.pdb"),
+                                                  output=os.path.join(self.directory, "model.dssp"))))
+        return scheduler
+
+    def test_run_1(self):
+        self.assertEqual({"dssp": FINISHED}, self._scheduler().run())
+        self.assertEqual({"dssp": FINISHED}, self._scheduler().run())
+        with open(self.log, "r") as f_in:
+            calls = f_in.read().splitlines()
+        self.assertEqual(1, len(calls))
+        self.assertIn("--output-format dssp", calls[0])
+
+    def test_run_2(self):
+        cmdline = Callable()
+        scheduler = Scheduler()
+        scheduler.add(Job("keywords", cmdline, stdin="NCYC 10\n"))
+        self.assertEqual({"keywords": FINISHED}, scheduler.run())
+        self.assertEqual([{"stdin": "NCYC 10\n"}], cmdline.calls)
+
+    def test_signature_1(self):
+        cmdline = DsspCommandline(self.exe, input="model.pdb", output="model.dssp")
+        self.assertEqual(Job("a", cmdline).signature, Job("b", cmdline).signature)
+        self.assertNotEqual(Job("a", cmdline, stdin="A").signature, Job("b", cmdline, stdin="B").signature)
+        self.assertNotEqual(Job("a", cmdline).signature, Job("b", cmdline, stdin="A").signature)
+
+    def test_signature_2(self):
+        cmdline = DsspCommandline(self.exe, input="model.pdb", output="model.dssp")
+        signature = Job("a", cmdline).signature
+        cmdline.resolve()
+        self.assertEqual(signature, Job("a", cmdline).signature)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+"""Testing facility for mxkit.dispatch.worker"""
+
+__author__ = "Felix Simkovic"
+__date__ = "19 Oct 2026"
+__version__ = "0.1"
+
+import unittest
+
+from mxkit import scratch
+from mxkit.apps.dssp import DsspCommandline
+from mxkit.dispatch.worker import ShellPool, ShellWorker
+
+
+class Unformattable(object):
+    def __str__(self):
+        raise RuntimeError("Unformattable command")
+
+
+class TestShellWorker(unittest.TestCase):
+    def test_execute_1(self):
+        worker = ShellWorker()
+        try:
+            result = worker.execute("echo hello; echo world >&2; exit 3")
+        finally:
+            worker.close()
+        self.assertEqual(3, result.returncode)
+        self.assertEqual("hello\n", result.stdout)
+        self.assertEqual("world\n", result.stderr)
+
+    def test_execute_2(self):
+        worker = ShellWorker()
+        try:
+            worker.execute("cd /; export MXKIT_TEST=1")
+            result = worker.execute('pwd; echo "value=$MXKIT_TEST"')
+            self.assertNotEqual("/", result.stdout.splitlines()[0])
+            self.assertEqual("value=", result.stdout.splitlines()[1])
+            self.assertEqual(2, worker.execute("exit 2").returncode)
+            self.assertNotEqual(0, worker.execute("if then").returncode)
+            self.assertEqual("alive\n", worker.execute("echo alive").stdout)
+        finally:
+            worker.close()
+
+
+class TestShellPool(unittest.TestCase):
+    def test_map_1(self):
+        with ShellPool(nproc=2) as pool:
+            results = pool.map(["echo {0}".format(i) for i in range(10)])
+        self.assertEqual(["{0}\n".format(i) for i in range(10)], [r.stdout for r in results])
+
+    def test_map_2(self):
+        cmdline = DsspCommandline("sh", input=scratch.Buffer("data", name="model.pdb"), output="model.dssp")
+        with ShellPool(nproc=2) as pool:
+            with self.assertRaises(ValueError):
+                pool.map(["echo 1", cmdline])
+
+    def test_map_3(self):
+        with ShellPool(nproc=2) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.map(["echo 1", Unformattable(), "echo 2"])
+            self.assertEqual("ok\n", pool.map(["echo ok"])[0].stdout)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
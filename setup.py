@@ -71,6 +71,10 @@ VERSION = version()
 PACKAGES = [
     'mxkit',
     'mxkit/apps',
+    'mxkit/batch',
+    'mxkit/dispatch',
+    'mxkit/formats',
+    'mxkit/tests',
 ]
 
 CLASSIFIERS = [